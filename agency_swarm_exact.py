@@ -8,8 +8,12 @@ Based on research results: Basic imports and Agent/Agency creation patterns.
 """
 
 import os
+import asyncio
 from agency_swarm import Agency, Agent
 from dotenv import load_dotenv
+from completion_cache import CachedAgency
+from completion_stream import stream_completion, command_loop
+from openai_client import warm_openai_client
 
 # Load environment variables exactly as documented
 load_dotenv()
@@ -17,6 +21,9 @@ load_dotenv()
 # Set OpenAI API key as documented
 os.environ["OPENAI_API_KEY"] = os.getenv('OPENAI_API_KEY')
 
+# Pooled client, connected in the background before the first agent turn
+warm_openai_client()
+
 # Create specialized agents following exact documentation syntax
 frontend_agent = Agent(
     name="FrontendDeveloper",
@@ -55,7 +62,8 @@ testing_agent = Agent(
 )
 
 # Create an agency with these agents following exact documentation
-agency = Agency(
+# (AUDIT_CACHE=1 replays identical prompts from disk)
+agency = CachedAgency(Agency(
     agents=[frontend_agent, backend_agent, device_agent, mobile_agent, qa_agent, testing_agent],
     shared_instructions="""
     🎯 SMS DRIP CAMPAIGN PLATFORM DEVELOPMENT
@@ -70,7 +78,7 @@ agency = Agency(
     """,
     max_prompt_tokens=25000,
     max_completion_tokens=8000
-)
+), namespace="deploy")
 
 def deploy_agency():
     """Deploy the agency following exact documentation"""
@@ -109,13 +117,10 @@ def deploy_agency():
         Begin implementation now.
         """
         
-        # Get agency response using exact documented method
-        response = agency.get_completion(kickoff_message)
-        
         print("\n" + "=" * 60)
         print("🎯 AGENCY RESPONSE:")
         print("=" * 60)
-        print(response)
+        response = stream_completion(agency, kickoff_message)
         print("=" * 60)
         
         return agency, response
@@ -143,16 +148,12 @@ if __name__ == "__main__":
             print("\n📞 Agency ready for commands...")
             print("Type 'exit' to stop")
             
-            while True:
-                user_input = input("\n💬 Command: ").strip()
-                
-                if user_input.lower() == 'exit':
-                    break
-                
-                if user_input:
-                    print("\n🤖 Processing...")
-                    response = agency_instance.get_completion(user_input)
-                    print(f"\n📋 Response:\n{response}")
+            def handle_command(user_input):
+                print("\n📋 Response:")
+                stream_completion(agency_instance, user_input)
+            
+            # Commands typed while a reply streams are queued, not blocked
+            asyncio.run(command_loop("\n💬 Command: ", handle_command))
                     
         except KeyboardInterrupt:
             print("\n\n👋 Agency stopped")
@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+Concurrent Agent Turns
+======================
+
+Run independent per-agent tasks side by side instead of through one
+blocking get_completion that drives every agent in sequence. Each turn
+gets its own OpenAI thread: concurrent runs on the agency's shared main
+thread would collide.
+
+Turns are throttled: at most LLM_CONCURRENCY run at once across the
+process, and agents listed in AGENT_CONCURRENCY get a smaller share of
+their own, so a wide fan-out queues here instead of tripping the
+provider's rate limits. Queued turns get free slots round-robin by agent,
+so an agent with many turns cannot starve one with few; AGENT_PRIORITY
+lets an agent take several slots per round. Runs that still fail on a
+rate limit are retried with exponential backoff.
+"""
+
+import os
+import re
+import time
+import random
+import asyncio
+import logging
+import threading
+import contextvars
+from collections import deque
+from contextlib import contextmanager
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+from agency_swarm import get_openai_client
+from agency_swarm.threads import Thread
+from latency import add_tokens, run_tokens
+
+# Child of the swarm scripts' "agency" logger, so turn progress goes through their queued handler
+logger = logging.getLogger("agency.turns")
+
+
+LLM_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", "8"))
+# Agent name -> turns of that agent allowed at once, for agents that should not crowd out the rest
+AGENT_CONCURRENCY = {}
+# Agent name -> slots it is granted per round-robin round while others wait (default 1)
+AGENT_PRIORITY = {}
+RATE_LIMIT_RETRIES = 3
+RATE_LIMIT_BACKOFF = 5.0
+
+
+class FairSlots:
+    """At most limit holders at once; waiting agents are granted free slots round-robin.
+
+    Each agent has its own FIFO of waiters, and a freed slot goes to the
+    agent at the head of the rotation, which moves to the back once it has
+    had its priority's worth of grants.
+    """
+
+    def __init__(self, limit: int, priority: dict = None):
+        self.priority = AGENT_PRIORITY if priority is None else priority
+        self._free = limit
+        self._waiters = {}
+        self._rotation = deque()
+        self._granted = 0
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def acquire(self, name: str) -> None:
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("LLM slots closed: shutting down")
+            if self._free and not self._rotation:
+                self._free -= 1
+                return
+            waiter = threading.Event()
+            queue = self._waiters.setdefault(name, deque())
+            if not queue:
+                self._rotation.append(name)
+            queue.append(waiter)
+        waiter.wait()
+        if self._closed:
+            raise RuntimeError("LLM slots closed: shutting down")
+
+    def release(self) -> None:
+        with self._lock:
+            if not self._rotation:
+                self._free += 1
+                return
+            # The slot passes straight to the next waiter, never through _free
+            name = self._rotation[0]
+            queue = self._waiters[name]
+            queue.popleft().set()
+            self._granted += 1
+            if not queue:
+                self._rotation.popleft()
+                self._granted = 0
+            elif self._granted >= self.priority.get(name, 1):
+                self._rotation.rotate(-1)
+                self._granted = 0
+
+    def close(self) -> None:
+        """Fail every queued and later acquire, so no new turn starts during shutdown."""
+        with self._lock:
+            self._closed = True
+            for queue in self._waiters.values():
+                for waiter in queue:
+                    waiter.set()
+            self._waiters.clear()
+            self._rotation.clear()
+
+    @contextmanager
+    def slot(self, name: str):
+        self.acquire(name)
+        try:
+            yield
+        finally:
+            self.release()
+
+
+_LLM_SLOTS = FairSlots(LLM_CONCURRENCY)
+_AGENT_SLOTS = {}
+_AGENT_SLOTS_LOCK = threading.Lock()
+
+
+def _agent_slots(name):
+    with _AGENT_SLOTS_LOCK:
+        if name not in _AGENT_SLOTS:
+            limit = AGENT_CONCURRENCY.get(name)
+            _AGENT_SLOTS[name] = threading.BoundedSemaphore(limit) if limit else None
+        return _AGENT_SLOTS[name]
+
+
+def _is_rate_limited(error) -> bool:
+    # agency-swarm retries a rate-limited run a few times itself, then raises a plain Exception
+    return "rate limit" in str(error).lower()
+
+
+_REQUEST_CACHE = contextvars.ContextVar("request_cache", default=None)
+
+
+@contextmanager
+def request_scope():
+    """Open a cache that lives for one top-level turn; a scope opened inside it shares the outer one."""
+    if _REQUEST_CACHE.get() is not None:
+        yield
+        return
+    token = _REQUEST_CACHE.set({})
+    try:
+        yield
+    finally:
+        _REQUEST_CACHE.reset(token)
+
+
+def request_cache():
+    """The current top-level turn's cache dict, or None outside any turn."""
+    return _REQUEST_CACHE.get()
+
+
+def llm_slot(agent_name: str):
+    """Hold one of the shared LLM slots for a call made outside run_agent_turn."""
+    return _LLM_SLOTS.slot(agent_name)
+
+
+def close_llm_slots() -> None:
+    """Turns still waiting for a slot fail instead of starting; for shutdown."""
+    _LLM_SLOTS.close()
+
+
+def _complete(agency, agent, message):
+    with request_scope():
+        thread = Thread(agency.user, agent)
+        completion = thread.get_completion(message)
+        while True:
+            try:
+                next(completion)
+            except StopIteration as e:
+                add_tokens(run_tokens(thread._run))
+                return e.value
+
+
+def run_agent_turn(agency, agent, message: str, throttled: bool = True):
+    """Send one message straight to an agent on a private thread and return its reply.
+
+    throttled=False skips the concurrency limits; for turns started from
+    inside another turn, which would otherwise wait on slots their parent holds.
+    """
+    if not throttled:
+        return _complete(agency, agent, message)
+
+    agent_slots = _agent_slots(agent.name)
+    for attempt in range(RATE_LIMIT_RETRIES + 1):
+        try:
+            # The agent's own limit first, so a queued turn never sits on a global slot
+            if agent_slots:
+                agent_slots.acquire()
+            try:
+                with _LLM_SLOTS.slot(agent.name):
+                    return _complete(agency, agent, message)
+            finally:
+                if agent_slots:
+                    agent_slots.release()
+        except Exception as e:
+            if attempt == RATE_LIMIT_RETRIES or not _is_rate_limited(e):
+                raise
+        # Backing off outside the slots leaves them to turns that can run now
+        time.sleep(RATE_LIMIT_BACKOFF * 2 ** attempt * random.uniform(0.5, 1.5))
+
+
+async def gather_agent_turns(agency, turns):
+    """Run (agent, message) turns concurrently; failures come back as exceptions in order."""
+    loop = asyncio.get_running_loop()
+    # One thread per turn: the default executor is sized by CPU count, and
+    # these threads only wait on the API
+    pool = ThreadPoolExecutor(max_workers=max(len(turns), 1))
+    try:
+        return await asyncio.gather(
+            *(loop.run_in_executor(pool, run_agent_turn, agency, agent, message) for agent, message in turns),
+            return_exceptions=True,
+        )
+    finally:
+        # Cancelled: queued turns are dropped and the event loop does not wait for running ones
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def run_turn_graph(agency, turns, depends_on, run_turn=None):
+    """Run turns in dependency order, each as soon as everything it depends on is done.
+
+    turns maps agent name -> (agent, message); depends_on maps agent name ->
+    the names whose turns must finish first. A turn's message is sent with
+    its upstream replies appended, and turns whose dependencies are met run
+    side by side. Returns agent name -> reply, or the exception it raised.
+    run_turn(agent, message) replaces the plain run_agent_turn, e.g. to cache turns.
+    """
+    run_turn = run_turn or partial(run_agent_turn, agency)
+    waiting_on = {name: set(depends_on.get(name, ())) & turns.keys() for name in turns}
+    downstream = {name: [other for other, upstream in waiting_on.items() if name in upstream] for name in turns}
+    _check_acyclic(waiting_on)
+
+    loop = asyncio.get_running_loop()
+    results = {}
+
+    async def run(name, pool):
+        agent, message = turns[name]
+        upstream = [f"{up} reported:\n{results[up]}" for up in depends_on.get(name, ())
+                    if up in results and not isinstance(results[up], Exception)]
+        if upstream:
+            message += "\n\n" + "\n\n".join(upstream)
+        logger.info("▶️ %s started", name)
+        try:
+            results[name] = await loop.run_in_executor(pool, run_turn, agent, message)
+            logger.info("✅ %s finished", name)
+        except Exception as e:
+            results[name] = e
+            logger.warning("❌ %s failed: %s", name, e)
+
+        # Downstream turns whose last dependency this was start together
+        ready = []
+        for other in downstream[name]:
+            waiting_on[other].discard(name)
+            if not waiting_on[other]:
+                ready.append(other)
+        await asyncio.gather(*(run(other, pool) for other in ready))
+
+    pool = ThreadPoolExecutor(max_workers=max(len(turns), 1))
+    try:
+        roots = [name for name, upstream in waiting_on.items() if not upstream]
+        await asyncio.gather(*(run(name, pool) for name in roots))
+    finally:
+        # Cancelled: queued turns are dropped and the event loop does not wait for running ones
+        pool.shutdown(wait=False, cancel_futures=True)
+    return results
+
+
+def _check_acyclic(waiting_on):
+    remaining = {name: set(upstream) for name, upstream in waiting_on.items()}
+    while remaining:
+        ready = [name for name, upstream in remaining.items() if not upstream]
+        if not ready:
+            raise ValueError(f"turn dependencies form a cycle: {', '.join(sorted(remaining))}")
+        for name in ready:
+            del remaining[name]
+        for upstream in remaining.values():
+            upstream.difference_update(ready)
+
+
+TICK_MS = 250
+
+
+async def tick_loop(awaitables, on_result=None, tick_ms: int = TICK_MS, max_ticks: int = None):
+    """Collect in-flight turns on a fixed tick instead of one open-ended gather.
+
+    Each tick takes whatever finished and hands it to on_result(index, result),
+    so progress can be acted on while the rest run. After max_ticks the
+    stragglers are cancelled and come back as TimeoutError. Cancelling only
+    stops waiting: a turn already running on a thread keeps running, so the
+    caller must run its turns on an executor it can shut down without waiting
+    (see FleetDispatcher.close). Results are returned in order, failures as
+    exceptions, like gather.
+    """
+    tasks = {asyncio.ensure_future(awaitable): i for i, awaitable in enumerate(awaitables)}
+    results = [None] * len(tasks)
+    pending = set(tasks)
+    tick = 0
+    while pending and (max_ticks is None or tick < max_ticks):
+        done, pending = await asyncio.wait(pending, timeout=tick_ms / 1000)
+        for task in done:
+            i = tasks[task]
+            # A cancelled task has no exception to read; report it the way gather(return_exceptions=True) does
+            results[i] = asyncio.CancelledError() if task.cancelled() else task.exception() or task.result()
+            if on_result:
+                on_result(i, results[i])
+        tick += 1
+
+    for task in pending:
+        task.cancel()
+        results[tasks[task]] = TimeoutError(f"no reply after {tick * tick_ms / 1000:g}s")
+    return results
+
+
+DELEGATION_FORMAT = """You answer for several agents at once. Each <delegation agent="..."> block
+holds one agent's role and assignment. Answer every block as that agent would, each in
+its own <reply agent="...">...</reply> block with the same agent name, and nothing else."""
+REPLY_RE = re.compile(r'<reply agent="([^"]+)">\s*(.*?)\s*</reply>', re.S)
+
+
+def batched_delegate(assignments, model: str, instructions: str = "", client=None) -> dict:
+    """Answer independent assignments {agent: message} with one chat completion.
+
+    For turns that need no tools: the instructions preamble is sent once
+    for all of them instead of once per agent. Returns agent name -> reply
+    for the agents answered; any missing from the reply are left out, so
+    the caller can give them turns of their own.
+    """
+    client = client or get_openai_client()
+    blocks = [f'<delegation agent="{agent.name}">\nRole: {agent.description}\n\n{message.strip()}\n</delegation>'
+              for agent, message in assignments.items()]
+    with _LLM_SLOTS.slot("batched_delegate"):
+        response = client.chat.completions.create(
+            model=model,
+            messages=[
+                {"role": "system", "content": f"{instructions}\n\n{DELEGATION_FORMAT}".strip()},
+                {"role": "user", "content": "\n\n".join(blocks)},
+            ],
+        )
+    add_tokens(run_tokens(response))
+    names = {agent.name for agent in assignments}
+    return {name: reply for name, reply in REPLY_RE.findall(response.choices[0].message.content or "")
+            if name in names}
+
+
+def format_turn_results(turns, results) -> str:
+    """Join per-agent replies into one report, marking turns that failed."""
+    sections = []
+    for (agent, _), result in zip(turns, results):
+        if isinstance(result, Exception):
+            result = f"ERROR {agent.name} failed: {str(result)}"
+        sections.append(f"### {agent.name}\n{result}")
+    return "\n\n".join(sections)
@@ -3,7 +3,7 @@
 SMS Platform Code Audit Agency Swarm
 ===================================
 
-Specialized audit agents with tools to thoroughly examine all code for:
+A single audit agent with tools to thoroughly examine all code for:
 - Placeholder data and TODO comments
 - Syntax errors and bugs
 - Security vulnerabilities 
@@ -13,48 +13,251 @@ Specialized audit agents with tools to thoroughly examine all code for:
 """
 
 import os
+import re
+import asyncio
+import io
+import json
+import mmap
 import subprocess
-from agency_swarm import Agency, Agent
+import sys
+import tokenize
+from bisect import bisect_right
+from collections import namedtuple
+from functools import lru_cache
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from agency_swarm import Agency, Agent, get_openai_client
 from agency_swarm.tools import BaseTool
 from pydantic import Field
 from dotenv import load_dotenv
+from completion_cache import CachedAgency
+from completion_stream import stream_completion, command_loop
+from openai_client import warm_openai_client
+from openai_batch import chat_request, run_batch
+from audit_patterns import (
+    NEWLINE_RE, PLACEHOLDER_RE, PASS_RE, CONSOLE_LOG_RE, HARDCODE_RE,
+    SQL_SELECT_RE, SECRET_RE, GETENV_RE, UNSAFE_EXEC_RE, REQ_BODY_RE, INPUT_VALIDATION_RE,
+    JS_COMMENT_RE, LONG_LINE_RE, DEEP_INDENT_RE, BARE_INT_RE, ERROR_HANDLING_RE, TRY_RE, CATCH_RE,
+)
 
 # Load environment variables
 load_dotenv()
 os.environ["OPENAI_API_KEY"] = os.getenv('OPENAI_API_KEY')
 
+# Pooled client, connected in the background before the first agent turn
+warm_openai_client()
+
 # Audit Tools
+Source = namedtuple('Source', 'content lines line_starts')
+
+@lru_cache(maxsize=None)
+def _bytes_pattern(pattern):
+    """Bytes twin of a str pattern, for searching memory-mapped files without decoding."""
+    return re.compile(pattern.pattern.encode(), pattern.flags & ~re.UNICODE)
+
+def _pattern_for(pattern, content):
+    """The pattern itself for str content, its bytes twin for a memory-mapped file."""
+    return pattern if isinstance(content, str) else _bytes_pattern(pattern)
+
+def _hit_lines(pattern, source):
+    """Line numbers containing a match, from one regex pass over the whole file."""
+    pattern = _pattern_for(pattern, source.content)
+    return {bisect_right(source.line_starts, m.start()) for m in pattern.finditer(source.content)}
+
+def _placeholder_issues(source):
+    """Placeholder, empty-implementation, console.log and hardcoded-value findings."""
+    issues = []
+    placeholder = _hit_lines(PLACEHOLDER_RE, source)
+    empty = _hit_lines(PASS_RE, source)
+    console_log = _hit_lines(CONSOLE_LOG_RE, source)
+    hardcoded = _hit_lines(HARDCODE_RE, source)
+    
+    # Only lines with at least one keyword hit are visited
+    for i in sorted(placeholder | empty | console_log | hardcoded):
+        line = source.lines[i - 1]
+        
+        # Check for placeholder content
+        if i in placeholder:
+            issues.append(f"Line {i}: Placeholder content found: {line.strip()}")
+        
+        # Check for empty implementations
+        if i in empty and not line.strip().startswith('#'):
+            issues.append(f"Line {i}: Empty implementation with 'pass': {line.strip()}")
+        
+        # Check for console.log in production
+        if i in console_log:
+            issues.append(f"Line {i}: Console.log found (remove for production): {line.strip()}")
+        
+        # Check for hardcoded values
+        if i in hardcoded:
+            issues.append(f"Line {i}: Hardcoded value found: {line.strip()}")
+    return issues
+
+def _security_issues(source):
+    """SQL injection, hardcoded secret, unsafe execution and input validation findings."""
+    security_issues = []
+    select = _hit_lines(SQL_SELECT_RE, source)
+    secret = _hit_lines(SECRET_RE, source)
+    unsafe_exec = _hit_lines(UNSAFE_EXEC_RE, source)
+    request_body = _hit_lines(REQ_BODY_RE, source)
+    
+    for i in sorted(select | secret | unsafe_exec | request_body):
+        line = source.lines[i - 1]
+        
+        # SQL injection risks
+        if i in select and ('${' in line or '{' in line or '+' in line):
+            security_issues.append(f"Line {i}: Potential SQL injection risk: {line.strip()}")
+        
+        # Hardcoded secrets
+        if i in secret and '=' in line:
+            if not line.strip().startswith('#') and not GETENV_RE.search(line):
+                security_issues.append(f"Line {i}: Potential hardcoded secret: {line.strip()}")
+        
+        # Unsafe eval/exec
+        if i in unsafe_exec:
+            security_issues.append(f"Line {i}: Unsafe code execution: {line.strip()}")
+        
+        # Missing input validation
+        if i in request_body and not INPUT_VALIDATION_RE.search(line):
+            security_issues.append(f"Line {i}: Potential missing input validation: {line.strip()}")
+    return security_issues
+
+def _quality_issues(source):
+    """Line length, nesting, magic number and error-handling findings."""
+    lines, content = source.lines, source.content
+    quality_issues = []
+    
+    long_lines = _hit_lines(LONG_LINE_RE, source)
+    deep_lines = _hit_lines(DEEP_INDENT_RE, source)
+    
+    # Largest bare integer token per line, from one pass over the content
+    magic_numbers = {}
+    for m in _pattern_for(BARE_INT_RE, content).finditer(content):
+        value = int(m.group())
+        if value > 1:
+            i = bisect_right(source.line_starts, m.start())
+            magic_numbers[i] = max(magic_numbers.get(i, 0), value)
+    
+    for i in sorted(long_lines | deep_lines | magic_numbers.keys()):
+        line = lines[i - 1]
+        
+        # Check for very long lines (mapped files match on bytes, so confirm in characters)
+        if i in long_lines and len(line) > 120:
+            quality_issues.append(f"Line {i}: Line too long ({len(line)} chars): {line[:50]}...")
+        
+        # Check for nested complexity (more than 6 levels of indentation)
+        if i in deep_lines:
+            quality_issues.append(f"Line {i}: High nesting complexity")
+        
+        # Check for magic numbers
+        if magic_numbers.get(i, 0) > 100 and not line.strip().startswith('#'):
+            quality_issues.append(f"Line {i}: Magic number found: {magic_numbers[i]}")
+    
+    # Check for missing error handling
+    has_try_catch = _pattern_for(TRY_RE, content).search(content) and _pattern_for(CATCH_RE, content).search(content)
+    has_error_handling = _pattern_for(ERROR_HANDLING_RE, content).search(content)
+    
+    if not has_try_catch and not has_error_handling:
+        quality_issues.append("Missing error handling - no try/catch or error handling found")
+    return quality_issues
+
+@lru_cache(maxsize=2048)
+def _read_cached(path, mtime_ns):
+    with open(path, 'r', encoding='utf-8', errors='ignore') as file:
+        content = file.read()
+    line_starts = [0] + [m.end() for m in NEWLINE_RE.finditer(content)]
+    return Source(content, tuple(content.split('\n')), line_starts)
+
+def _read_source(path):
+    """Return the Source for a file, shared by every tool until the file changes."""
+    return _read_cached(path, os.stat(path).st_mtime_ns)
+
+# Below this size the mmap setup costs more than reading the file
+MMAP_THRESHOLD = 64 * 1024
+
+class _MappedLines:
+    """Lines of a memory-mapped file, decoded only when a check looks at them."""
+    
+    def __init__(self, mapped, line_starts):
+        self.mapped = mapped
+        self.line_starts = line_starts
+    
+    def __getitem__(self, index):
+        start = self.line_starts[index]
+        end = self.line_starts[index + 1] - 1 if index + 1 < len(self.line_starts) else len(self.mapped)
+        # Text mode reads CRLF files as LF; match it
+        return self.mapped[start:end].decode('utf-8', 'ignore').removesuffix('\r')
+
+def _run_checks(path, source):
+    return {
+        "file": path,
+        "placeholder": _placeholder_issues(source),
+        "security": _security_issues(source),
+        "quality": _quality_issues(source),
+    }
+
+@lru_cache(maxsize=2048)
+def _scan_cached(path, mtime_ns, size):
+    if size < MMAP_THRESHOLD:
+        return _run_checks(path, _read_source(path))
+    
+    # Large files are searched in place instead of being copied into the heap
+    with open(path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        line_starts = [0] + [m.end() for m in _bytes_pattern(NEWLINE_RE).finditer(mapped)]
+        return _run_checks(path, Source(mapped, _MappedLines(mapped, line_starts), line_starts))
+
+def _scan_all(path):
+    """Placeholder, security and quality findings for a file from one read and one index.
+    
+    Memoized per file version, so FileAnalyzer, SecurityScanner, CodeQualityAnalyzer
+    and AuditFile on the same file share a single scan.
+    """
+    stat = os.stat(path)
+    return _scan_cached(path, stat.st_mtime_ns, stat.st_size)
+
+def _scan_file(path):
+    """Run every per-file check on one file, reporting a failure instead of raising it."""
+    try:
+        return _scan_all(path)
+    except Exception as e:
+        return {"file": path, "error": str(e)}
+
+AUDIT_EXTENSIONS = frozenset({'.ts', '.tsx', '.js', '.jsx', '.py', '.json'})
+SKIP_DIRS = frozenset({'node_modules', '.git', 'dist', 'build', '.next', '.venv'})
+
+def _walk_audit_files(root):
+    """Yield auditable files, pruning dependency/build trees before descending."""
+    with os.scandir(root) as entries:
+        for entry in entries:
+            # DirEntry type checks reuse d_type from readdir - no extra stat per entry
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in SKIP_DIRS:
+                    yield from _walk_audit_files(entry.path)
+            elif os.path.splitext(entry.name)[1] in AUDIT_EXTENSIONS and entry.is_file():
+                yield entry.path
+
+def _find_audit_files(directory_path):
+    """List the code and config files under a directory."""
+    return list(_walk_audit_files(directory_path))
+
+def _audit_executor():
+    """Thread pool for the per-file scans.
+    
+    Audits run inside tool calls while other threads (agent turns, HTTP
+    clients) hold locks a forked worker would inherit and could deadlock on,
+    and spawned workers would re-import this script and rebuild the whole
+    agency. Threads also keep the memoized scans for the other audit tools.
+    """
+    return ThreadPoolExecutor()
+
 class FileAnalyzer(BaseTool):
     """Analyze files for code quality, placeholders, and issues."""
     file_path: str = Field(..., description="Path to file to analyze")
     
     def run(self):
         try:
-            with open(self.file_path, 'r') as file:
-                content = file.read()
-            
             # Check for common issues
-            issues = []
-            lines = content.split('\n')
-            
-            for i, line in enumerate(lines, 1):
-                line_lower = line.lower()
-                
-                # Check for placeholder content
-                if any(keyword in line_lower for keyword in ['todo', 'fixme', 'placeholder', 'demo data', 'fake', 'mock', 'temporary', 'temp']):
-                    issues.append(f"Line {i}: Placeholder content found: {line.strip()}")
-                
-                # Check for empty implementations
-                if 'pass' in line and not line.strip().startswith('#'):
-                    issues.append(f"Line {i}: Empty implementation with 'pass': {line.strip()}")
-                
-                # Check for console.log in production
-                if 'console.log' in line_lower:
-                    issues.append(f"Line {i}: Console.log found (remove for production): {line.strip()}")
-                
-                # Check for hardcoded values
-                if any(keyword in line_lower for keyword in ['localhost', '127.0.0.1', 'password123', 'admin']):
-                    issues.append(f"Line {i}: Hardcoded value found: {line.strip()}")
+            issues = _scan_all(self.file_path)["placeholder"]
             
             if not issues:
                 return f"OK {self.file_path}: No major issues found"
@@ -70,31 +273,7 @@ class SecurityScanner(BaseTool):
     
     def run(self):
         try:
-            with open(self.file_path, 'r') as file:
-                content = file.read()
-            
-            security_issues = []
-            lines = content.split('\n')
-            
-            for i, line in enumerate(lines, 1):
-                line_lower = line.lower()
-                
-                # SQL injection risks
-                if 'select' in line_lower and ('${' in line or '{' in line or '+' in line):
-                    security_issues.append(f"Line {i}: Potential SQL injection risk: {line.strip()}")
-                
-                # Hardcoded secrets
-                if any(keyword in line_lower for keyword in ['api_key', 'secret', 'password', 'token']) and '=' in line:
-                    if not line.strip().startswith('#') and not 'getenv' in line_lower:
-                        security_issues.append(f"Line {i}: Potential hardcoded secret: {line.strip()}")
-                
-                # Unsafe eval/exec
-                if any(func in line_lower for func in ['eval(', 'exec(', 'system(', 'shell_exec']):
-                    security_issues.append(f"Line {i}: Unsafe code execution: {line.strip()}")
-                
-                # Missing input validation
-                if 'req.body' in line and 'validate' not in line_lower and 'sanitize' not in line_lower:
-                    security_issues.append(f"Line {i}: Potential missing input validation: {line.strip()}")
+            security_issues = _scan_all(self.file_path)["security"]
             
             if not security_issues:
                 return f"SECURE {self.file_path}: No security issues found"
@@ -104,6 +283,14 @@ class SecurityScanner(BaseTool):
         except Exception as e:
             return f"Error scanning {self.file_path}: {str(e)}"
 
+# Compiler subprocesses get what node/npm need to start and find their cache and prefix, not
+# the whole environment (API keys included). On Windows that is USERPROFILE/APPDATA rather than
+# HOME, and PATHEXT/COMSPEC to resolve and run npx.cmd
+_TOOL_ENV_KEYS = ('PATH', 'HOME', 'TMPDIR', 'SYSTEMROOT', 'PATHEXT', 'COMSPEC', 'USERPROFILE',
+                  'APPDATA', 'LOCALAPPDATA', 'TEMP', 'TMP', 'NODE_PATH')
+_TOOL_ENV = {key: value for key, value in os.environ.items()
+             if key.upper() in _TOOL_ENV_KEYS or key.upper().startswith('NPM_CONFIG_')}
+
 class SyntaxChecker(BaseTool):
     """Check syntax and run linting on code files."""
     file_path: str = Field(..., description="Path to file to check syntax")
@@ -114,30 +301,28 @@ class SyntaxChecker(BaseTool):
             
             if file_ext == '.ts' or file_ext == '.tsx':
                 # TypeScript syntax check
-                result = subprocess.run(['npx', 'tsc', '--noEmit', self.file_path], 
-                                      capture_output=True, text=True, cwd=os.path.dirname(self.file_path))
+                result = subprocess.run(['npx', 'tsc', '--noEmit', self.file_path], capture_output=True,
+                                      stdin=subprocess.DEVNULL, env=_TOOL_ENV, cwd=os.path.dirname(self.file_path))
                 if result.returncode != 0:
-                    return f"ERROR {self.file_path} TypeScript errors:\n{result.stderr}"
+                    return f"ERROR {self.file_path} TypeScript errors:\n{result.stderr.decode('utf-8', 'replace')}"
                 else:
                     return f"OK {self.file_path}: TypeScript syntax OK"
             
             elif file_ext == '.js' or file_ext == '.jsx':
                 # JavaScript syntax check with node
-                result = subprocess.run(['node', '--check', self.file_path], 
-                                      capture_output=True, text=True)
+                result = subprocess.run(['node', '--check', self.file_path], capture_output=True,
+                                      stdin=subprocess.DEVNULL, env=_TOOL_ENV)
                 if result.returncode != 0:
-                    return f"ERROR {self.file_path} JavaScript errors:\n{result.stderr}"
+                    return f"ERROR {self.file_path} JavaScript errors:\n{result.stderr.decode('utf-8', 'replace')}"
                 else:
                     return f"OK {self.file_path}: JavaScript syntax OK"
             
             elif file_ext == '.py':
-                # Python syntax check
-                result = subprocess.run(['python', '-m', 'py_compile', self.file_path], 
-                                      capture_output=True, text=True)
-                if result.returncode != 0:
-                    return f"ERROR {self.file_path} Python errors:\n{result.stderr}"
-                else:
-                    return f"OK {self.file_path}: Python syntax OK"
+                # Python syntax check in-process - same parser as py_compile, no interpreter spawn
+                error = _python_syntax_error(self.file_path)
+                if error:
+                    return f"ERROR {self.file_path} Python errors:\n{error}"
+                return f"OK {self.file_path}: Python syntax OK"
             
             else:
                 return f"INFO {self.file_path}: Syntax check not available for {file_ext}"
@@ -145,48 +330,108 @@ class SyntaxChecker(BaseTool):
         except Exception as e:
             return f"Error checking syntax for {self.file_path}: {str(e)}"
 
-class CodeQualityAnalyzer(BaseTool):
-    """Analyze code quality, complexity, and best practices."""
-    file_path: str = Field(..., description="Path to file to analyze for code quality")
+# Parses every file named in the JSON list on stdin without executing it
+_JS_CHECK_SCRIPT = r"""
+const fs = require('fs');
+const vm = require('vm');
+const results = {};
+for (const file of JSON.parse(fs.readFileSync(0, 'utf8'))) {
+  const source = fs.readFileSync(file, 'utf8').replace(/^#!.*/, '');
+  try {
+    new vm.Script(source, { filename: file });
+    results[file] = null;
+  } catch (err) {
+    let error = err;
+    if (vm.SourceTextModule) {
+      try {
+        new vm.SourceTextModule(source, { identifier: file });
+        results[file] = null;
+        continue;
+      } catch (moduleErr) {
+        error = moduleErr;
+      }
+    }
+    results[file] = String((error && error.message) || error);
+  }
+}
+process.stdout.write(JSON.stringify(results));
+"""
+
+_TSC_ERROR_RE = re.compile(r'^(?P<file>.+?)\((?P<line>\d+),(?P<col>\d+)\): error (?P<message>.*)$')
+
+def _python_syntax_error(path):
+    """Compile a Python file in-process and return the syntax error text, if any."""
+    with open(path, 'rb') as file:
+        source = file.read()
+    try:
+        compile(source, path, 'exec', dont_inherit=True)
+    except (SyntaxError, ValueError) as e:
+        return str(e)
+    return None
+
+class BatchSyntaxChecker(BaseTool):
+    """Check syntax of every code file under a directory with one compiler run per language."""
+    directory_path: str = Field(..., description="Path to directory to check")
     
     def run(self):
         try:
-            with open(self.file_path, 'r') as file:
-                content = file.read()
+            files = _find_audit_files(self.directory_path)
+            ts_files = [f for f in files if f.endswith(('.ts', '.tsx'))]
+            js_files = [f for f in files if f.endswith(('.js', '.jsx'))]
+            py_files = [f for f in files if f.endswith('.py')]
+            status = {}
             
-            quality_issues = []
-            lines = content.split('\n')
-            
-            # Function length analysis
-            current_function_start = None
-            for i, line in enumerate(lines, 1):
-                stripped = line.strip()
-                
-                # Detect function start
-                if any(keyword in stripped for keyword in ['function ', 'def ', 'const ', 'let ', 'var ']) and '{' in stripped or ':' in stripped:
-                    current_function_start = i
-                
-                # Check for very long lines
-                if len(line) > 120:
-                    quality_issues.append(f"Line {i}: Line too long ({len(line)} chars): {line[:50]}...")
-                
-                # Check for nested complexity
-                indent_level = len(line) - len(line.lstrip())
-                if indent_level > 24:  # More than 6 levels of indentation
-                    quality_issues.append(f"Line {i}: High nesting complexity")
+            if ts_files:
+                # One tsc run builds the program once and type-checks every file in it
+                tsconfig_path = os.path.join(self.directory_path, 'tsconfig.json')
+                if os.path.exists(tsconfig_path):
+                    command = ['npx', 'tsc', '--noEmit', '-p', tsconfig_path]
+                else:
+                    command = ['npx', 'tsc', '--noEmit'] + [os.path.relpath(f, self.directory_path) for f in ts_files]
+                result = subprocess.run(command, capture_output=True, stdin=subprocess.DEVNULL,
+                                      env=_TOOL_ENV, cwd=self.directory_path)
                 
-                # Check for magic numbers
-                if any(char.isdigit() for char in stripped) and not stripped.startswith('#'):
-                    numbers = [int(s) for s in stripped.split() if s.isdigit() and int(s) > 1]
-                    if numbers and max(numbers) > 100:
-                        quality_issues.append(f"Line {i}: Magic number found: {max(numbers)}")
+                # A clean run is not decoded or parsed at all
+                output = (result.stdout + result.stderr).decode('utf-8', 'replace') if result.returncode != 0 else ""
+                errors = {}
+                for line in output.splitlines():
+                    match = _TSC_ERROR_RE.match(line)
+                    if match:
+                        path = os.path.normpath(os.path.join(self.directory_path, match['file']))
+                        errors.setdefault(path, []).append(f"Line {match['line']}: {match['message']}")
+                if result.returncode != 0 and not errors:
+                    # tsc itself failed (not installed, bad tsconfig) - no per-file verdict
+                    status["tsc"] = output.strip()
+                else:
+                    for f in ts_files:
+                        status[f] = errors.get(os.path.normpath(f), "OK")
+            
+            if js_files:
+                # node --check takes a single file, so parse them all in one node process
+                # The file list goes in on stdin, so the child never reads the terminal
+                result = subprocess.run(['node', '--experimental-vm-modules', '-e', _JS_CHECK_SCRIPT],
+                                      input=json.dumps(js_files).encode('utf-8'), capture_output=True, env=_TOOL_ENV)
+                if result.returncode != 0:
+                    status["node"] = result.stderr.decode('utf-8', 'replace').strip()
+                else:
+                    for f, error in json.loads(result.stdout).items():
+                        status[f] = error or "OK"
             
-            # Check for missing error handling
-            has_try_catch = 'try' in content.lower() and 'catch' in content.lower()
-            has_error_handling = 'error' in content.lower() or 'exception' in content.lower()
+            for f in py_files:
+                status[f] = _python_syntax_error(f) or "OK"
             
-            if not has_try_catch and not has_error_handling:
-                quality_issues.append("Missing error handling - no try/catch or error handling found")
+            return json.dumps(status, indent=2)
+            
+        except Exception as e:
+            return f"Error checking syntax in {self.directory_path}: {str(e)}"
+
+class CodeQualityAnalyzer(BaseTool):
+    """Analyze code quality, complexity, and best practices."""
+    file_path: str = Field(..., description="Path to file to analyze for code quality")
+    
+    def run(self):
+        try:
+            quality_issues = _scan_all(self.file_path)["quality"]
             
             if not quality_issues:
                 return f"OK {self.file_path}: Code quality looks good"
@@ -196,25 +441,138 @@ class CodeQualityAnalyzer(BaseTool):
         except Exception as e:
             return f"Error analyzing quality for {self.file_path}: {str(e)}"
 
+class AuditFile(BaseTool):
+    """Run the placeholder, security and quality checks on a file in one call."""
+    file_path: str = Field(..., description="Path to file to audit")
+    
+    def run(self):
+        report = _scan_file(self.file_path)
+        if "error" in report:
+            return f"Error auditing {self.file_path}: {report['error']}"
+        return json.dumps(report, indent=2)
+
+BATCH_TOKEN_BUDGET = 20000
+
+def _estimate_tokens(text):
+    """Rough token count (~4 characters per token) for packing prompts."""
+    return len(text) // 4
+
+def _strip_python_comments(source):
+    """Python lines with comments removed, keeping placeholder markers like TODO."""
+    lines = list(source.lines)
+    try:
+        tokens = tokenize.generate_tokens(io.StringIO(source.content).readline)
+        for token in tokens:
+            if token.type == tokenize.COMMENT and not PLACEHOLDER_RE.search(token.string):
+                row, col = token.start
+                lines[row - 1] = lines[row - 1][:col]
+    except (tokenize.TokenError, SyntaxError):
+        pass  # Unparseable file: ship whatever was stripped so far
+    return lines
+
+def _strip_js_comments(source):
+    """JS/TS lines with comments removed; string literals and line count are preserved."""
+    def replace(match):
+        if match['string'] or PLACEHOLDER_RE.search(match.group()):
+            return match.group()
+        return '\n' * match.group().count('\n')
+    return JS_COMMENT_RE.sub(replace, source.content).split('\n')
+
+def _compact_line(line):
+    """Shrink indentation to one space per level (4 columns) and drop trailing whitespace."""
+    code = line.strip()
+    width = len(line[:len(line) - len(line.lstrip())].expandtabs(4))
+    return ' ' * ((width + 3) // 4) + code
+
+def _compact_source(path, source):
+    """Code without comments, blank lines or wide indentation, tagged with original line numbers."""
+    ext = os.path.splitext(path)[1]
+    if ext == '.py':
+        lines = _strip_python_comments(source)
+    elif ext in ('.js', '.jsx', '.ts', '.tsx'):
+        lines = _strip_js_comments(source)
+    else:
+        return source.content
+    return "\n".join(f"{i}|{_compact_line(line)}" for i, line in enumerate(lines, 1) if line.strip())
+
+class BatchFileAnalyzer(BaseTool):
+    """Return the contents of several files in one response so they are reviewed in a single LLM call.
+    Code lines are prefixed with their original line number (`42|...`); comments are stripped
+    and indentation is shrunk to one space per level."""
+    file_paths: list[str] = Field(..., description="Paths of the files to review together (up to 15)")
+    
+    def run(self):
+        sections = []
+        deferred = []
+        used = 0
+        
+        for path in self.file_paths:
+            try:
+                # Comments and blank lines cost tokens without helping the review
+                content = _compact_source(path, _read_source(path))
+            except Exception as e:
+                sections.append(f"### FILE: {path}\nError reading file: {str(e)}\n### END\n")
+                continue
+            
+            section = f"### FILE: {path}\n{content}\n### END\n"
+            tokens = _estimate_tokens(section)
+            if used + tokens > BATCH_TOKEN_BUDGET:
+                # Always ship at least one file, truncated if it alone is over budget
+                if sections:
+                    deferred.append(path)
+                    continue
+                section = f"### FILE: {path}\n{content[:BATCH_TOKEN_BUDGET * 4]}\n[truncated]\n### END\n"
+                tokens = BATCH_TOKEN_BUDGET
+            sections.append(section)
+            used += tokens
+        
+        if deferred:
+            sections.append("### DEFERRED (token budget reached, request these in the next batch):\n" + "\n".join(deferred))
+        return "\n".join(sections)
+
+class BatchAuditor(BaseTool):
+    """Audit every code file under a directory in parallel and return all findings at once."""
+    directory_path: str = Field(..., description="Path to directory to audit")
+    
+    def run(self):
+        try:
+            files = _find_audit_files(self.directory_path)
+            with _audit_executor() as executor:
+                results = list(executor.map(_scan_file, files))
+            
+            # Only ship files with findings back to the LLM
+            flagged = [r for r in results if r.get("error") or r["placeholder"] or r["security"] or r["quality"]]
+            return json.dumps({
+                "directory": self.directory_path,
+                "files_scanned": len(files),
+                "files_with_issues": len(flagged),
+                "results": flagged,
+            }, indent=2)
+            
+        except Exception as e:
+            return f"Error auditing directory {self.directory_path}: {str(e)}"
+
+REQUIRED_SCRIPTS = frozenset({'start', 'test', 'build'})
+
+@lru_cache(maxsize=64)
+def _load_package_json(path, mtime_ns):
+    """Parse package.json once per file version; bytes skip the text decode layer."""
+    with open(path, 'rb') as file:
+        return json.loads(file.read())
+
 class DependencyChecker(BaseTool):
     """Check package.json dependencies for vulnerabilities and issues."""
     file_path: str = Field(..., description="Path to package.json file")
     
     def run(self):
         try:
-            import json
-            with open(self.file_path, 'r') as file:
-                package_data = json.load(file)
+            package_data = _load_package_json(self.file_path, os.stat(self.file_path).st_mtime_ns)
             
             issues = []
             
             # Check for missing scripts
-            scripts = package_data.get('scripts', {})
-            required_scripts = ['start', 'test', 'build']
-            
-            for script in required_scripts:
-                if script not in scripts:
-                    issues.append(f"Missing required script: {script}")
+            missing_scripts = REQUIRED_SCRIPTS - package_data.get('scripts', {}).keys()
+            issues.extend(f"Missing required script: {script}" for script in sorted(missing_scripts))
             
             # Check dependencies
             dependencies = package_data.get('dependencies', {})
@@ -241,135 +599,52 @@ class DirectoryScanner(BaseTool):
     
     def run(self):
         try:
-            files_found = []
-            for root, dirs, files in os.walk(self.directory_path):
-                for file in files:
-                    if file.endswith(('.ts', '.tsx', '.js', '.jsx', '.py', '.json')):
-                        full_path = os.path.join(root, file)
-                        files_found.append(full_path)
+            files_found = _find_audit_files(self.directory_path)
             
             return f"Found {len(files_found)} files to audit:\n" + "\n".join(files_found)
             
         except Exception as e:
             return f"Error scanning directory {self.directory_path}: {str(e)}"
 
-# Create Audit Agents
-placeholder_hunter = Agent(
-    name="PlaceholderHunter",
-    description="Specialized agent to hunt down placeholder code, TODOs, and incomplete implementations",
-    instructions="""You are a specialized code auditor focused on finding placeholder content.
-    
-    Your mission:
-    1. Use FileAnalyzer to examine every code file
-    2. Find ALL placeholder code, TODO comments, demo data, mock implementations
-    3. Identify incomplete functions and empty implementations
-    4. Report exact line numbers and content
-    5. ZERO TOLERANCE for placeholder code in production
-    
-    Use DirectoryScanner first to find all files, then FileAnalyzer on each file.
-    Report every single placeholder found with precise location.""",
-    tools=[FileAnalyzer, DirectoryScanner],
-)
-
-security_auditor = Agent(
-    name="SecurityAuditor", 
-    description="Security specialist focused on finding vulnerabilities and security issues",
-    instructions="""You are a security auditing specialist.
-    
-    Your mission:
-    1. Use SecurityScanner to examine all code files for security vulnerabilities
-    2. Find SQL injection risks, hardcoded secrets, unsafe operations
-    3. Check for missing input validation and sanitization
-    4. Identify potential XSS and CSRF vulnerabilities
-    5. Flag any security anti-patterns
-    
-    Scan every file systematically and report all security issues with severity levels.
-    Focus on backend API routes, database queries, and user input handling.""",
-    tools=[SecurityScanner, DirectoryScanner, FileAnalyzer],
-)
-
-syntax_validator = Agent(
-    name="SyntaxValidator",
-    description="Code syntax and compilation specialist",
-    instructions="""You are a syntax validation specialist.
-    
-    Your mission:
-    1. Use SyntaxChecker to validate syntax of all code files
-    2. Run TypeScript/JavaScript compilation checks
-    3. Verify Python syntax if any Python files exist
-    4. Check for import/export errors
-    5. Validate JSON configuration files
-    
-    Ensure every file can compile/execute without syntax errors.
-    Report compilation failures and syntax issues immediately.""",
-    tools=[SyntaxChecker, DirectoryScanner],
-)
-
-quality_inspector = Agent(
-    name="QualityInspector",
-    description="Code quality and best practices inspector", 
-    instructions="""You are a code quality inspector focused on best practices.
-    
-    Your mission:
-    1. Use CodeQualityAnalyzer to examine code quality issues
-    2. Check for overly complex functions and high nesting
-    3. Find magic numbers, long lines, poor naming
-    4. Verify error handling is implemented
-    5. Check for code duplication and anti-patterns
-    
-    Analyze every file for maintainability and readability issues.
-    Report quality violations that could cause maintenance problems.""",
-    tools=[CodeQualityAnalyzer, DirectoryScanner, FileAnalyzer],
-)
-
-dependency_auditor = Agent(
-    name="DependencyAuditor",
-    description="Package dependency and configuration auditor",
-    instructions="""You are a dependency and configuration auditor.
-    
-    Your mission:
-    1. Use DependencyChecker to audit all package.json files
-    2. Check for missing required scripts (start, test, build)
-    3. Identify vulnerable or outdated dependencies
-    4. Verify configuration files are complete
-    5. Check for missing development dependencies
-    
-    Examine all package.json, tsconfig.json, and configuration files.
-    Report missing dependencies and configuration issues.""",
-    tools=[DependencyChecker, DirectoryScanner, FileAnalyzer],
-)
-
+# Create Audit Agent - one agent with every audit tool, so no agent-to-agent handoffs
 audit_coordinator = Agent(
     name="AuditCoordinator",
-    description="Master auditor that coordinates all audit activities and compiles final report",
-    instructions="""You are the master audit coordinator.
+    description="Auditor that runs every audit check itself and compiles the final report",
+    instructions="""You are the SMS platform code auditor.
     
     Your mission:
-    1. Coordinate all audit agents to examine the SMS platform project
-    2. Collect reports from all specialized auditors
-    3. Compile a comprehensive audit report
-    4. Prioritize issues by severity (Critical, High, Medium, Low)
-    5. Provide actionable recommendations for fixes
+    1. Find ALL placeholder code, TODOs, demo data and incomplete implementations
+    2. Find ALL security vulnerabilities: SQL injection, hardcoded secrets, unsafe execution, missing input validation
+    3. Validate that every TypeScript/JavaScript/Python file compiles
+    4. Find code quality problems: long lines, deep nesting, magic numbers, missing error handling
+    5. Audit every package.json for missing scripts and outdated dependencies
+    6. Prioritize issues by severity (Critical, High, Medium, Low) with actionable fixes
     
-    Direct other agents to audit specific components:
+    Audit these components:
     - Backend code in backend/ directory
     - Frontend code in frontend/ directory  
     - Device integration in device/ directory
     - Mobile code in mobile/ directory
     - Configuration and dependency files
     
+    Tool usage:
+    - Run BatchAuditor once per directory - it returns placeholder, security and quality
+      findings for every file at once. Use AuditFile only to re-check a single file.
+    - Run BatchSyntaxChecker once per directory for compilation checks.
+    - Run DependencyChecker on each package.json.
+    - To read source for review, call BatchFileAnalyzer with up to 15 file paths per
+      invocation instead of one, and resubmit any paths it lists as deferred.
+    - Independent tool calls (different directories, different checks) should be issued
+      together in the same turn so they run in parallel.
+    
     Generate a final executive summary of all findings.""",
-    tools=[DirectoryScanner, FileAnalyzer, SecurityScanner, SyntaxChecker, CodeQualityAnalyzer, DependencyChecker],
+    tools=[DirectoryScanner, BatchAuditor, AuditFile, BatchFileAnalyzer, BatchSyntaxChecker, DependencyChecker],
+    parallel_tool_calls=True,
 )
 
-# Create Audit Agency
-audit_agency = Agency(
-    audit_coordinator,
-    placeholder_hunter,
-    security_auditor, 
-    syntax_validator,
-    quality_inspector,
-    dependency_auditor,
+# Create Audit Agency (AUDIT_CACHE=1 replays identical audit prompts from disk)
+audit_agency = CachedAgency(Agency(
+    [audit_coordinator],
     shared_instructions="""
     COMPREHENSIVE CODE AUDIT MISSION
     
@@ -402,56 +677,48 @@ audit_agency = Agency(
     - Give specific fix recommendations
     - Include executive summary
     """
-)
+), namespace="audit")
 
-def run_comprehensive_audit():
-    """Run comprehensive audit of the SMS platform codebase."""
+# Static directive first so every audit prompt shares an identical prefix (OpenAI prompt caching)
+AUDIT_KICKOFF = (Path(__file__).parent / "audit_kickoff.txt").read_text(encoding="utf-8")
+AUDIT_KICKOFF_TOKENS = _estimate_tokens(AUDIT_KICKOFF)
+AUDIT_DIRECTORIES = ["backend/", "frontend/", "device/", "mobile/", "./"]
+AUDIT_SCOPE = f"Directories: {', '.join(AUDIT_DIRECTORIES)}\n"
+
+_max_prompt_tokens = getattr(audit_agency, "max_prompt_tokens", None)
+if isinstance(_max_prompt_tokens, int) and AUDIT_KICKOFF_TOKENS > _max_prompt_tokens:
+    print(f"WARNING audit_kickoff.txt (~{AUDIT_KICKOFF_TOKENS} tokens) exceeds max_prompt_tokens={_max_prompt_tokens}")
+
+def _log_prompt_cache(name, thread):
+    """Print prompt and server-side cached token counts for the thread's last run."""
+    usage = getattr(getattr(thread, "_run", None), "usage", None)
+    if usage is None:
+        return
+    # Run usage only carries cache details when the API returns them
+    details = getattr(usage, "prompt_token_details", None) or getattr(usage, "prompt_tokens_details", None)
+    cached = details.get("cached_tokens") if isinstance(details, dict) else getattr(details, "cached_tokens", None)
+    print(f"[{name}] prompt tokens: {usage.prompt_tokens}, cached: {cached if cached is not None else 'n/a'}")
+
+async def run_comprehensive_audit_async():
+    """Run the full audit with the single audit agent and stream its report."""
     
     print("SMS PLATFORM COMPREHENSIVE CODE AUDIT")
-    print("Deploying specialized audit agents...")
+    print("Deploying audit agent...")
     print("=" * 60)
     
     try:
-        audit_command = """
-        AUDIT DIRECTIVE: COMPREHENSIVE CODEBASE AUDIT
-        
-        AuditCoordinator: Direct all audit agents to examine the SMS platform codebase.
-        
-        IMMEDIATE ACTIONS:
-        
-        1. PlaceholderHunter: Scan ALL directories for placeholder code, TODOs, incomplete implementations
-        2. SecurityAuditor: Examine ALL code for security vulnerabilities and risks  
-        3. SyntaxValidator: Validate syntax and compilation of ALL TypeScript/JavaScript files
-        4. QualityInspector: Analyze code quality, complexity, and best practices
-        5. DependencyAuditor: Audit ALL package.json and configuration files
-        
-        SCAN THESE DIRECTORIES THOROUGHLY:
-        - backend/ (Node.js/Express server)
-        - frontend/ (React dashboard) 
-        - device/ (WebUSB integration)
-        - mobile/ (React Native apps)
-        - Root configuration files
-        
-        FIND EVERY ISSUE:
-        - Placeholder code and TODOs
-        - Security vulnerabilities
-        - Syntax errors and compilation failures
-        - Code quality problems
-        - Missing dependencies
-        - Configuration issues
-        
-        Generate comprehensive audit report with severity levels and fix recommendations.
-        
-        START AUDIT NOW.
-        """
+        audit_command = AUDIT_KICKOFF + f"""
+AuditCoordinator: Run every audit check yourself, issuing independent tool calls
+in parallel, then produce one comprehensive audit report with severity levels,
+fix recommendations and an executive summary.
+{AUDIT_SCOPE}"""
         
         print("Starting comprehensive audit...")
-        response = audit_agency.get_completion(audit_command)
-        
         print("\n" + "=" * 60)
         print("COMPREHENSIVE AUDIT REPORT:")
         print("=" * 60)
-        print(response)
+        response = await asyncio.to_thread(stream_completion, audit_agency, audit_command)
+        _log_prompt_cache(audit_coordinator.name, audit_agency.main_thread)
         
         return audit_agency, response
         
@@ -461,11 +728,59 @@ def run_comprehensive_audit():
         traceback.print_exc()
         return None, str(e)
 
+def run_comprehensive_audit():
+    """Run comprehensive audit of the SMS platform codebase."""
+    return asyncio.run(run_comprehensive_audit_async())
+
+class BatchedAudit:
+    """Non-interactive full-repo audit through the OpenAI Batch API.
+    
+    One chat completion per file, submitted as a single batch job: half the price
+    of live calls and outside the RPM limits, at the cost of a 24h completion window.
+    """
+    
+    def __init__(self, root=".", model=None, client=None):
+        self.root = root
+        self.model = model or audit_coordinator.model
+        self.client = client or get_openai_client()
+    
+    def build_requests(self):
+        """One /v1/chat/completions request per auditable file, keyed by its path."""
+        requests = []
+        for path in _find_audit_files(self.root):
+            try:
+                payload = _compact_source(path, _read_source(path))[:BATCH_TOKEN_BUDGET * 4]
+            except Exception as e:
+                print(f"ERROR skipping {path}: {str(e)}")
+                continue
+            
+            user_message = (
+                f"### FILE: {path}\n"
+                f"Static findings: {json.dumps(_scan_file(path))}\n\n"
+                f"{payload}\n### END\n"
+                "Audit this file. Lines are prefixed with their original line number."
+            )
+            requests.append(chat_request(path, self.model, AUDIT_KICKOFF, user_message))
+        return requests
+    
+    def run(self):
+        requests = self.build_requests()
+        if not requests:
+            return {}
+        return run_batch(self.client, requests)
+
 if __name__ == "__main__":
     print("DEPLOYING SMS PLATFORM AUDIT AGENCY")
-    print("Specialized agents: Placeholder Hunter, Security Auditor, Syntax Validator, Quality Inspector, Dependency Auditor")
+    print("Audit agent: placeholder, security, syntax, quality and dependency checks in one agent")
     print()
     
+    # Overnight mode: per-file audits through the Batch API, no interactive session
+    if "--batch" in sys.argv:
+        reviews = BatchedAudit().run()
+        for path, review in reviews.items():
+            print(f"\n{'=' * 60}\n{path}\n{'=' * 60}\n{review}")
+        sys.exit(0)
+    
     # Run comprehensive audit
     audit_instance, audit_report = run_comprehensive_audit()
     
@@ -478,20 +793,18 @@ if __name__ == "__main__":
             print("\nAudit agency ready for additional commands...")
             print("Type 'reaudit <directory>' for specific directory audit, 'exit' to stop")
             
-            while True:
-                user_input = input("\nAudit Command: ").strip()
-                
-                if user_input.lower() == 'exit':
-                    break
-                elif user_input.startswith('reaudit'):
+            def handle_command(user_input):
+                if user_input.startswith('reaudit'):
                     directory = user_input.replace('reaudit', '').strip()
                     if directory:
-                        response = audit_instance.get_completion(f"Re-audit the {directory} directory for any issues missed in the initial scan")
-                        print(f"\nRe-audit Results:\n{response}")
-                elif user_input:
-                    print("\nProcessing...")
-                    response = audit_instance.get_completion(user_input)
-                    print(f"\nAudit Response:\n{response}")
+                        print("\nRe-audit Results:")
+                        stream_completion(audit_instance, f"Re-audit the {directory} directory for any issues missed in the initial scan")
+                else:
+                    print("\nAudit Response:")
+                    stream_completion(audit_instance, user_input)
+            
+            # Commands typed while a reply streams are queued, not blocked
+            asyncio.run(command_loop("\nAudit Command: ", handle_command))
                     
         except KeyboardInterrupt:
             print("\n\nAudit agency stopped")
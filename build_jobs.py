@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Build Job Journal
+=================
+
+Run agent build turns as journaled jobs. Every turn's state (queued,
+running, done, failed) and result is written to a JSON file as it
+changes, so progress can be read without asking any agent, and a build
+that crashed or was interrupted resumes where it stopped: finished turns
+are replayed from the journal and only the rest run again. Failed turns
+are retried before they are reported.
+"""
+
+import os
+import json
+import time
+import asyncio
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from agent_turns import run_agent_turn
+
+JOB_RETRIES = 3
+
+
+def job_id(agent, message: str) -> str:
+    """Stable id for one agent turn, so a rerun finds its earlier result."""
+    return hashlib.sha256(f"{agent.name}\n{message}".encode("utf-8")).hexdigest()[:16]
+
+
+class BuildJournal:
+    """Job states kept in memory and mirrored to a JSON file on every change."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        try:
+            with open(path, encoding="utf-8") as file:
+                self.jobs = json.load(file)
+        except (OSError, ValueError):
+            self.jobs = {}
+
+    def _save(self):
+        # Written to a temporary file and swapped in, so a crash never leaves half a journal
+        temporary = self.path + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            json.dump(self.jobs, file, indent=2)
+        os.replace(temporary, self.path)
+
+    def update(self, job: str, **fields):
+        with self._lock:
+            self.jobs.setdefault(job, {}).update(fields, updated=time.time())
+            self._save()
+
+    def reset(self):
+        with self._lock:
+            self.jobs = {}
+            self._save()
+
+    def summary(self) -> str:
+        """One line per job, read from the journal without touching the agents."""
+        with self._lock:
+            jobs = list(self.jobs.values())
+        if not jobs:
+            return "No build jobs recorded"
+        lines = []
+        for job in jobs:
+            line = f"{job.get('agent', '?')}: {job.get('state', '?')}"
+            if job.get("attempts", 0) > 1:
+                line += f" (attempt {job['attempts']})"
+            if job.get("state") == "failed" and job.get("error"):
+                line += f" - {job['error']}"
+            lines.append(line)
+        return "\n".join(lines)
+
+
+def _run_job(agency, agent, message, journal, job, retries):
+    for attempt in range(1, retries + 1):
+        journal.update(job, agent=agent.name, state="running", attempts=attempt)
+        try:
+            result = run_agent_turn(agency, agent, message)
+        except Exception as e:
+            journal.update(job, state="failed", error=str(e))
+            if attempt == retries:
+                raise
+        else:
+            journal.update(job, state="done", result=result, error=None)
+            return result
+
+
+async def run_journaled_turns(agency, turns, journal: BuildJournal, retries: int = JOB_RETRIES):
+    """Run (agent, message) turns concurrently through the journal; results come back in order, like gather.
+
+    A build whose turns all finished is not replayed: running the same
+    turns again starts a new build.
+    """
+    jobs = [job_id(agent, message) for agent, message in turns]
+    if all(journal.jobs.get(job, {}).get("state") == "done" for job in jobs):
+        journal.reset()
+
+    loop = asyncio.get_running_loop()
+    with ThreadPoolExecutor(max_workers=max(len(turns), 1)) as pool:
+        pending = []
+        for (agent, message), job in zip(turns, jobs):
+            entry = journal.jobs.get(job, {})
+            if entry.get("state") == "done":
+                replayed = loop.create_future()
+                replayed.set_result(entry["result"])
+                pending.append(replayed)
+                continue
+            journal.update(job, agent=agent.name, state="queued")
+            pending.append(loop.run_in_executor(pool, _run_job, agency, agent, message, journal, job, retries))
+        return await asyncio.gather(*pending, return_exceptions=True)
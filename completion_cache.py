@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Agency Completion Cache
+=======================
+
+Disk cache in front of Agency.get_completion so identical prompts
+(kickoff directives, re-audit commands) are answered without another
+LLM round-trip during iterative development runs.
+
+Enabled with AUDIT_CACHE=1; leave it unset whenever fresh, sampled
+responses are wanted. Entries can be given a time to live, after which
+the prompt goes to the LLM again.
+
+RepeatQueryCache is the in-memory counterpart for interactive sessions:
+operators re-ask the same status questions, and while the task state has
+not changed the previous answer still holds. Only read-only queries it is
+given are cached, and only on an exact match after case and punctuation
+are dropped: near matches ("task 12" / "task 13") are different questions,
+and an instruction typed twice must run twice.
+"""
+
+import os
+import json
+import re
+import time
+import hashlib
+from pathlib import Path
+from agent_turns import run_agent_turn
+
+CACHE_DIR = Path("cache")
+WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+class CachedAgency:
+    """Wrap an Agency and serve repeated get_completion prompts from disk."""
+
+    def __init__(self, agency, namespace: str, cache_dir: Path = CACHE_DIR, enabled: bool = None, ttl: float = None):
+        self.agency = agency
+        self.namespace = namespace
+        self.cache_dir = Path(cache_dir)
+        self.enabled = os.getenv("AUDIT_CACHE") == "1" if enabled is None else enabled
+        self.ttl = ttl
+
+    def _cache_path(self, message: str) -> Path:
+        key = hashlib.sha256(f"{self.namespace}\0{message}".encode()).hexdigest()
+        return self.cache_dir / f"{key}.json"
+
+    def _load(self, message: str):
+        path = self._cache_path(message)
+        if not path.exists():
+            return None
+        entry = json.loads(path.read_text(encoding="utf-8"))
+        # Entries written before TTLs existed carry no time and never expire
+        if self.ttl is not None and time.time() - entry.get("time", time.time()) > self.ttl:
+            return None
+        return entry["response"]
+
+    def _store(self, message: str, response) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._cache_path(message).write_text(
+            json.dumps({"message": message, "response": response, "time": time.time()}), encoding="utf-8"
+        )
+
+    def get_completion(self, message: str, **kwargs):
+        # Extra arguments (recipient, attachments, ...) change the answer; don't cache them
+        if not self.enabled or kwargs:
+            return self.agency.get_completion(message, **kwargs)
+
+        cached = self._load(message)
+        if cached is not None:
+            return cached
+
+        response = self.agency.get_completion(message)
+        self._store(message, response)
+        return response
+
+    def get_completion_stream(self, message: str, event_handler, **kwargs):
+        if not self.enabled or kwargs:
+            return self.agency.get_completion_stream(message, event_handler=event_handler, **kwargs)
+
+        # A hit returns the stored text without streaming it through the handler
+        cached = self._load(message)
+        if cached is not None:
+            return cached
+
+        response = self.agency.get_completion_stream(message, event_handler=event_handler)
+        self._store(message, response)
+        return response
+
+    def run_agent_turn(self, agent, message: str):
+        """A direct agent turn (agent_turns.run_agent_turn), cached per agent and message."""
+        if not self.enabled:
+            return run_agent_turn(self.agency, agent, message)
+
+        key = f"{agent.name}\0{message}"
+        cached = self._load(key)
+        if cached is not None:
+            return cached
+
+        response = run_agent_turn(self.agency, agent, message)
+        self._store(key, response)
+        return response
+
+    def run_batched_turns(self, assignments, run_batch) -> dict:
+        """Cached counterpart of run_batch({agent: message}) -> {agent name: reply}.
+
+        Only the assignments without a cached reply go to run_batch, together.
+        """
+        if not self.enabled:
+            return run_batch(assignments)
+
+        replies, missing = {}, {}
+        for agent, message in assignments.items():
+            cached = self._load(f"{agent.name}\0{message}")
+            if cached is not None:
+                replies[agent.name] = cached
+            else:
+                missing[agent] = message
+        if missing:
+            fresh = run_batch(missing)
+            for agent, message in missing.items():
+                if agent.name in fresh:
+                    self._store(f"{agent.name}\0{message}", fresh[agent.name])
+            replies.update(fresh)
+        return replies
+
+    def __getattr__(self, name):
+        return getattr(self.agency, name)
+
+
+def _normalize_query(message: str) -> str:
+    return " ".join(WORD_RE.findall(message.lower()))
+
+
+class RepeatQueryCache:
+    """Serve repeats of the given read-only queries from memory while the task state is unchanged.
+
+    queries are the messages that may be cached (status and progress
+    reports); everything else always reaches the agency. state_fn returns a
+    fingerprint of the project state (None when unknown, which disables the
+    cache for that call); answers recorded under another state are dropped.
+    """
+
+    def __init__(self, agency, state_fn, queries):
+        self.agency = agency
+        self.state_fn = state_fn
+        self.queries = frozenset(_normalize_query(query) for query in queries)
+        self._entries = {}
+
+    def _lookup(self, message: str):
+        """(cached response or None, state, normalized query); state is None when the message is not cached."""
+        query = _normalize_query(message)
+        if query not in self.queries:
+            return None, None, None
+        state = self.state_fn()
+        if state is None:
+            return None, None, None
+
+        cached = self._entries.get(query)
+        if cached is not None and cached[0] == state:
+            return cached[1], state, query
+        return None, state, query
+
+    def get_completion(self, message: str, **kwargs):
+        if kwargs:
+            return self.agency.get_completion(message, **kwargs)
+
+        cached, state, query = self._lookup(message)
+        if cached is not None:
+            return cached
+
+        response = self.agency.get_completion(message)
+        if state is not None:
+            self._entries[query] = (state, response)
+        return response
+
+    def get_completion_stream(self, message: str, event_handler, **kwargs):
+        if kwargs:
+            return self.agency.get_completion_stream(message, event_handler=event_handler, **kwargs)
+
+        # A hit returns the stored text without streaming it through the handler
+        cached, state, query = self._lookup(message)
+        if cached is not None:
+            return cached
+
+        response = self.agency.get_completion_stream(message, event_handler=event_handler)
+        if state is not None:
+            self._entries[query] = (state, response)
+        return response
+
+    def __getattr__(self, name):
+        return getattr(self.agency, name)
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Agency Completion Streaming
+===========================
+
+Print agency replies token by token as they arrive instead of waiting
+for the whole completion, so operators see output after the first token.
+The command loop keeps reading input while a reply is still streaming,
+so the next command can be typed ahead and runs as soon as it is free.
+"""
+
+import sys
+import asyncio
+import threading
+from agency_swarm import AgencyEventHandler
+from agent_turns import request_scope
+from latency import first_token
+
+
+def write_lines(*lines) -> None:
+    """Write a block of console lines with one write and one flush instead of a print per line."""
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+
+
+class StdoutStreamHandler(AgencyEventHandler):
+    """Write every text delta from any agent in the agency to stdout."""
+    streamed = False
+
+    def on_text_created(self, text) -> None:
+        sys.stdout.write(f"\n[{self.recipient_agent_name}] ")
+        sys.stdout.flush()
+
+    def on_text_delta(self, delta, snapshot) -> None:
+        if delta.value:
+            first_token()
+            type(self).streamed = True
+            sys.stdout.write(delta.value)
+            sys.stdout.flush()
+
+
+def stream_completion(agency, message: str, **kwargs) -> str:
+    """Stream the agency's reply to stdout and return the final response text."""
+    # Fresh handler class per call: the agency takes a class and keeps state on it
+    handler = type("CompletionStreamHandler", (StdoutStreamHandler,), {"streamed": False})
+    with request_scope():
+        response = agency.get_completion_stream(message, event_handler=handler, **kwargs)
+
+    # Cached replies arrive without any deltas
+    if not handler.streamed and response:
+        sys.stdout.write(str(response))
+    sys.stdout.write("\n")
+    sys.stdout.flush()
+    return response
+
+
+async def command_loop(prompt: str, handle_command) -> None:
+    """Run handle_command for each line typed, reading ahead while replies stream."""
+    loop = asyncio.get_running_loop()
+    commands = asyncio.Queue()
+
+    def read_commands():
+        # Daemon thread: a pending input() must not keep the process alive on exit
+        while True:
+            try:
+                line = input()
+            except EOFError:
+                line = None
+            try:
+                loop.call_soon_threadsafe(commands.put_nowait, line)
+            except RuntimeError:
+                return  # event loop already closed
+            if line is None or line.strip().lower() == 'exit':
+                return
+
+    threading.Thread(target=read_commands, daemon=True).start()
+
+    while True:
+        # Only prompt when nothing is queued, so the prompt never cuts into streamed text
+        if commands.empty():
+            sys.stdout.write(prompt)
+            sys.stdout.flush()
+        command = await commands.get()
+        if command is None or command.strip().lower() == 'exit':
+            return
+        if command.strip():
+            await asyncio.to_thread(handle_command, command.strip())
@@ -8,378 +8,559 @@ Each agent focuses on specific dashboard components with development tools.
 """
 
 import os
-import subprocess
+import re
+import sys
+import asyncio
+import openai
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from agency_swarm import Agency, Agent
-from agency_swarm.tools import BaseTool
-from pydantic import Field
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
-os.environ["OPENAI_API_KEY"] = os.getenv('OPENAI_API_KEY')
-
-# Reuse development tools from previous swarm
-class FileWriter(BaseTool):
-    """Write code or text to a file."""
-    file_path: str = Field(..., description="Path where file should be written")
-    content: str = Field(..., description="Content to write to the file")
-    mode: str = Field(default="w", description="Write mode: 'w' for overwrite, 'a' for append")
-    
-    def run(self):
-        try:
-            os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
-            with open(self.file_path, self.mode) as file:
-                file.write(self.content)
-            return f"Successfully wrote to {self.file_path}"
-        except Exception as e:
-            return f"Error writing file: {str(e)}"
-
-class CommandExecutor(BaseTool):
-    """Execute terminal commands."""
-    command: str = Field(..., description="Command to execute")
-    working_directory: str = Field(default=".", description="Working directory")
-    
-    def run(self):
-        try:
-            result = subprocess.run(
-                self.command, shell=True, capture_output=True, 
-                text=True, cwd=self.working_directory
-            )
-            if result.returncode == 0:
-                return f"Command executed successfully:\n{result.stdout}"
-            else:
-                return f"Command failed:\n{result.stderr}"
-        except Exception as e:
-            return f"Execution error: {str(e)}"
-
-class FileReader(BaseTool):
-    """Read and examine file contents."""
-    file_path: str = Field(..., description="Path to file to read")
-    
-    def run(self):
-        try:
-            with open(self.file_path, 'r') as file:
-                content = file.read()
-            return f"File content of {self.file_path}:\n{content}"
-        except Exception as e:
-            return f"Error reading file: {str(e)}"
+from sms_tools import FileWriter, CommandExecutor, FileReader
+from agent_turns import format_turn_results, tick_loop, TICK_MS
+from completion_stream import command_loop, write_lines
+from fleet_dispatcher import FleetDispatcher
+from sms_config import get_openai_key
+
+# Instruction fragments every builder agent shares, interned once and composed per agent
+_MISSION_HEADER = sys.intern("Your mission:\n")
+_FILE_WRITER_PREAMBLE = sys.intern("Use FileWriter to create:\n")
+
+
+def _bullets(items):
+    return "\n".join(f"- {item}" for item in items)
+
+
+def _agent_instructions(intro, mission, section, section_items, files, closing):
+    """Assemble a builder agent's instructions from the shared fragments."""
+    steps = "\n".join(f"{i}. {step}" for i, step in enumerate(mission, 1))
+    return sys.intern("\n\n".join([
+        intro,
+        _MISSION_HEADER + steps,
+        f"{section}:\n{_bullets(section_items)}",
+        _FILE_WRITER_PREAMBLE + _bullets(files),
+        closing,
+    ]))
 
 # Dashboard Building Agents
 dashboard_architect = Agent(
     name="DashboardArchitect",
     description="Dashboard architecture designer and main component coordinator",
-    instructions="""You are the dashboard architect responsible for designing and coordinating the complete SMS campaign dashboard.
-
-Your mission:
-1. Design the overall dashboard structure and navigation
-2. Create the main App.tsx with proper routing between pages
-3. Set up the component architecture and shared utilities
-4. Coordinate other agents to build specific components
-5. Ensure consistent styling and user experience
-
-Components to orchestrate:
-- Device Management Dashboard
-- Campaign Creation Interface  
-- Live Campaign Monitor
-- Analytics Dashboard
-- Contact Management
-- Message Templates
-
-Use FileWriter to create:
-- Updated App.tsx with full navigation
-- Main dashboard layout components
-- Routing configuration
-- Shared utility functions
-- CSS styling framework
-
-Make it professional and production-ready with proper error handling.""",
+    instructions=_agent_instructions(
+        'You are the dashboard architect responsible for designing and coordinating the complete SMS campaign dashboard.',
+        mission=[
+            'Design the overall dashboard structure and navigation',
+            'Create the main App.tsx with proper routing between pages',
+            'Set up the component architecture and shared utilities',
+            'Coordinate other agents to build specific components',
+            'Ensure consistent styling and user experience',
+        ],
+        section='Components to orchestrate',
+        section_items=[
+            'Device Management Dashboard',
+            'Campaign Creation Interface',
+            'Live Campaign Monitor',
+            'Analytics Dashboard',
+            'Contact Management',
+            'Message Templates',
+        ],
+        files=[
+            'Updated App.tsx with full navigation',
+            'Main dashboard layout components',
+            'Routing configuration',
+            'Shared utility functions',
+            'CSS styling framework',
+        ],
+        closing='Make it professional and production-ready with proper error handling.',
+    ),
     tools=[FileWriter, CommandExecutor, FileReader],
 )
 
 device_dashboard_agent = Agent(
     name="DeviceDashboardAgent",
     description="Device management dashboard specialist",
-    instructions="""You are the device management dashboard specialist.
-
-Your mission:
-1. Build the Device Management page showing all connected phones
-2. Create real-time device status display (battery, signal, SIM)
-3. Build device connection interface for adding new phones
-4. Create device testing and control interface
-5. Show device statistics and performance metrics
-
-Features to implement:
-- Live device grid showing phone status
-- Device connection wizard for USB/WiFi setup
-- Individual device control panel
-- Device performance charts
-- Connection troubleshooting interface
-
-Use FileWriter to create:
-- DeviceManagement.tsx - main device dashboard
-- DeviceCard.tsx - individual device display
-- DeviceStats.tsx - device statistics
-- AddDevice.tsx - device connection wizard
-- WebSocket integration for real-time updates
-
-Make it visually appealing with status indicators and real-time updates.""",
+    instructions=_agent_instructions(
+        'You are the device management dashboard specialist.',
+        mission=[
+            'Build the Device Management page showing all connected phones',
+            'Create real-time device status display (battery, signal, SIM)',
+            'Build device connection interface for adding new phones',
+            'Create device testing and control interface',
+            'Show device statistics and performance metrics',
+        ],
+        section='Features to implement',
+        section_items=[
+            'Live device grid showing phone status',
+            'Device connection wizard for USB/WiFi setup',
+            'Individual device control panel',
+            'Device performance charts',
+            'Connection troubleshooting interface',
+        ],
+        files=[
+            'DeviceManagement.tsx - main device dashboard',
+            'DeviceCard.tsx - individual device display',
+            'DeviceStats.tsx - device statistics',
+            'AddDevice.tsx - device connection wizard',
+            'WebSocket integration for real-time updates',
+        ],
+        closing='Make it visually appealing with status indicators and real-time updates.',
+    ),
     tools=[FileWriter, CommandExecutor, FileReader],
 )
 
 campaign_builder_agent = Agent(
     name="CampaignBuilderAgent", 
     description="Campaign creation and management interface specialist",
-    instructions="""You are the campaign creation specialist.
-
-Your mission:
-1. Build campaign creation interface with contact upload
-2. Create message composition with variables and preview
-3. Build campaign scheduling and delivery options
-4. Create contact list management and validation
-5. Build campaign templates and saved messages
-
-Features to implement:
-- Campaign creation wizard
-- CSV contact upload with validation
-- Message editor with variable insertion
-- Campaign scheduling interface
-- Contact list management
-- Message template library
-- Campaign preview before sending
-
-Use FileWriter to create:
-- CampaignBuilder.tsx - main campaign creation
-- ContactUpload.tsx - CSV upload and validation  
-- MessageEditor.tsx - message composition
-- CampaignSchedule.tsx - scheduling options
-- ContactManager.tsx - contact list management
-- TemplateLibrary.tsx - saved message templates
-
-Focus on user-friendly interface with drag-and-drop and previews.""",
+    instructions=_agent_instructions(
+        'You are the campaign creation specialist.',
+        mission=[
+            'Build campaign creation interface with contact upload',
+            'Create message composition with variables and preview',
+            'Build campaign scheduling and delivery options',
+            'Create contact list management and validation',
+            'Build campaign templates and saved messages',
+        ],
+        section='Features to implement',
+        section_items=[
+            'Campaign creation wizard',
+            'CSV contact upload with validation',
+            'Message editor with variable insertion',
+            'Campaign scheduling interface',
+            'Contact list management',
+            'Message template library',
+            'Campaign preview before sending',
+        ],
+        files=[
+            'CampaignBuilder.tsx - main campaign creation',
+            'ContactUpload.tsx - CSV upload and validation',
+            'MessageEditor.tsx - message composition',
+            'CampaignSchedule.tsx - scheduling options',
+            'ContactManager.tsx - contact list management',
+            'TemplateLibrary.tsx - saved message templates',
+        ],
+        closing='Focus on user-friendly interface with drag-and-drop and previews.',
+    ),
     tools=[FileWriter, CommandExecutor, FileReader],
 )
 
 live_monitor_agent = Agent(
     name="LiveMonitorAgent",
     description="Real-time campaign monitoring dashboard specialist", 
-    instructions="""You are the live campaign monitoring specialist.
-
-Your mission:
-1. Build real-time campaign progress monitoring
-2. Create live message delivery tracking  
-3. Build device performance monitoring during campaigns
-4. Create delivery analytics and failure reporting
-5. Build campaign control interface (pause/resume/stop)
-
-Features to implement:
-- Live campaign progress bars and statistics
-- Real-time message delivery feed
-- Device performance monitoring during sends
-- Delivery success/failure analytics
-- Campaign control buttons (pause/resume/stop)
-- Message queue visualization per device
-- Live charts and graphs
-
-Use FileWriter to create:
-- CampaignMonitor.tsx - main monitoring dashboard
-- LiveProgress.tsx - real-time progress tracking
-- DevicePerformance.tsx - device performance during campaign
-- MessageFeed.tsx - live message delivery feed
-- CampaignControls.tsx - pause/resume/stop controls
-- DeliveryAnalytics.tsx - success/failure statistics
-
-Make it dynamic with live updates, charts, and visual feedback.""",
+    instructions=_agent_instructions(
+        'You are the live campaign monitoring specialist.',
+        mission=[
+            'Build real-time campaign progress monitoring',
+            'Create live message delivery tracking',
+            'Build device performance monitoring during campaigns',
+            'Create delivery analytics and failure reporting',
+            'Build campaign control interface (pause/resume/stop)',
+        ],
+        section='Features to implement',
+        section_items=[
+            'Live campaign progress bars and statistics',
+            'Real-time message delivery feed',
+            'Device performance monitoring during sends',
+            'Delivery success/failure analytics',
+            'Campaign control buttons (pause/resume/stop)',
+            'Message queue visualization per device',
+            'Live charts and graphs',
+        ],
+        files=[
+            'CampaignMonitor.tsx - main monitoring dashboard',
+            'LiveProgress.tsx - real-time progress tracking',
+            'DevicePerformance.tsx - device performance during campaign',
+            'MessageFeed.tsx - live message delivery feed',
+            'CampaignControls.tsx - pause/resume/stop controls',
+            'DeliveryAnalytics.tsx - success/failure statistics',
+        ],
+        closing='Make it dynamic with live updates, charts, and visual feedback.',
+    ),
     tools=[FileWriter, CommandExecutor, FileReader],
 )
 
 analytics_agent = Agent(
     name="AnalyticsAgent",
     description="Analytics dashboard and reporting specialist",
-    instructions="""You are the analytics and reporting specialist.
-
-Your mission:
-1. Build comprehensive analytics dashboard
-2. Create campaign performance reports
-3. Build device utilization analytics  
-4. Create delivery rate optimization insights
-5. Build historical data visualization
-
-Features to implement:
-- Campaign performance analytics
-- Device utilization reports  
-- Delivery success rate tracking
-- Response rate analytics (if applicable)
-- Historical trend analysis
-- Performance optimization recommendations
-- Export reports functionality
-
-Use FileWriter to create:
-- Analytics.tsx - main analytics dashboard
-- CampaignReports.tsx - campaign performance reports
-- DeviceAnalytics.tsx - device utilization analytics
-- DeliveryRates.tsx - delivery success tracking
-- TrendAnalysis.tsx - historical trends
-- ReportExport.tsx - export functionality
-
-Include charts, graphs, and data visualization components.""",
+    instructions=_agent_instructions(
+        'You are the analytics and reporting specialist.',
+        mission=[
+            'Build comprehensive analytics dashboard',
+            'Create campaign performance reports',
+            'Build device utilization analytics',
+            'Create delivery rate optimization insights',
+            'Build historical data visualization',
+        ],
+        section='Features to implement',
+        section_items=[
+            'Campaign performance analytics',
+            'Device utilization reports',
+            'Delivery success rate tracking',
+            'Response rate analytics (if applicable)',
+            'Historical trend analysis',
+            'Performance optimization recommendations',
+            'Export reports functionality',
+        ],
+        files=[
+            'Analytics.tsx - main analytics dashboard',
+            'CampaignReports.tsx - campaign performance reports',
+            'DeviceAnalytics.tsx - device utilization analytics',
+            'DeliveryRates.tsx - delivery success tracking',
+            'TrendAnalysis.tsx - historical trends',
+            'ReportExport.tsx - export functionality',
+        ],
+        closing='Include charts, graphs, and data visualization components.',
+    ),
     tools=[FileWriter, CommandExecutor, FileReader],
 )
 
 ui_designer_agent = Agent(
     name="UIDesignerAgent",
     description="UI design and styling specialist",
-    instructions="""You are the UI design and styling specialist.
-
-Your mission:
-1. Create professional CSS styling for all components
-2. Build responsive design that works on all screen sizes
-3. Create consistent color scheme and branding
-4. Build reusable UI components and design system
-5. Ensure accessibility and user experience best practices
-
-Design requirements:
-- Professional business application look
-- Consistent color scheme (blues/grays for business)
-- Responsive design for desktop, tablet, mobile
-- Clean, modern interface with good spacing
-- Status indicators and visual feedback
-- Loading states and error handling
-- Icons and visual elements
-
-Use FileWriter to create:
-- styles/globals.css - main stylesheet
-- components/UI/ - reusable UI components
-- styles/components/ - component-specific styles
-- design-system.css - design tokens and variables
-- responsive.css - responsive design rules
-
-Make it look professional like modern SaaS dashboards.""",
+    instructions=_agent_instructions(
+        'You are the UI design and styling specialist.',
+        mission=[
+            'Create professional CSS styling for all components',
+            'Build responsive design that works on all screen sizes',
+            'Create consistent color scheme and branding',
+            'Build reusable UI components and design system',
+            'Ensure accessibility and user experience best practices',
+        ],
+        section='Design requirements',
+        section_items=[
+            'Professional business application look',
+            'Consistent color scheme (blues/grays for business)',
+            'Responsive design for desktop, tablet, mobile',
+            'Clean, modern interface with good spacing',
+            'Status indicators and visual feedback',
+            'Loading states and error handling',
+            'Icons and visual elements',
+        ],
+        files=[
+            'styles/globals.css - main stylesheet',
+            'components/UI/ - reusable UI components',
+            'styles/components/ - component-specific styles',
+            'design-system.css - design tokens and variables',
+            'responsive.css - responsive design rules',
+        ],
+        closing='Make it look professional like modern SaaS dashboards.',
+    ),
     tools=[FileWriter, CommandExecutor, FileReader],
 )
 
 # Create Dashboard Builder Agency
-dashboard_agency = Agency(
-    dashboard_architect,
-    device_dashboard_agent,
-    campaign_builder_agent, 
-    live_monitor_agent,
-    analytics_agent,
-    ui_designer_agent,
-    shared_instructions="""
-    DASHBOARD BUILDER MISSION
+@lru_cache(maxsize=None)
+def get_dashboard_agency():
+    """Build the agency on first use; creating it syncs every assistant with the OpenAI API."""
+    get_openai_key()
+    # One agency chart list: passed positionally, the second agent would land in shared_instructions
+    return Agency([
+        dashboard_architect,
+        device_dashboard_agent,
+        campaign_builder_agent,
+        live_monitor_agent,
+        analytics_agent,
+        ui_designer_agent,
+    ],
+        shared_instructions="""
+        DASHBOARD BUILDER MISSION
     
-    Target: Build complete SMS Campaign Platform web dashboard
+        Target: Build complete SMS Campaign Platform web dashboard
     
-    Dashboard Requirements:
-    1. Device Management - View and control connected phones
-    2. Campaign Creation - Upload contacts, compose messages, schedule sends
-    3. Live Monitoring - Real-time campaign progress tracking
-    4. Analytics - Performance reports and insights
-    5. Professional UI - Clean, responsive, business-grade interface
+        Dashboard Requirements:
+        1. Device Management - View and control connected phones
+        2. Campaign Creation - Upload contacts, compose messages, schedule sends
+        3. Live Monitoring - Real-time campaign progress tracking
+        4. Analytics - Performance reports and insights
+        5. Professional UI - Clean, responsive, business-grade interface
     
-    Technical Stack:
-    - React with TypeScript
-    - WebSocket for real-time updates
-    - CSS for styling (no external frameworks initially)
-    - Responsive design for all devices
+        Technical Stack:
+        - React with TypeScript
+        - WebSocket for real-time updates
+        - CSS for styling (no external frameworks initially)
+        - Responsive design for all devices
     
-    CRITICAL REQUIREMENTS:
-    1. NO placeholder components - everything must be functional
-    2. Real API integration with existing backend
-    3. Professional business application appearance
-    4. Responsive design for desktop/tablet/mobile
-    5. Real-time updates via WebSocket
-    6. Proper error handling and loading states
+        CRITICAL REQUIREMENTS:
+        1. NO placeholder components - everything must be functional
+        2. Real API integration with existing backend
+        3. Professional business application appearance
+        4. Responsive design for desktop/tablet/mobile
+        5. Real-time updates via WebSocket
+        6. Proper error handling and loading states
     
-    File Structure:
-    frontend/
-    ├── src/
-    │   ├── App.tsx (main app with routing)
-    │   ├── components/
-    │   │   ├── Dashboard/
-    │   │   ├── Devices/
-    │   │   ├── Campaigns/
-    │   │   ├── Analytics/
-    │   │   └── UI/
-    │   ├── styles/
-    │   ├── utils/
-    │   └── services/
+        File Structure:
+        frontend/
+        ├── src/
+        │   ├── App.tsx (main app with routing)
+        │   ├── components/
+        │   │   ├── Dashboard/
+        │   │   ├── Devices/
+        │   │   ├── Campaigns/
+        │   │   ├── Analytics/
+        │   │   └── UI/
+        │   ├── styles/
+        │   ├── utils/
+        │   └── services/
     
-    Work together to build a complete, production-ready dashboard interface.
-    """
-)
+        Work together to build a complete, production-ready dashboard interface.
+        """
+    )
 
-def build_dashboard():
-    """Deploy dashboard builder agency to create complete web interface."""
-    
-    print("DEPLOYING DASHBOARD BUILDER AGENCY SWARM")
-    print("Building complete SMS Campaign Platform web dashboard...")
-    print("=" * 70)
-    
-    try:
-        dashboard_command = """
-        DASHBOARD BUILD DIRECTIVE: CREATE COMPLETE WEB INTERFACE
+
+def __getattr__(name):
+    # Importing the module (tools, prompts) no longer builds the agency up front
+    if name == "dashboard_agency":
+        return get_dashboard_agency()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+DASHBOARD_CONTEXT = """
+        BUILD COMPLETE FUNCTIONAL DASHBOARD:
+        - Device management interface
+        - Campaign creation wizard  
+        - Real-time monitoring dashboard
+        - Analytics and reporting
+        - Professional business UI
         
-        DashboardArchitect: Coordinate the complete dashboard build and create main App.tsx structure.
+        INTEGRATE WITH EXISTING BACKEND:
+        - Connect to /api/devices endpoints
+        - Connect to /api/campaigns endpoints
+        - Use WebSocket for real-time updates
+        - Proper error handling and loading states
         
-        IMMEDIATE BUILD TASKS:
+        START BUILDING NOW - CREATE PRODUCTION-READY WEB DASHBOARD.
+"""
+
+ARCHITECT_TASK = """
+        DASHBOARD BUILD DIRECTIVE: CREATE COMPLETE WEB INTERFACE
         
-        1. DashboardArchitect: 
+        DashboardArchitect:
            - Create updated App.tsx with full navigation and routing
            - Set up component architecture and main layout
            - Create shared utilities and API services
-           - Coordinate all other agents
-        
-        2. DeviceDashboardAgent:
+           - Report the file structure, routes and shared utilities the other agents must use
+"""
+
+# Independent component builds, started once the architect has laid out the app
+COMPONENT_TASKS = [
+    (device_dashboard_agent, """
+        DeviceDashboardAgent:
            - Build Device Management page showing connected phones
            - Create real-time device status displays
            - Build device connection and control interfaces
-        
-        3. CampaignBuilderAgent:
+"""),
+    (campaign_builder_agent, """
+        CampaignBuilderAgent:
            - Build campaign creation wizard
            - Create contact upload and message composition
            - Build scheduling and template management
-        
-        4. LiveMonitorAgent:
+"""),
+    (live_monitor_agent, """
+        LiveMonitorAgent:
            - Build real-time campaign monitoring dashboard
            - Create live progress tracking and device performance
            - Build campaign control interface
-        
-        5. AnalyticsAgent:
+"""),
+    (analytics_agent, """
+        AnalyticsAgent:
            - Build analytics dashboard with charts and reports
            - Create performance tracking and insights
            - Build export functionality
-        
-        6. UIDesignerAgent:
+"""),
+    (ui_designer_agent, """
+        UIDesignerAgent:
            - Create professional CSS styling for all components
            - Build responsive design and consistent UI
            - Create reusable component library
+"""),
+]
+
+# Live turns: the interactive path the dispatcher never pools
+INTERACTIVE_LATENCY_MS = 2_000
+
+# Wall-clock budget for the live component build before stragglers are reported as timed out
+BUILD_BUDGET_SECONDS = 20 * 60
+
+# Architect planning samples raced against each other; the first complete plan wins
+ARCHITECT_SAMPLE_TEMPERATURES = (0.3, 0.7, 1.0)
+PLAN_REQUEST = """
+        Reply with the complete dashboard plan only - do not write files yet.
+        Start every section with a markdown heading, in this order:
+        ## App.tsx Routing, ## File Structure, ## Shared Utilities, ## Device Management, ## Campaign Creation,
+        ## Contact Management, ## Message Templates, ## Live Monitor, ## Analytics, ## Styling
+"""
+# Both planning paths send the same prompt; joined once here
+ARCHITECT_PLAN_MESSAGES = [
+    {"role": "system", "content": dashboard_architect.instructions},
+    {"role": "user", "content": sys.intern(ARCHITECT_TASK + DASHBOARD_CONTEXT + PLAN_REQUEST)},
+]
+ARCHITECT_COMMAND = sys.intern(ARCHITECT_TASK + DASHBOARD_CONTEXT)
+PLAN_SECTION_PATTERNS = [
+    re.compile(pattern, re.I)
+    for pattern in (r'App\.tsx', r'device', r'campaign', r'monitor', r'analytics', r'contact', r'template')
+]
+
+def _plan_complete(plan):
+    """A plan is usable once it covers App.tsx and all six dashboard components."""
+    return bool(plan) and all(pattern.search(plan) for pattern in PLAN_SECTION_PATTERNS)
+
+# Plan sections each component agent needs; it starts as soon as they have streamed in
+COMPONENT_PLAN_SECTIONS = {
+    device_dashboard_agent.name: ("device management",),
+    campaign_builder_agent.name: ("campaign creation", "contact management", "message templates"),
+    live_monitor_agent.name: ("live monitor",),
+    analytics_agent.name: ("analytics",),
+    ui_designer_agent.name: ("styling",),
+}
+PLAN_HEADING_RE = re.compile(r'^#{1,3}\s*(.+?)\s*$', re.M)
+
+def _closed_sections(plan, finished):
+    """Lowercased headings whose section is fully written: a later heading has begun, or the plan ended."""
+    headings = [heading.lower() for heading in PLAN_HEADING_RE.findall(plan)]
+    return headings if finished else headings[:-1]
+
+def _sections_ready(agent, closed):
+    return all(any(section in heading for heading in closed) for section in COMPONENT_PLAN_SECTIONS[agent.name])
+
+async def _stream_architect_plan(client, on_plan):
+    """Stream one plan sample, calling on_plan(plan_so_far, finished) at every line break."""
+    stream = await client.chat.completions.create(
+        model=dashboard_architect.model,
+        temperature=ARCHITECT_SAMPLE_TEMPERATURES[0],
+        stream=True,
+        messages=ARCHITECT_PLAN_MESSAGES,
+    )
+    plan = ""
+    async for chunk in stream:
+        delta = chunk.choices[0].delta.content if chunk.choices else None
+        if delta:
+            plan += delta
+            if "\n" in delta:
+                on_plan(plan, False)
+    on_plan(plan, True)
+    return plan
+
+async def _sample_architect_plan(client, temperature):
+    response = await client.chat.completions.create(
+        model=dashboard_architect.model,
+        temperature=temperature,
+        messages=ARCHITECT_PLAN_MESSAGES,
+    )
+    return response.choices[0].message.content
+
+async def race_architect_plan():
+    """Sample the architect plan at several temperatures and keep the first complete one."""
+    client = openai.AsyncOpenAI(api_key=get_openai_key())
+    pending = {asyncio.create_task(_sample_architect_plan(client, t)) for t in ARCHITECT_SAMPLE_TEMPERATURES}
+    fallback = None
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception():
+                    continue
+                plan = task.result()
+                if _plan_complete(plan):
+                    return plan
+                fallback = fallback or plan
+    finally:
+        # Cancelling the losers aborts their HTTP requests
+        for task in pending:
+            task.cancel()
+        await client.close()
+    
+    if fallback is None:
+        raise RuntimeError("Every architect planning sample failed")
+    return fallback
+
+async def build_dashboard_async(pooled=False):
+    """Build the dashboard: the architect's plan, then the five component agents concurrently.
+    
+    pooled=True sends the turns through the Batch API (half price, tool-less, slow);
+    otherwise every turn runs live with its tools.
+    """
+    
+    write_lines(
+        "DEPLOYING DASHBOARD BUILDER AGENCY SWARM",
+        "Building complete SMS Campaign Platform web dashboard...",
+        "=" * 70,
+    )
+    
+    try:
+        print("Starting dashboard build...")
         
-        BUILD COMPLETE FUNCTIONAL DASHBOARD:
-        - Device management interface
-        - Campaign creation wizard  
-        - Real-time monitoring dashboard
-        - Analytics and reporting
-        - Professional business UI
-        
-        INTEGRATE WITH EXISTING BACKEND:
-        - Connect to /api/devices endpoints
-        - Connect to /api/campaigns endpoints
-        - Use WebSocket for real-time updates
-        - Proper error handling and loading states
+        dispatcher = FleetDispatcher(get_dashboard_agency())
+        latency_budget_ms = None if pooled else INTERACTIVE_LATENCY_MS
         
-        START BUILDING NOW - CREATE PRODUCTION-READY WEB DASHBOARD.
-        """
+        # The architect's plan is a dependency of every component
+        if pooled:
+            architecture = await dispatcher.submit(
+                dashboard_architect, ARCHITECT_COMMAND, latency_budget_ms
+            )
+            print("Architecture ready, building components in parallel...")
+            turns = [
+                (agent, f"{task}\n        ARCHITECT PLAN (follow it):\n{architecture}\n{DASHBOARD_CONTEXT}")
+                for agent, task in COMPONENT_TASKS
+            ]
+            results = await asyncio.gather(
+                *(dispatcher.submit(agent, message, latency_budget_ms) for agent, message in turns),
+                return_exceptions=True,
+            )
+        else:
+            # Staircase: each component starts once its plan sections have streamed in,
+            # with the plan written so far, while the architect keeps writing the rest
+            started = {}
+            
+            def launch_ready(plan, finished):
+                closed = _closed_sections(plan, finished)
+                for agent, task in COMPONENT_TASKS:
+                    if agent.name not in started and (finished or _sections_ready(agent, closed)):
+                        print(f"Plan sections ready, starting {agent.name}...")
+                        message = f"{task}\n        ARCHITECT PLAN (follow it):\n{plan}\n{DASHBOARD_CONTEXT}"
+                        started[agent.name] = (message, asyncio.ensure_future(
+                            dispatcher.submit(agent, message, latency_budget_ms)
+                        ))
+            
+            client = openai.AsyncOpenAI(api_key=get_openai_key())
+            try:
+                architecture = await _stream_architect_plan(client, launch_ready)
+            except Exception as e:
+                print(f"Plan stream failed ({e}), racing plan samples instead...")
+                architecture = await race_architect_plan()
+                launch_ready(architecture, True)
+            finally:
+                await client.close()
+            print("Architecture ready, architect implementing it...")
+            
+            # With the plan fixed, the architect writes App.tsx alongside the component agents
+            architect_message = f"{ARCHITECT_TASK}\n        IMPLEMENT THIS PLAN:\n{architecture}\n{DASHBOARD_CONTEXT}"
+            architect_turn = dispatcher.submit(dashboard_architect, architect_message, latency_budget_ms)
+            turns = [(dashboard_architect, architect_message)] + [
+                (agent, started[agent.name][0]) for agent, _ in COMPONENT_TASKS
+            ]
+            
+            def report(i, result):
+                outcome = "failed" if isinstance(result, Exception) else "finished"
+                print(f"{turns[i][0].name} {outcome}")
+            
+            # Bounded: agents still running at the budget are reported as timed out, and the
+            # build returns without waiting for their threads
+            try:
+                results = await tick_loop(
+                    [architect_turn] + [started[agent.name][1] for agent, _ in COMPONENT_TASKS],
+                    on_result=report,
+                    max_ticks=BUILD_BUDGET_SECONDS * 1000 // TICK_MS,
+                )
+            finally:
+                dispatcher.close()
         
-        print("Starting dashboard build...")
-        response = dashboard_agency.get_completion(dashboard_command)
+        response = f"### ARCHITECT PLAN\n{architecture}\n\n" + format_turn_results(turns, results)
         
-        print("\n" + "=" * 70)
-        print("DASHBOARD BUILD RESPONSE:")
-        print("=" * 70)
-        print(response)
+        write_lines(
+            "\n" + "=" * 70,
+            "DASHBOARD BUILD RESPONSE:",
+            "=" * 70,
+            response,
+        )
         
-        return dashboard_agency, response
+        return get_dashboard_agency(), response
         
     except Exception as e:
         print(f"Dashboard build error: {str(e)}")
@@ -387,36 +568,130 @@ def build_dashboard():
         traceback.print_exc()
         return None, str(e)
 
+STATUS_REQUEST = "Report current dashboard build status and what components have been created"
+FRONTEND_SRC = os.path.join("frontend", "src")
+STATUS_TIMEOUT_SECONDS = 60
+
+def _frontend_snapshot():
+    """(path, mtime, size) of every file under frontend/src; changes whenever an agent writes a component."""
+    snapshot = []
+    for root, _, files in os.walk(FRONTEND_SRC):
+        for name in files:
+            path = os.path.join(root, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            snapshot.append((os.path.relpath(path, FRONTEND_SRC), stat.st_mtime_ns, stat.st_size))
+    return tuple(sorted(snapshot))
+
+def _status_report(snapshot):
+    """Build status from the architect's model over the file listing: a plain completion, no tools."""
+    if not snapshot:
+        return f"No components created yet ({FRONTEND_SRC} is empty)"
+    listing = "\n".join(f"- {path} ({size} bytes)" for path, _, size in snapshot)
+    client = openai.OpenAI(api_key=get_openai_key(), timeout=STATUS_TIMEOUT_SECONDS, max_retries=0)
+    response = client.chat.completions.create(
+        model=dashboard_architect.model,
+        messages=[
+            {"role": "system", "content": dashboard_architect.instructions},
+            {"role": "user", "content": f"{STATUS_REQUEST}.\n\nFiles under {FRONTEND_SRC}:\n{listing}"},
+        ],
+    )
+    return response.choices[0].message.content
+
+class StatusPrefetch:
+    """Status report prepared between REPL commands, so 'status' answers at once.
+    
+    The report is read-only: a tool-free completion over the frontend/src
+    listing, never an agent turn that could write files or run commands. It
+    is keyed on that listing and only reused while the files are unchanged.
+    """
+    
+    def __init__(self):
+        # One worker: a newer prefetch queues behind at most one in flight
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="status-prefetch")
+        self._snapshot = None
+        self._future = None
+    
+    def start(self):
+        """Prefetch the status unless one for the current files is already there; a stale one is cancelled."""
+        snapshot = _frontend_snapshot()
+        if self._future is not None and snapshot == self._snapshot:
+            return
+        self.cancel()
+        self._snapshot = snapshot
+        self._future = self._executor.submit(_status_report, snapshot)
+    
+    def cancel(self):
+        """Drop the current prefetch; if its request is already running it ends within STATUS_TIMEOUT_SECONDS."""
+        if self._future is not None:
+            self._future.cancel()
+        self._future = None
+    
+    def take(self):
+        """The status for the files as they are now; a prefetch made for other files is cancelled and redone."""
+        self.start()
+        try:
+            return self._future.result()
+        except Exception:
+            # A failed report is not kept; the next 'status' asks again
+            self._future = None
+            raise
+    
+    def close(self):
+        self.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+def build_dashboard(pooled=False):
+    """Deploy dashboard builder agency to create complete web interface."""
+    return asyncio.run(build_dashboard_async(pooled))
+
 if __name__ == "__main__":
-    print("DASHBOARD BUILDER AGENCY SWARM")
-    print("Specialized agents: Dashboard Architect, Device Dashboard, Campaign Builder, Live Monitor, Analytics, UI Designer")
-    print()
+    write_lines(
+        "DASHBOARD BUILDER AGENCY SWARM",
+        "Specialized agents: Dashboard Architect, Device Dashboard, Campaign Builder, Live Monitor, Analytics, UI Designer",
+        "",
+    )
     
     # Build complete dashboard
-    dashboard_instance, build_report = build_dashboard()
+    # --batch pools the build turns into one Batch API job instead of live calls
+    dashboard_instance, build_report = build_dashboard(pooled="--batch" in sys.argv)
     
     if dashboard_instance:
-        print("\n✅ Dashboard build completed!")
-        print("The complete SMS Campaign Platform web interface has been built.")
+        write_lines(
+            "\n✅ Dashboard build completed!",
+            "The complete SMS Campaign Platform web interface has been built.",
+        )
         
         # Interactive mode for additional dashboard features
         try:
-            print("\nDashboard agency ready for additional features...")
-            print("Type 'status' to check build status, 'exit' to stop")
+            write_lines(
+                "\nDashboard agency ready for additional features...",
+                "Type 'status' to check build status, 'exit' to stop",
+            )
+            
+            status = StatusPrefetch()
+            status.start()
             
-            while True:
-                user_input = input("\nDashboard Command: ").strip()
-                
-                if user_input.lower() == 'exit':
-                    break
-                elif user_input.lower() == 'status':
-                    status_response = dashboard_instance.get_completion("Report current dashboard build status and what components have been created")
-                    print(f"\nBuild Status:\n{status_response}")
-                elif user_input:
+            def handle_command(user_input):
+                if user_input.lower() == 'status':
+                    try:
+                        print(f"\nBuild Status:\n{status.take()}")
+                    except Exception as e:
+                        print(f"\nBuild status unavailable: {str(e)}")
+                else:
                     print("\nProcessing...")
                     response = dashboard_instance.get_completion(user_input)
                     print(f"\nResponse:\n{response}")
-                    
+                    # Only a command can change the files; prefetch the next status while the user reads and types
+                    status.start()
+            
+            try:
+                asyncio.run(command_loop("\nDashboard Command: ", handle_command))
+            finally:
+                status.close()
+            
         except KeyboardInterrupt:
             print("\n\nDashboard agency stopped")
             
@@ -7,11 +7,12 @@ Following exact Agency Swarm syntax from documentation research.
 Zero deviations, zero assumptions, exact robot implementation.
 """
 
-import os
+import asyncio
+from functools import lru_cache
 from agency_swarm import Agency, Agent
-
-# Set OpenAI API key exactly as documented
-os.environ["OPENAI_API_KEY"] = "your_openai_api_key_here"
+from agent_turns import run_agent_turn, gather_agent_turns, format_turn_results
+from sms_config import get_openai_key
+from completion_stream import write_lines
 
 # Create agents exactly as documented
 backend_agent = Agent(
@@ -51,51 +52,79 @@ testing_agent = Agent(
 )
 
 # Create agency exactly as documentation requires
-agency = Agency(
-    backend_agent,  # Entry point agent as positional argument
-    communication_flows=[
-        (backend_agent, frontend_agent),
-        (backend_agent, device_agent), 
-        (backend_agent, mobile_agent),
-        (qa_agent, backend_agent),
-        (qa_agent, frontend_agent),
-        (qa_agent, device_agent),
-        (qa_agent, mobile_agent),
-        (testing_agent, backend_agent),
-        (testing_agent, frontend_agent)
-    ]
-)
+@lru_cache(maxsize=None)
+def get_agency():
+    """Build the agency on first use; creating it syncs every assistant with the OpenAI API."""
+    get_openai_key()
+    return Agency(
+        backend_agent,  # Entry point agent as positional argument
+        communication_flows=[
+            (backend_agent, frontend_agent),
+            (backend_agent, device_agent), 
+            (backend_agent, mobile_agent),
+            (qa_agent, backend_agent),
+            (qa_agent, frontend_agent),
+            (qa_agent, device_agent),
+            (qa_agent, mobile_agent),
+            (testing_agent, backend_agent),
+            (testing_agent, frontend_agent)
+        ]
+    )
 
-def main():
-    """Deploy agency exactly as documented"""
-    print("SMS PLATFORM AGENCY SWARM")
-    print("Exact documentation implementation")
-    print("=" * 50)
-    
-    try:
-        # Start agency with task exactly as documented
-        kickoff = """
+
+def __getattr__(name):
+    # Importing the module no longer builds the agency up front
+    if name == "agency":
+        return get_agency()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+KICKOFF_CONTEXT = """
         SMS PLATFORM DEVELOPMENT
 
         Build the SMS Drip Campaign Platform now.
 
-        BackendDeveloper: Start Node.js/Express backend with PostgreSQL database
-        FrontendDeveloper: Create React dashboard with responsive design
-        DeviceConnectionAgent: Implement USB device connection via WebUSB API  
-        MobileAppAgent: Build Android/iOS apps with WebSocket connectivity
-        QualityAssuranceAgent: Ensure zero placeholder code in all implementations
-        TestingAgent: Set up comprehensive testing framework
-
         ZERO PLACEHOLDER CODE ALLOWED. All implementations must be production-ready.
         """
-        
+
+# Work that only needs the backend's API contract, dispatched concurrently
+FOLLOW_UP_TASKS = [
+    (frontend_agent, "FrontendDeveloper: Create React dashboard with responsive design"),
+    (device_agent, "DeviceConnectionAgent: Implement USB device connection via WebUSB API"),
+    (mobile_agent, "MobileAppAgent: Build Android/iOS apps with WebSocket connectivity"),
+    (qa_agent, "QualityAssuranceAgent: Ensure zero placeholder code in all implementations"),
+    (testing_agent, "TestingAgent: Set up comprehensive testing framework"),
+]
+
+async def main_async():
+    """Deploy agency: backend first, then the remaining agents concurrently"""
+    write_lines(
+        "SMS PLATFORM AGENCY SWARM",
+        "Exact documentation implementation",
+        "=" * 50,
+    )
+    
+    try:
         print("Starting agency...")
-        response = agency.get_completion(kickoff)
         
-        print("\n" + "=" * 50)
-        print("AGENCY RESPONSE:")
-        print("=" * 50)
-        print(response)
+        # Backend defines the API every other agent builds against
+        backend = await asyncio.to_thread(
+            run_agent_turn, get_agency(), backend_agent,
+            KICKOFF_CONTEXT + "\nBackendDeveloper: Start Node.js/Express backend with PostgreSQL database"
+        )
+        
+        turns = [
+            (agent, f"{KICKOFF_CONTEXT}\n{task}\n\nBACKEND REPORT:\n{backend}")
+            for agent, task in FOLLOW_UP_TASKS
+        ]
+        results = await gather_agent_turns(get_agency(), turns)
+        response = f"### {backend_agent.name}\n{backend}\n\n" + format_turn_results(turns, results)
+        
+        write_lines(
+            "\n" + "=" * 50,
+            "AGENCY RESPONSE:",
+            "=" * 50,
+            response,
+        )
         
         return True
         
@@ -105,6 +134,10 @@ def main():
         traceback.print_exc()
         return False
 
+def main():
+    """Deploy agency exactly as documented"""
+    return asyncio.run(main_async())
+
 if __name__ == "__main__":
     success = main()
     if success:
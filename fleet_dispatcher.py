@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Fleet Dispatcher
+================
+
+Route agent turns by latency budget. Interactive turns (a latency budget
+in ms) run live straight away; turns without a budget are pooled for a
+short window and submitted together as one OpenAI Batch API job, which
+is billed at half price.
+
+Pooled turns are single chat completions built from the agent's
+instructions - they cannot call the agent's tools - so only route
+planning/drafting phases through the pool.
+"""
+
+import asyncio
+import itertools
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from agency_swarm import get_openai_client
+from agent_turns import run_agent_turn
+from openai_batch import chat_request, run_batch, BATCH_POLL_SECONDS
+
+
+class FleetDispatcher:
+    """Pool non-interactive agent turns into Batch API jobs; run interactive ones live."""
+
+    def __init__(self, agency, batch_window_ms: int = 30_000, batch_min_size: int = 4,
+                 poll_seconds: int = BATCH_POLL_SECONDS, client=None):
+        self.agency = agency
+        self.batch_window_ms = batch_window_ms
+        self.batch_min_size = batch_min_size
+        self.poll_seconds = poll_seconds
+        self.client = client
+        self._ids = itertools.count()
+        self._pending = []
+        self._timer = None
+        self._batches = set()
+        # Live turns get their own threads: asyncio.run() joins the default executor on
+        # exit, which would hold the caller until every abandoned turn had finished
+        self._live_pool = ThreadPoolExecutor(thread_name_prefix="fleet-live")
+
+    async def submit(self, agent, message: str, latency_budget_ms: int = None) -> str:
+        """Return the agent's reply; pooled when latency_budget_ms is None."""
+        if latency_budget_ms is not None:
+            context = contextvars.copy_context()
+            return await asyncio.get_running_loop().run_in_executor(
+                self._live_pool, context.run, run_agent_turn, self.agency, agent, message
+            )
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((f"turn-{next(self._ids)}", agent, message, future))
+
+        if len(self._pending) >= self.batch_min_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.batch_window_ms / 1000, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending = self._pending, []
+        if pending:
+            # Keep a reference so the task is not garbage collected mid-batch
+            task = asyncio.get_running_loop().create_task(self._run_pool(pending))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+
+    async def _run_pool(self, pending):
+        requests = [
+            chat_request(custom_id, agent.model, agent.instructions, message)
+            for custom_id, agent, message, _ in pending
+        ]
+        try:
+            client = self.client or get_openai_client()
+            replies = await asyncio.to_thread(run_batch, client, requests, self.poll_seconds)
+        except Exception as e:
+            for *_, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for custom_id, agent, _, future in pending:
+            if not future.done():
+                future.set_result(replies.get(custom_id, f"ERROR no batch result for {agent.name}"))
+
+    async def drain(self):
+        """Flush whatever is still pooled and wait for every batch in flight."""
+        self._flush()
+        if self._batches:
+            await asyncio.gather(*self._batches, return_exceptions=True)
+
+    def close(self):
+        """Drop live turns still queued and stop waiting for running ones.
+
+        A running turn is not interrupted: its thread ends with the turn, but
+        neither this loop nor asyncio.run() waits for it.
+        """
+        self._live_pool.shutdown(wait=False, cancel_futures=True)
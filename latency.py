@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Agent Hop Latency Metrics
+=========================
+
+Time every hop between agents (user -> agent for top-level turns, agent
+-> agent for SendMessage) so optimizations can be measured instead of
+guessed. Each hop records its total latency, its time to first token when
+the reply is streamed, and the tokens its runs used.
+
+METRICS can be scraped in Prometheus text format from serve_metrics(), and
+report() gives p50/p95/p99 per hop for the console.
+"""
+
+import os
+import math
+import time
+import threading
+import contextvars
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9300"))
+# Local scrapers only unless the endpoint is deliberately exposed (METRICS_HOST=0.0.0.0)
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+PERCENTILES = (50, 95, 99)
+
+_CURRENT_HOP = contextvars.ContextVar("current_hop", default=None)
+
+
+def percentile(values, p):
+    """Nearest-rank percentile of values, which must be sorted and non-empty."""
+    return values[min(len(values) - 1, max(0, math.ceil(p / 100 * len(values)) - 1))]
+
+
+class LatencyMetrics:
+    """Latency, time to first token and token samples per (src, dst) hop."""
+
+    def __init__(self):
+        self._hops = {}
+        self._lock = threading.Lock()
+
+    def record(self, src: str, dst: str, seconds: float, ttft: float = None, tokens: int = 0):
+        with self._lock:
+            hop = self._hops.setdefault((src, dst), {"latency": [], "ttft": [], "tokens": 0})
+            hop["latency"].append(seconds)
+            if ttft is not None:
+                hop["ttft"].append(ttft)
+            hop["tokens"] += tokens
+
+    def _snapshot(self):
+        with self._lock:
+            return {key: {"latency": sorted(hop["latency"]), "ttft": sorted(hop["ttft"]), "tokens": hop["tokens"]}
+                    for key, hop in self._hops.items()}
+
+    def report(self) -> str:
+        """One line per hop with call count, latency percentiles, TTFT median and tokens."""
+        hops = self._snapshot()
+        if not hops:
+            return "No agent hops recorded"
+        lines = []
+        for (src, dst), hop in sorted(hops.items()):
+            latency = hop["latency"]
+            line = f"{src} -> {dst}: {len(latency)} calls, " + ", ".join(
+                f"p{p} {percentile(latency, p):.2f}s" for p in PERCENTILES)
+            if hop["ttft"]:
+                line += f", ttft p50 {percentile(hop['ttft'], 50):.2f}s"
+            lines.append(line + f", {hop['tokens']} tokens")
+        return "\n".join(lines)
+
+    def prometheus_text(self) -> str:
+        """All hops in the Prometheus text exposition format."""
+        lines = [
+            "# TYPE agent_hop_latency_seconds summary",
+            "# TYPE agent_hop_ttft_seconds summary",
+            "# TYPE agent_hop_tokens_total counter",
+        ]
+        for (src, dst), hop in sorted(self._snapshot().items()):
+            labels = f'src="{src}",dst="{dst}"'
+            for name in ("latency", "ttft"):
+                values = hop[name]
+                if not values:
+                    continue
+                for p in PERCENTILES:
+                    lines.append(f'agent_hop_{name}_seconds{{{labels},quantile="{p / 100}"}} {percentile(values, p):.6f}')
+                lines.append(f"agent_hop_{name}_seconds_sum{{{labels}}} {sum(values):.6f}")
+                lines.append(f"agent_hop_{name}_seconds_count{{{labels}}} {len(values)}")
+            lines.append(f"agent_hop_tokens_total{{{labels}}} {hop['tokens']}")
+        return "\n".join(lines) + "\n"
+
+
+METRICS = LatencyMetrics()
+
+
+@contextmanager
+def hop(src: str, dst: str, metrics: LatencyMetrics = METRICS):
+    """Time one hop and record it, also when it fails.
+
+    Runs and streams inside the hop report to it through add_tokens() and
+    first_token(); a hop nested inside another collects its own.
+    """
+    sample = {"start": time.perf_counter(), "ttft": None, "tokens": 0}
+    token = _CURRENT_HOP.set(sample)
+    try:
+        yield sample
+    finally:
+        _CURRENT_HOP.reset(token)
+        metrics.record(src, dst, time.perf_counter() - sample["start"], sample["ttft"], sample["tokens"])
+
+
+def first_token() -> None:
+    """Mark the current hop's first streamed token; later calls are ignored."""
+    sample = _CURRENT_HOP.get()
+    if sample is not None and sample["ttft"] is None:
+        sample["ttft"] = time.perf_counter() - sample["start"]
+
+
+def add_tokens(tokens: int) -> None:
+    """Add a finished run's token usage to the current hop."""
+    sample = _CURRENT_HOP.get()
+    if sample is not None and tokens:
+        sample["tokens"] += tokens
+
+
+def run_tokens(run) -> int:
+    """Total tokens an OpenAI run used, 0 while it has no usage yet."""
+    usage = getattr(run, "usage", None)
+    return getattr(usage, "total_tokens", 0) or 0
+
+
+def serve_metrics(port: int = METRICS_PORT, metrics: LatencyMetrics = METRICS, host: str = METRICS_HOST):
+    """Serve metrics.prometheus_text() on a daemon thread; None when the port is taken."""
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = metrics.prometheus_text().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # scrapes would interleave with agent output
+
+    try:
+        server = ThreadingHTTPServer((host, port), MetricsHandler)
+    except OSError as e:
+        print(f"⚠️ Metrics endpoint not started on {host}:{port}: {str(e)}")
+        return None
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
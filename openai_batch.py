@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+OpenAI Batch Jobs
+=================
+
+Submit many independent chat completions as one Batch API job (half the
+price of live calls, outside the RPM limits) and map the answers back to
+their custom_id once the job finishes.
+"""
+
+import json
+import time
+
+BATCH_POLL_SECONDS = 30
+BATCH_FINAL_STATUSES = frozenset({"completed", "failed", "expired", "cancelled"})
+
+
+def chat_request(custom_id: str, model: str, system: str, user: str) -> dict:
+    """One /v1/chat/completions line of a batch input file."""
+    return {
+        "custom_id": custom_id,
+        "method": "POST",
+        "url": "/v1/chat/completions",
+        "body": {
+            "model": model,
+            "messages": [
+                {"role": "system", "content": system},
+                {"role": "user", "content": user},
+            ],
+        },
+    }
+
+
+def submit_batch(client, requests):
+    """Upload the requests as JSONL and start the batch job."""
+    data = "\n".join(json.dumps(request) for request in requests).encode("utf-8")
+    batch_file = client.files.create(file=("batch.jsonl", data), purpose="batch")
+    return client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h",
+    )
+
+
+def wait_for_batch(client, batch, poll_seconds: int = BATCH_POLL_SECONDS):
+    """Poll until the batch reaches a final status."""
+    while batch.status not in BATCH_FINAL_STATUSES:
+        time.sleep(poll_seconds)
+        batch = client.batches.retrieve(batch.id)
+        print(f"Batch {batch.id}: {batch.status}")
+    return batch
+
+
+def collect_batch(client, batch) -> dict:
+    """Map every custom_id to its reply text (or an ERROR line)."""
+    replies = {}
+    for file_id in (batch.output_file_id, batch.error_file_id):
+        if not file_id:
+            continue
+        for line in client.files.content(file_id).text.splitlines():
+            if not line.strip():
+                continue
+            result = json.loads(line)
+            response = result.get("response") or {}
+            if result.get("error") or response.get("status_code") != 200:
+                replies[result["custom_id"]] = f"ERROR {result.get('error') or response.get('body')}"
+            else:
+                replies[result["custom_id"]] = response["body"]["choices"][0]["message"]["content"]
+    return replies
+
+
+def run_batch(client, requests, poll_seconds: int = BATCH_POLL_SECONDS) -> dict:
+    """Submit, wait for and collect a batch job in one call."""
+    batch = submit_batch(client, requests)
+    print(f"Submitted batch {batch.id} with {len(requests)} requests")
+    batch = wait_for_batch(client, batch, poll_seconds)
+    if batch.status != "completed":
+        print(f"ERROR Batch {batch.id} ended with status {batch.status}")
+    return collect_batch(client, batch)
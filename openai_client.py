@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Pooled OpenAI Client
+====================
+
+Install a keep-alive OpenAI client for agency-swarm and open its HTTPS
+connection in the background, so the first agent turn does not pay for
+DNS, TCP and TLS setup and later turns reuse the same sockets. The pool
+is sized for the swarms' concurrent fan-out, and requests share HTTP/2
+connections when the optional h2 package is installed.
+
+Agents capture the client when they are constructed, so it has to be
+installed before the first Agent(...) is created.
+"""
+
+import os
+import atexit
+import threading
+import importlib.util
+from functools import lru_cache
+import httpx
+import openai
+from agency_swarm import set_openai_client
+
+OPENAI_WARMUP_URL = "https://api.openai.com/v1/models"
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+_CLIENTS = []
+
+
+def _warm(http_client: httpx.Client) -> None:
+    try:
+        http_client.head(OPENAI_WARMUP_URL, timeout=2.0)
+    except Exception:
+        # Warm-up is best effort; the real request will connect on its own
+        pass
+
+
+@lru_cache(maxsize=None)
+def warm_openai_client(api_key: str = None) -> openai.OpenAI:
+    """Install a pooled OpenAI client for all agents and pre-open its connection; later calls reuse it."""
+    http_client = httpx.Client(
+        http2=HTTP2_AVAILABLE,
+        limits=httpx.Limits(max_keepalive_connections=64, max_connections=128, keepalive_expiry=60),
+        timeout=httpx.Timeout(60.0, read=40, connect=5.0),
+    )
+    atexit.register(http_client.close)
+    # Same settings agency-swarm uses for its default client
+    client = openai.OpenAI(
+        api_key=api_key or os.getenv("OPENAI_API_KEY"),
+        max_retries=10,
+        default_headers={"OpenAI-Beta": "assistants=v2"},
+        http_client=http_client,
+    )
+    set_openai_client(client)
+    _CLIENTS.append(client)
+
+    threading.Thread(target=_warm, args=(http_client,), daemon=True).start()
+    return client
+
+
+def close_openai_clients() -> None:
+    """Close the pooled clients so agent work still running fails at its next request.
+
+    Retries are switched off first: the client retries any failed request,
+    which would keep those turns (and interpreter exit) waiting on backoff.
+    """
+    for client in _CLIENTS:
+        client.max_retries = 0
+        client.close()
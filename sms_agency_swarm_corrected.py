@@ -10,24 +10,69 @@ Based on Task Master research results and correct Agency Swarm syntax.
 """
 
 import os
-import subprocess
-from typing import List, Dict, Any, ClassVar
-from agency_swarm import Agency, Agent, BaseTool
+import re
+import sys
+import json
+import asyncio
+import hashlib
+from pathlib import Path
+from functools import lru_cache
+from agency_swarm import Agency, Agent, get_openai_client
 from pydantic import Field
-from dotenv import load_dotenv
+from sms_tools import run_command, new_command_log, logged_output, dedup_call, CachedSchemaTool, CodeValidator, RepoValidator, ApiRequest, CachedSendMessage
+from sms_config import get_openai_key
+from task_master_server import run_task_master
+from completion_stream import write_lines, stream_completion, command_loop
+from completion_cache import RepeatQueryCache
+from agent_turns import gather_agent_turns, format_turn_results
 
-# Load environment variables
-load_dotenv()
+TASK_MASTER_DIR = "C:\\Users\\Stuart\\Desktop\\Projects\\sms"
+TASKS_JSON = os.path.join(TASK_MASTER_DIR, ".taskmaster", "tasks", "tasks.json")
 
-# Set OpenAI API key for Agency Swarm
-OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
-os.environ['OPENAI_API_KEY'] = OPENAI_API_KEY
+# Task Master commands whose output depends only on tasks.json
+READ_ONLY_TASK_COMMANDS = frozenset({"list", "next", "show"})
+
+
+def _tasks_version():
+    """(mtime_ns, size) of tasks.json, or None when it cannot be stat'ed."""
+    try:
+        stat = os.stat(TASKS_JSON)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _run_task_master_cli(command):
+    return run_command(command, cwd=TASK_MASTER_DIR, prefix="task-master")
+
+
+def _run_task_master(command):
+    # Status updates and reads go to one long-lived Task Master process instead of a new node per call
+    return run_task_master(command, TASK_MASTER_DIR, _run_task_master_cli)
+
+
+@lru_cache(maxsize=64)
+def _read_only_task_master(command, version):
+    result = _run_task_master(command)
+    if result.returncode != 0:
+        # Raising keeps failures out of the cache
+        raise RuntimeError(result.stderr or f"task-master {command} exited with {result.returncode}")
+    return result
+
+
+def task_master(command: str):
+    """Run a Task Master command; read-only ones are answered from memory until tasks.json changes."""
+    command = " ".join(command.split())
+    version = _tasks_version()
+    if version is None or command.split(" ", 1)[0] not in READ_ONLY_TASK_COMMANDS:
+        return _run_task_master(command)
+    return _read_only_task_master(command, version)
 
 # =============================================================================
 # TASK MASTER INTEGRATION TOOLS
 # =============================================================================
 
-class TaskMasterIntegration(BaseTool):
+class TaskMasterIntegration(CachedSchemaTool):
     """Tool for integrating with Task Master CLI"""
     
     command: str = Field(..., description="Task Master command to execute")
@@ -35,59 +80,14 @@ class TaskMasterIntegration(BaseTool):
     def run(self) -> str:
         """Execute Task Master command"""
         try:
-            result = subprocess.run(
-                f"task-master {self.command}", 
-                shell=True, 
-                capture_output=True, 
-                text=True,
-                cwd="C:\\Users\\Stuart\\Desktop\\Projects\\sms"
-            )
+            # Agents re-fetch the task list independently within a turn; concurrent calls share one run
+            result = dedup_call(self, lambda: task_master(self.command))
             return f"✅ Command: task-master {self.command}\nSTDOUT:\n{result.stdout}\n\nSTDERR:\n{result.stderr}"
         except Exception as e:
             return f"❌ Error executing task-master {self.command}: {str(e)}"
 
 
-class CodeValidator(BaseTool):
-    """CRITICAL tool to validate code contains no placeholders"""
-    
-    file_path: str = Field(..., description="Path to file to validate")
-    
-    FORBIDDEN_PATTERNS: ClassVar[List[str]] = [
-        "TODO", "FIXME", "PLACEHOLDER", "CHANGEME", "REPLACE_ME",
-        "user@example.com", "test@test.com", "example.com",
-        "123-456-7890", "555-1234", "(555)", "123-4567",
-        "Jane Doe", "John Doe", "Test User", "Sample Name",
-        "Lorem ipsum", "lorem", "ipsum", "console.log",
-        "DEMO_DATA", "SAMPLE_DATA", "TEST_DATA"
-    ]
-    
-    def run(self) -> str:
-        """Validate file contains no placeholder code"""
-        try:
-            if not os.path.exists(self.file_path):
-                return f"❌ VALIDATION FAILED: File {self.file_path} does not exist"
-            
-            with open(self.file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-            
-            violations = []
-            for pattern in self.FORBIDDEN_PATTERNS:
-                if pattern.lower() in content.lower():
-                    lines = content.split('\n')
-                    for i, line in enumerate(lines, 1):
-                        if pattern.lower() in line.lower():
-                            violations.append(f"Line {i}: {line.strip()[:100]}")
-            
-            if violations:
-                return f"❌ VALIDATION FAILED: Found {len(violations)} violations in {self.file_path}:\n" + '\n'.join(violations[:5])
-            
-            return f"✅ VALIDATION PASSED: {self.file_path} is production-ready"
-            
-        except Exception as e:
-            return f"❌ VALIDATION ERROR: {str(e)}"
-
-
-class SystemCommand(BaseTool):
+class SystemCommand(CachedSchemaTool):
     """Tool to execute system commands for development"""
     
     command: str = Field(..., description="System command to execute")
@@ -96,14 +96,8 @@ class SystemCommand(BaseTool):
     def run(self) -> str:
         """Execute system command"""
         try:
-            result = subprocess.run(
-                self.command, 
-                shell=True, 
-                capture_output=True, 
-                text=True,
-                cwd="C:\\Users\\Stuart\\Desktop\\Projects\\sms"
-            )
-            return f"✅ {self.description}\nCommand: {self.command}\nSTDOUT:\n{result.stdout}\n\nSTDERR:\n{result.stderr}"
+            result = run_command(self.command, cwd=TASK_MASTER_DIR, log_path=new_command_log())
+            return f"✅ {self.description}\nCommand: {self.command}\nOutput (exit {result.returncode}):\n{logged_output(result)}"
         except Exception as e:
             return f"❌ Error executing {self.command}: {str(e)}"
 
@@ -126,10 +120,8 @@ YOUR RESPONSIBILITIES:
 5. Report status and handle blockers immediately
 
 CRITICAL RULES:
-🚫 NEVER approve placeholder code, TODO comments, or demo data
-✅ ALL work must be production-ready and functionally complete
-🔍 Validate all deliverables before task completion
-⚡ Coordinate parallel execution for maximum efficiency
+- Validate all deliverables before task completion
+- Coordinate parallel execution for maximum efficiency
 
 TASK ASSIGNMENTS:
 - Backend Agent: Tasks 1,2,7,10,11,12,13 (backend, database, APIs, scheduling)
@@ -138,10 +130,10 @@ TASK ASSIGNMENTS:
 - Device Agent: Tasks 3,8 (USB integration, load balancing)
 - QA Agent: Validates ALL work (zero placeholder tolerance)
 - Testing Agent: Task 15 (performance, security, load testing)
-
-Start by getting current task status and assigning work to agents based on dependencies.
 """,
-    tools=[TaskMasterIntegration, CodeValidator]
+    tools=[TaskMasterIntegration, CodeValidator],
+    max_prompt_tokens=16000,
+    max_completion_tokens=8000
 )
 
 # 2. BACKEND ARCHITECTURE AGENT - Server-side specialist
@@ -152,13 +144,13 @@ backend_agent = Agent(
 You are the BACKEND ARCHITECTURE AGENT building the server-side foundation.
 
 YOUR TASKS:
-🎯 Task 1: Project Architecture (7 subtasks) - Backend, database, Docker, CI/CD
-🎯 Task 2: Authentication System (JWT, security, logging)
-🎯 Task 7: Scheduling Engine (6 subtasks) - Campaign timing, throttling
-🎯 Task 10: SMS Sending Service (7 subtasks) - Device communication, message queuing  
-🎯 Task 11: Analytics System (6 subtasks) - Real-time metrics, reporting
-🎯 Task 12: Compliance System (5 subtasks) - Opt-out, DNC lists
-🎯 Task 13: API Development (6 subtasks) - External integrations, webhooks
+- Task 1: Project Architecture (7 subtasks) - Backend, database, Docker, CI/CD
+- Task 2: Authentication System (JWT, security, logging)
+- Task 7: Scheduling Engine (6 subtasks) - Campaign timing, throttling
+- Task 10: SMS Sending Service (7 subtasks) - Device communication, message queuing  
+- Task 11: Analytics System (6 subtasks) - Real-time metrics, reporting
+- Task 12: Compliance System (5 subtasks) - Opt-out, DNC lists
+- Task 13: API Development (6 subtasks) - External integrations, webhooks
 
 TECHNOLOGY STACK:
 - Node.js/Express with TypeScript
@@ -169,12 +161,10 @@ TECHNOLOGY STACK:
 - WebSocket for real-time communication
 
 ZERO PLACEHOLDER RULE:
-❌ NO TODO comments, mock responses, or demo data
-❌ NO hardcoded "user@example.com" or "123-456-7890"
-✅ ALL database operations use real schemas with relationships
-✅ ALL API endpoints process actual data with proper validation  
-✅ ALL authentication uses functional JWT implementation
-✅ ALL error handling covers production scenarios
+- ALL database operations use real schemas with relationships
+- ALL API endpoints process actual data with proper validation  
+- ALL authentication uses functional JWT implementation
+- ALL error handling covers production scenarios
 
 DELIVERABLES REQUIRED:
 1. Complete backend server with functional APIs
@@ -186,7 +176,8 @@ DELIVERABLES REQUIRED:
 
 Update Task Master progress: task-master set-status --id=X --status=in-progress/done
 """,
-    tools=[TaskMasterIntegration, CodeValidator, SystemCommand]
+    tools=[TaskMasterIntegration, CodeValidator, SystemCommand],
+    max_completion_tokens=4096
 )
 
 # 3. FRONTEND DEVELOPMENT AGENT - UI/UX specialist
@@ -197,11 +188,11 @@ frontend_agent = Agent(
 You are the FRONTEND DEVELOPMENT AGENT creating all user-facing interfaces.
 
 YOUR TASKS:
-🎯 Task 2.4-2.5: Dashboard Layout and User Activity Logging (2 subtasks)
-🎯 Task 5: Recipient List Management (5 subtasks) - CSV upload, validation, UI
-🎯 Task 6: Message Template Editor (5 subtasks) - Spintext, personalization  
-🎯 Task 9: Campaign Management Dashboard (5 subtasks) - Real-time controls
-🎯 Task 14: Device Management UI (5 subtasks) - Onboarding, monitoring
+- Task 2.4-2.5: Dashboard Layout and User Activity Logging (2 subtasks)
+- Task 5: Recipient List Management (5 subtasks) - CSV upload, validation, UI
+- Task 6: Message Template Editor (5 subtasks) - Spintext, personalization  
+- Task 9: Campaign Management Dashboard (5 subtasks) - Real-time controls
+- Task 14: Device Management UI (5 subtasks) - Onboarding, monitoring
 
 TECHNOLOGY STACK:
 - React with TypeScript and modern hooks
@@ -212,13 +203,12 @@ TECHNOLOGY STACK:
 - Form validation and error handling
 
 ZERO PLACEHOLDER RULE:
-❌ NO mock data, placeholder text, or dummy components  
-❌ NO "Coming Soon" or "Under Construction" pages
-✅ ALL UI components connect to real backend APIs
-✅ ALL forms submit actual data to working endpoints
-✅ ALL dashboards display real data from backend services
-✅ ALL real-time features use actual WebSocket connections
-✅ ALL components handle loading states and errors properly
+- NO "Coming Soon" or "Under Construction" pages
+- ALL UI components connect to real backend APIs
+- ALL forms submit actual data to working endpoints
+- ALL dashboards display real data from backend services
+- ALL real-time features use actual WebSocket connections
+- ALL components handle loading states and errors properly
 
 DELIVERABLES REQUIRED:
 1. Responsive dashboard with working navigation
@@ -230,7 +220,8 @@ DELIVERABLES REQUIRED:
 
 Connect everything to backend APIs and validate end-to-end data flow.
 """,
-    tools=[TaskMasterIntegration, CodeValidator, SystemCommand]
+    tools=[TaskMasterIntegration, CodeValidator, SystemCommand],
+    max_completion_tokens=4096
 )
 
 # 4. MOBILE APP DEVELOPMENT AGENT - Cross-platform mobile specialist  
@@ -241,7 +232,7 @@ mobile_agent = Agent(
 You are the MOBILE APP DEVELOPMENT AGENT creating mobile SMS bridge applications.
 
 YOUR TASK:
-🎯 Task 4: WiFi/Mobile App Connection (7 subtasks)
+- Task 4: WiFi/Mobile App Connection (7 subtasks)
    - Android app development (native/React Native)
    - iOS app development (native/React Native)
    - WebSocket communication with dashboard
@@ -260,13 +251,13 @@ TECHNOLOGY REQUIREMENTS:
 - Push notification support
 
 ZERO PLACEHOLDER RULE:
-❌ NO fake SMS sending or mock device connections
-❌ NO placeholder QR codes or dummy pairing flows
-✅ ALL apps must actually send and receive SMS messages
-✅ ALL WebSocket connections must be functional and tested
-✅ ALL device pairing must work with real QR code generation
-✅ ALL background services must maintain actual connections
-✅ ALL SMS functionality must handle real phone permissions
+- NO fake SMS sending or mock device connections
+- NO placeholder QR codes or dummy pairing flows
+- ALL apps must actually send and receive SMS messages
+- ALL WebSocket connections must be functional and tested
+- ALL device pairing must work with real QR code generation
+- ALL background services must maintain actual connections
+- ALL SMS functionality must handle real phone permissions
 
 DELIVERABLES REQUIRED:
 1. Functional Android app with SMS capabilities
@@ -279,7 +270,8 @@ DELIVERABLES REQUIRED:
 
 Test all functionality with actual SMS sending/receiving on real devices.
 """,
-    tools=[TaskMasterIntegration, CodeValidator, SystemCommand]
+    tools=[TaskMasterIntegration, CodeValidator, SystemCommand],
+    max_completion_tokens=4096
 )
 
 # 5. DEVICE INTEGRATION AGENT - Hardware connectivity specialist
@@ -290,7 +282,7 @@ device_agent = Agent(
 You are the DEVICE INTEGRATION AGENT connecting physical devices to the platform.
 
 YOUR TASKS:
-🎯 Task 3: USB Device Connection (6 subtasks)
+- Task 3: USB Device Connection (6 subtasks)
    - WebUSB API integration for browser connections
    - Device detection and enumeration service
    - Connection handshake and authentication protocol
@@ -298,7 +290,7 @@ YOUR TASKS:
    - Command transmission and response handling
    - Error handling and connection recovery
 
-🎯 Task 8: Load Balancing and Distribution (5 subtasks)
+- Task 8: Load Balancing and Distribution (5 subtasks)
    - Round-robin and even distribution algorithms
    - Priority-based distribution with health monitoring
    - Dynamic redistribution for offline devices
@@ -314,13 +306,13 @@ TECHNOLOGY REQUIREMENTS:
 - Device failure detection and recovery
 
 ZERO PLACEHOLDER RULE:
-❌ NO simulated devices or fake hardware connections
-❌ NO mock protocols or placeholder communication
-✅ ALL device detection must work with real USB hardware
-✅ ALL communication protocols handle actual device data  
-✅ ALL load balancing distributes real messages across devices
-✅ ALL health monitoring tracks actual device metrics
-✅ ALL error handling covers real device failure scenarios
+- NO simulated devices or fake hardware connections
+- NO mock protocols or placeholder communication
+- ALL device detection must work with real USB hardware
+- ALL communication protocols handle actual device data  
+- ALL load balancing distributes real messages across devices
+- ALL health monitoring tracks actual device metrics
+- ALL error handling covers real device failure scenarios
 
 DELIVERABLES REQUIRED:
 1. Working WebUSB integration with device detection
@@ -332,7 +324,8 @@ DELIVERABLES REQUIRED:
 
 Test with actual USB-connected phones and validate all functionality.
 """,
-    tools=[TaskMasterIntegration, CodeValidator, SystemCommand]
+    tools=[TaskMasterIntegration, CodeValidator, SystemCommand],
+    max_completion_tokens=2048
 )
 
 # 6. QUALITY ASSURANCE AGENT - Critical validation gatekeeper
@@ -342,20 +335,20 @@ qa_agent = Agent(
     instructions="""
 You are the QUALITY ASSURANCE AGENT - the ULTIMATE GATEKEEPER for production readiness.
 
-🚫 YOUR MISSION: BLOCK ALL PLACEHOLDER CODE FROM REACHING PRODUCTION
-✅ ENSURE 100% FUNCTIONAL IMPLEMENTATIONS
+YOUR MISSION: BLOCK ALL PLACEHOLDER CODE FROM REACHING PRODUCTION
+ENSURE 100% FUNCTIONAL IMPLEMENTATIONS
 
 VALIDATION CHECKLIST FOR EVERY DELIVERABLE:
-1. ❌ REJECT: TODO/FIXME comments in code
-2. ❌ REJECT: Hardcoded demo data (emails, phone numbers, names)
-3. ❌ REJECT: console.log/print statements in production code  
-4. ❌ REJECT: Empty functions or placeholder implementations
-5. ❌ REJECT: Mock responses or fake API data
-6. ✅ REQUIRE: Real database operations with actual schemas
-7. ✅ REQUIRE: API endpoints processing real data with validation
-8. ✅ REQUIRE: UI components connected to working backend services
-9. ✅ REQUIRE: End-to-end functionality with real data flows
-10. ✅ REQUIRE: Proper error handling for production scenarios
+1. REJECT: TODO/FIXME comments in code
+2. REJECT: Hardcoded demo data (emails, phone numbers, names)
+3. REJECT: console.log/print statements in production code  
+4. REJECT: Empty functions or placeholder implementations
+5. REJECT: Mock responses or fake API data
+6. REQUIRE: Real database operations with actual schemas
+7. REQUIRE: API endpoints processing real data with validation
+8. REQUIRE: UI components connected to working backend services
+9. REQUIRE: End-to-end functionality with real data flows
+10. REQUIRE: Proper error handling for production scenarios
 
 FORBIDDEN PATTERNS TO DETECT:
 - "user@example.com", "test@test.com", "example.com"
@@ -366,15 +359,16 @@ FORBIDDEN PATTERNS TO DETECT:
 - "Lorem ipsum", "placeholder", "sample data"
 
 APPROVAL PROCESS:
-1. Use CodeValidator tool on ALL files
-2. Test ALL API endpoints with real requests
+1. Use RepoValidator on the project root to cover ALL files, then CodeValidator on files as they are fixed
+2. Test ALL API endpoints with real requests (ApiRequest)
 3. Verify ALL integrations work end-to-end  
 4. Confirm ALL error scenarios are handled
 5. Only then update Task Master: task-master set-status --id=X --status=done
 
 NEVER APPROVE INCOMPLETE WORK. You are the final guardian of quality.
 """,
-    tools=[TaskMasterIntegration, CodeValidator, SystemCommand]
+    tools=[TaskMasterIntegration, CodeValidator, RepoValidator, ApiRequest, SystemCommand],
+    max_completion_tokens=2048
 )
 
 # 7. TESTING AGENT - Performance and system validation specialist  
@@ -385,7 +379,7 @@ testing_agent = Agent(
 You are the TESTING & PERFORMANCE AGENT ensuring system reliability at scale.
 
 YOUR TASK:
-🎯 Task 15: System Testing and Performance Optimization (7 subtasks)
+- Task 15: System Testing and Performance Optimization (7 subtasks)
    - End-to-end test suite development
    - Load testing with 10k+ recipients, 50+ devices
    - Performance bottleneck identification and resolution
@@ -409,13 +403,13 @@ TESTING REQUIREMENTS:
 - Integration testing across all system components
 
 ZERO PLACEHOLDER RULE:
-❌ NO mock tests or fake load scenarios
-❌ NO placeholder performance metrics or dummy data
-✅ ALL tests validate real system functionality
-✅ ALL load tests use actual data volumes and realistic patterns
-✅ ALL performance metrics reflect real usage scenarios  
-✅ ALL security tests cover actual vulnerabilities and attack vectors
-✅ ALL monitoring alerts trigger on real system conditions
+- NO mock tests or fake load scenarios
+- NO placeholder performance metrics or dummy data
+- ALL tests validate real system functionality
+- ALL load tests use actual data volumes and realistic patterns
+- ALL performance metrics reflect real usage scenarios  
+- ALL security tests cover actual vulnerabilities and attack vectors
+- ALL monitoring alerts trigger on real system conditions
 
 DELIVERABLES REQUIRED:
 1. Complete test suite with meaningful coverage
@@ -427,56 +421,31 @@ DELIVERABLES REQUIRED:
 
 Validate the entire system meets specified scale and performance requirements.
 """,
-    tools=[TaskMasterIntegration, CodeValidator, SystemCommand]
+    tools=[TaskMasterIntegration, CodeValidator, ApiRequest, SystemCommand],
+    max_completion_tokens=4096
 )
 
 # =============================================================================
 # AGENCY CREATION AND DEPLOYMENT
 # =============================================================================
 
-def create_sms_platform_agency():
-    """Create the SMS Platform Development Agency with proper communication flows"""
-    
-    # Create the agency with communication flows
-    agency = Agency([
-        orchestrator_agent,  # Executive coordinator
-        
-        # Communication flows: [from_agent, to_agent]
-        [orchestrator_agent, backend_agent],      # Orchestrator coordinates Backend
-        [orchestrator_agent, frontend_agent],     # Orchestrator coordinates Frontend
-        [orchestrator_agent, mobile_agent],       # Orchestrator coordinates Mobile  
-        [orchestrator_agent, device_agent],       # Orchestrator coordinates Device
-        [orchestrator_agent, qa_agent],           # Orchestrator coordinates QA
-        [orchestrator_agent, testing_agent],      # Orchestrator coordinates Testing
-        
-        # Cross-agent collaboration flows
-        [backend_agent, frontend_agent],          # Backend collaborates with Frontend
-        [backend_agent, mobile_agent],            # Backend collaborates with Mobile
-        [backend_agent, device_agent],            # Backend collaborates with Device
-        [mobile_agent, device_agent],             # Mobile collaborates with Device
-        
-        # QA validates everyone's work  
-        [qa_agent, backend_agent],                # QA validates Backend work
-        [qa_agent, frontend_agent],               # QA validates Frontend work
-        [qa_agent, mobile_agent],                 # QA validates Mobile work
-        [qa_agent, device_agent],                 # QA validates Device work
-        [qa_agent, testing_agent],                # QA validates Testing work
-        
-        # Testing collaborates with implementers
-        [testing_agent, backend_agent],           # Testing works with Backend
-        [testing_agent, frontend_agent],          # Testing works with Frontend
-        [testing_agent, mobile_agent],            # Testing works with Mobile
-        [testing_agent, device_agent],            # Testing works with Device
-    ],
-    shared_instructions="""
-🎯 SMS DRIP CAMPAIGN PLATFORM DEVELOPMENT AGENCY
+# Agency Swarm prepends this to every agent's instructions, so it is the prompt
+# prefix all seven assistants share. Keep it and the agent instructions static:
+# anything that changes per turn goes in the message, after the cached prefix.
+# Rules every agent follows; each agent's own ZERO PLACEHOLDER RULE only adds its domain specifics
+ZERO_PLACEHOLDER_POLICY = """ZERO TOLERANCE POLICY:
+- NO placeholder code, demo data, TODO comments, mock responses, or mock implementations
+- NO hardcoded demo contacts ("user@example.com", "123-456-7890"), placeholder text, or dummy components
+- ALL code must be functionally complete and production-ready
+- QA Agent has ABSOLUTE VETO power over all deliverables
+"""
+
+SHARED_INSTRUCTIONS = """
+SMS DRIP CAMPAIGN PLATFORM DEVELOPMENT AGENCY
 
 MISSION: Build production-ready SMS platform supporting multiple devices, advanced campaigns, scaling to 10k+ recipients with 50+ active devices.
 
-ZERO TOLERANCE POLICY:
-🚫 NO placeholder code, demo data, TODO comments, or mock implementations  
-✅ ALL code must be functionally complete and production-ready
-🔍 QA Agent has ABSOLUTE VETO power over all deliverables
+""" + ZERO_PLACEHOLDER_POLICY + """
 
 TASK MASTER INTEGRATION:
 - Update progress continuously: task-master set-status --id=X --status=Y
@@ -485,13 +454,57 @@ TASK MASTER INTEGRATION:
 - Report blockers to Orchestrator immediately
 
 SUCCESS METRICS:
-✅ 15 main tasks completed (83 subtasks total)
-✅ 100% functional code (0% placeholders)  
-✅ Production deployment ready
-✅ Full end-to-end integration validated
+- 15 main tasks completed (83 subtasks total)
+- 100% functional code (0% placeholders)  
+- Production deployment ready
+- Full end-to-end integration validated
 
-BUILD THE REAL THING - NO SHORTCUTS ALLOWED! 🔥
-""",
+BUILD THE REAL THING - NO SHORTCUTS ALLOWED!
+"""
+
+# Communication flows: (sender, recipients). Every sender gets a SendMessage tool
+# listing its recipients, and that tool is part of each of its prompts.
+CORE_FLOWS = [
+    # Orchestrator coordinates everyone
+    (orchestrator_agent, [backend_agent, frontend_agent, mobile_agent, device_agent, qa_agent, testing_agent]),
+    # QA validates everyone's work
+    (qa_agent, [backend_agent, frontend_agent, mobile_agent, device_agent, testing_agent]),
+]
+COLLABORATION_FLOWS = [
+    # Cross-agent collaboration flows
+    (backend_agent, [frontend_agent, mobile_agent, device_agent]),
+    (mobile_agent, [device_agent]),
+    # Testing collaborates with implementers
+    (testing_agent, [backend_agent, frontend_agent, mobile_agent, device_agent]),
+]
+
+
+def _build_flows(enable_full_mesh=False):
+    """[from_agent, to_agent] edges, deduplicated; peer collaboration edges only on request."""
+    groups = CORE_FLOWS + (COLLABORATION_FLOWS if enable_full_mesh else [])
+    edges = dict.fromkeys((sender, recipient) for sender, recipients in groups for recipient in recipients)
+    return [[sender, recipient] for sender, recipient in edges]
+
+
+@lru_cache(maxsize=None)
+def create_sms_platform_agency(enable_full_mesh=False):
+    """Create the SMS Platform Development Agency with proper communication flows
+    
+    Built once per process and flow layout: creating an Agency syncs all seven
+    assistants with the OpenAI API, and the agents themselves are module constants.
+    """
+    
+    # Agency Swarm reads the key from the environment
+    get_openai_key()
+    
+    # Create the agency with communication flows
+    agency = Agency([
+        orchestrator_agent,  # Executive coordinator
+        *_build_flows(enable_full_mesh),
+    ],
+    shared_instructions=SHARED_INSTRUCTIONS,
+    send_message_tool_class=CachedSendMessage,
+    # Defaults only: each agent declares its own, smaller completion budget
     max_prompt_tokens=25000,
     max_completion_tokens=8000
     )
@@ -499,83 +512,267 @@ BUILD THE REAL THING - NO SHORTCUTS ALLOWED! 🔥
     return agency
 
 
-def deploy_sms_agency_swarm():
-    """Deploy the SMS Platform Agency Swarm"""
+def task_list():
+    """`task-master list --json` output, or None when Task Master cannot be run."""
+    try:
+        result = task_master("list --json")
+    except Exception:
+        return None
+    return result.stdout if result.returncode == 0 else None
+
+
+def task_state_hash():
+    """Fingerprint of the Task Master task list, or None when it cannot be read."""
+    tasks = task_list()
+    return hashlib.md5(tasks.encode()).hexdigest() if tasks is not None else None
+
+
+# Task list changes made outside the REPL are picked up within this many seconds
+TASK_STATE_REFRESH_SECONDS = 15
+
+
+class TaskStateWatcher:
+    """Task list fingerprint kept current in the background, so queries never wait on task-master."""
     
-    print("🚀 DEPLOYING SMS PLATFORM AGENCY SWARM")
-    print("Building production-ready SMS platform with specialized AI agents")
-    print("ZERO PLACEHOLDER TOLERANCE ENFORCED!")
-    print("=" * 80)
+    def __init__(self):
+        self.value = None  # unknown until the first refresh: the query cache stays off
     
-    try:
-        # Create the agency
-        agency = create_sms_platform_agency()
-        print("✅ Agency created successfully with 7 specialized agents")
-        
-        # Kickoff message to start development
-        kickoff_message = """
-🎯 SMS PLATFORM DEVELOPMENT - AGENCY SWARM DEPLOYMENT
+    def refresh(self):
+        self.value = task_state_hash()
+    
+    async def run(self, interval=TASK_STATE_REFRESH_SECONDS):
+        while True:
+            await asyncio.to_thread(self.refresh)
+            await asyncio.sleep(interval)
+
+
+# Interactive shortcuts
+COMMAND_ALIASES = {
+    'status': "Get current task status from Task Master and report progress on all agents",
+    'progress': "Show detailed progress on each task and identify any blockers",
+}
+
+
+# Kickoff message to start development
+KICKOFF_MESSAGE = """
+SMS PLATFORM DEVELOPMENT - AGENCY SWARM DEPLOYMENT
 
 Welcome specialized agents! Time to build the SMS Drip Campaign Platform.
 
 CURRENT STATUS:
-✅ Task Master parsed PRD: 15 main tasks, 83 subtasks ready  
-✅ Task 1 (Project Architecture) marked IN-PROGRESS
-✅ All API keys configured and Task Master research working
-✅ Agency Swarm deployed with 7 specialized agents
+- Task Master parsed PRD: 15 main tasks, 83 subtasks ready  
+- Task 1 (Project Architecture) marked IN-PROGRESS
+- All API keys configured and Task Master research working
+- Agency Swarm deployed with 7 specialized agents
 
 IMMEDIATE EXECUTION REQUIRED:
 
-🤖 OrchestratorAgent:
+OrchestratorAgent:
+- Start by getting current task status and assigning work to agents based on dependencies
 - Execute: task-master list (get current task status)
 - Assign Task 1 subtasks to BackendArchitectAgent
 - Coordinate parallel work across agents
 
-🔧 BackendArchitectAgent: 
+BackendArchitectAgent: 
 - START NOW: Task 1.1 (Backend Framework Setup)
 - BEGIN: Task 1.3 (Database Schema Design)  
 - INITIALIZE: Task 1.4 (API Endpoint Architecture)
 
-🎨 FrontendDeveloperAgent:
+FrontendDeveloperAgent:
 - PREPARE: Design system and component planning
 - RESEARCH: Integration patterns with backend APIs
 
-📱 MobileAppDeveloperAgent:  
+MobileAppDeveloperAgent:  
 - RESEARCH: React Native vs Native development approach
 - PLAN: WebSocket integration architecture
 
-🔌 DeviceIntegrationAgent:
+DeviceIntegrationAgent:
 - RESEARCH: WebUSB API capabilities and browser support
 - PLAN: Device detection and communication protocols
 
-🔍 QualityAssuranceAgent:
+QualityAssuranceAgent:
 - SET UP: Validation framework and code review checklist
 - PREPARE: Anti-placeholder detection systems
 
-🧪 TestingPerformanceAgent:
+TestingPerformanceAgent:
 - PLAN: Testing infrastructure and performance benchmarks
 - PREPARE: Load testing scenarios for 10k+ recipients
 
 CRITICAL REMINDERS:
-🚫 ZERO TOLERANCE for placeholder code, TODO comments, or demo data
-✅ ALL implementations must be production-ready from day one
-🔍 QA Agent validates EVERYTHING before task completion
-⚡ Work in parallel where possible, coordinate on dependencies
+- ZERO TOLERANCE for placeholder code, TODO comments, or demo data
+- ALL implementations must be production-ready from day one
+- QA Agent validates EVERYTHING before task completion
+- Work in parallel where possible, coordinate on dependencies
+
+LET'S BUILD THE REAL THING!
+"""
+
+
+# Agents that receive the kickoff assignments directly
+DEVELOPMENT_AGENTS = [backend_agent, frontend_agent, mobile_agent, device_agent, qa_agent, testing_agent]
+
+# Each agent's directive lines in the kickoff message, by agent name
+KICKOFF_SECTION_RE = re.compile(r'^(\w+Agent):[ \t]*\n((?:- .*\n)+)', re.M)
+KICKOFF_DIRECTIVES = {name: lines.strip() for name, lines in KICKOFF_SECTION_RE.findall(KICKOFF_MESSAGE)}
+
+# PREPARE/RESEARCH/PLAN work with no dependencies: sent as written, without waiting on the orchestrator's plan
+PREP_AGENTS = [frontend_agent, mobile_agent, device_agent, qa_agent, testing_agent]
+PLANNED_AGENTS = [agent for agent in DEVELOPMENT_AGENTS if agent not in PREP_AGENTS]
+PREP_FORMAT = """KICKOFF - preparation work, independent of the other agents:
+{directives}
 
-LET'S BUILD THE REAL THING! 🔥
+Do not message other agents yet. Report what you prepared and what you will need from the other agents.
 """
+PREP_ASSIGNMENTS = {agent.name: PREP_FORMAT.format(directives=KICKOFF_DIRECTIVES[agent.name]) for agent in PREP_AGENTS}
+
+# Orchestrator plans are replayed while the task list they were made from is unchanged
+PLAN_CACHE_PATH = Path(".sms_plan_cache.json")
+PLAN_FORMAT = """
+Do not message other agents yet. Reply ONLY with a JSON object mapping each agent name
+({names}) to the complete instructions for its first assignment.
+
+CURRENT TASK MASTER TASKS:
+{tasks}
+"""
+JSON_OBJECT_RE = re.compile(r'\{.*\}', re.S)
+
+
+def _parse_plan(reply):
+    """Agent name -> assignment from the orchestrator's reply, or None if it is not a usable plan."""
+    match = JSON_OBJECT_RE.search(reply or "")
+    try:
+        plan = json.loads(match.group()) if match else None
+    except ValueError:
+        return None
+    names = {agent.name for agent in DEVELOPMENT_AGENTS}
+    if not isinstance(plan, dict) or not names & plan.keys():
+        return None
+    return {name: str(task) for name, task in plan.items() if name in names}
+
+
+def plan_kickoff():
+    """Per-agent kickoff assignments: replayed from the plan cache, or planned once by the orchestrator."""
+    tasks = task_list()
+    key = hashlib.sha256(tasks.encode()).hexdigest() if tasks is not None else None
+    
+    if key and PLAN_CACHE_PATH.exists():
+        cached = json.loads(PLAN_CACHE_PATH.read_text(encoding="utf-8"))
+        if cached.get("key") == key:
+            print("♻️ Task list unchanged - replaying cached kickoff plan")
+            return cached["plan"]
+    
+    print("🧭 Planning kickoff assignments with OrchestratorAgent...")
+    prompt = KICKOFF_MESSAGE + PLAN_FORMAT.format(
+        names=", ".join(agent.name for agent in PLANNED_AGENTS),
+        tasks=tasks or "(Task Master unavailable)",
+    )
+    completion = get_openai_client().chat.completions.create(
+        model=orchestrator_agent.model,
+        messages=[
+            {"role": "system", "content": orchestrator_agent.instructions},
+            {"role": "user", "content": prompt},
+        ],
+    )
+    plan = _parse_plan(completion.choices[0].message.content)
+    if plan and key:
+        PLAN_CACHE_PATH.write_text(json.dumps({"key": key, "plan": plan}, indent=2), encoding="utf-8")
+    return plan
+
+
+async def run_kickoff(agency):
+    """Kickoff turns: preparation runs while the orchestrator plans the dependency-chain work."""
+    prep = [(agent, PREP_ASSIGNMENTS[agent.name]) for agent in PREP_AGENTS]
+    print(f"⚡ Dispatching {len(prep)} preparation assignments in parallel...")
+    prep_results = asyncio.ensure_future(gather_agent_turns(agency, prep))
+    
+    plan = await asyncio.to_thread(plan_kickoff)
+    if plan is None:
+        print("⚠️ No usable plan - sending the kickoff directives as written")
+        plan = {agent.name: KICKOFF_DIRECTIVES[agent.name] for agent in PLANNED_AGENTS}
+    # Plans cached before the preparation split also cover the prep agents
+    turns = [(agent, plan[agent.name]) for agent in PLANNED_AGENTS if agent.name in plan]
+    print(f"⚡ Dispatching {len(turns)} planned assignments...")
+    results = await gather_agent_turns(agency, turns)
+    return prep + turns, list(await prep_results) + list(results)
+
+
+async def interactive_session(agency):
+    """REPL over the agency; input is read and the task state refreshed while replies stream."""
+    watcher = TaskStateWatcher()
+    refresher = asyncio.create_task(watcher.run())
+    # Repeated status/progress questions are answered from memory until the task list changes
+    session = RepeatQueryCache(agency, lambda: watcher.value, COMMAND_ALIASES.values())
+    
+    def handle_command(user_input):
+        if user_input.lower() == 'validate':
+            # A deterministic pattern scan: run it here rather than asking QA to call the tool
+            print("\n🔍 Validation:")
+            print(RepoValidator(root=TASK_MASTER_DIR).run())
+            return
+        user_input = COMMAND_ALIASES.get(user_input.lower(), user_input)
+        # Tokens print as they arrive instead of after the whole reply
+        print("\n📋 Agency Response:")
+        stream_completion(session, user_input)
+        # The reply may have moved tasks along; never answer the next query from the old state
+        watcher.refresh()
+    
+    try:
+        await command_loop("\n💬 Message to agency: ", handle_command)
+    finally:
+        refresher.cancel()
+
+
+def describe_dry_run(enable_full_mesh=False):
+    """Print what a deploy would set up, without creating assistants or calling the API."""
+    flows = _build_flows(enable_full_mesh)
+    lines = ["🧪 DRY RUN - no assistants created, no LLM calls", "-" * 80]
+    for agent in [orchestrator_agent] + DEVELOPMENT_AGENTS:
+        recipients = [recipient.name for sender, recipient in flows if sender is agent]
+        lines.append(f"{agent.name}: {len(agent.instructions)} instruction chars, "
+                     f"tools {[tool.__name__ for tool in agent.tools]}, messages {recipients or 'nobody'}")
+    
+    tasks = task_list()
+    key = hashlib.sha256(tasks.encode()).hexdigest() if tasks is not None else None
+    cached = PLAN_CACHE_PATH.exists() and json.loads(PLAN_CACHE_PATH.read_text(encoding="utf-8")).get("key") == key
+    lines.append(f"Communication flows: {len(flows)}")
+    lines.append(f"Kickoff: {', '.join(agent.name for agent in PREP_AGENTS)} prepare directly; "
+                 f"{', '.join(agent.name for agent in PLANNED_AGENTS)} wait on the plan")
+    lines.append(f"Task Master: {'available' if tasks is not None else 'unavailable'}; "
+                 f"kickoff plan {'cached' if key and cached else 'needs planning'}")
+    write_lines(*lines)
+
+
+def deploy_sms_agency_swarm():
+    """Deploy the SMS Platform Agency Swarm"""
+    
+    write_lines(
+        "🚀 DEPLOYING SMS PLATFORM AGENCY SWARM",
+        "Building production-ready SMS platform with specialized AI agents",
+        "ZERO PLACEHOLDER TOLERANCE ENFORCED!",
+        "=" * 80,
+    )
+    
+    try:
+        # Create the agency
+        agency = create_sms_platform_agency()
+        print("✅ Agency created successfully with 7 specialized agents")
         
-        print("🚀 Starting agency with kickoff message...")
-        print("-" * 80)
+        write_lines(
+            "🚀 Starting agency with kickoff message...",
+            "-" * 80,
+        )
         
-        # Get agency response
-        response = agency.get_completion(kickoff_message)
+        # Assignments go straight to each agent; the orchestrator only plans the dependency chain
+        turns, results = asyncio.run(run_kickoff(agency))
+        response = format_turn_results(turns, results)
         
-        print("\n" + "=" * 80)
-        print("🎯 AGENCY SWARM RESPONSE:")
-        print("=" * 80)
-        print(response)
-        print("=" * 80)
+        write_lines(
+            "\n" + "=" * 80,
+            "🎯 AGENCY SWARM RESPONSE:",
+            "=" * 80,
+            response,
+            "=" * 80,
+        )
         
         return agency, response
         
@@ -587,41 +784,37 @@ LET'S BUILD THE REAL THING! 🔥
 
 
 if __name__ == "__main__":
-    print("🎯 SMS PLATFORM AGENCY SWARM")
-    print("Specialized AI agents building production-ready SMS platform")
-    print("Task Master integrated | Zero placeholder tolerance")
-    print()
+    write_lines(
+        "🎯 SMS PLATFORM AGENCY SWARM",
+        "Specialized AI agents building production-ready SMS platform",
+        "Task Master integrated | Zero placeholder tolerance",
+        "",
+    )
+    
+    # --dry-run checks the setup and exits before anything touches the API
+    if "--dry-run" in sys.argv:
+        describe_dry_run()
+        sys.exit(0)
     
     # Deploy the agency swarm
     agency, response = deploy_sms_agency_swarm()
     
     if agency:
-        print("\n🎉 SMS Platform Agency Swarm successfully deployed!")
-        print("Agents are collaborating to build the platform...")
+        write_lines(
+            "\n🎉 SMS Platform Agency Swarm successfully deployed!",
+            "Agents are collaborating to build the platform...",
+        )
         
         # Interactive mode
         try:
-            print("\n📞 Agency ready for interaction...")
-            print("Commands: 'status', 'progress', 'validate', or custom message")
-            print("Type 'exit' to stop")
+            write_lines(
+                "\n📞 Agency ready for interaction...",
+                "Commands: 'status', 'progress', 'validate', or custom message",
+                "Type 'exit' to stop",
+            )
+            
+            asyncio.run(interactive_session(agency))
             
-            while True:
-                user_input = input("\n💬 Message to agency: ").strip()
-                
-                if user_input.lower() == 'exit':
-                    break
-                elif user_input.lower() == 'status':
-                    user_input = "Get current task status from Task Master and report progress on all agents"
-                elif user_input.lower() == 'progress':
-                    user_input = "Show detailed progress on each task and identify any blockers"  
-                elif user_input.lower() == 'validate':
-                    user_input = "QualityAssuranceAgent: Run validation checks on all current deliverables"
-                
-                if user_input:
-                    print("\n🤖 Processing...")
-                    response = agency.get_completion(user_input)
-                    print(f"\n📋 Agency Response:\n{response}")
-                    
         except KeyboardInterrupt:
             print("\n\n👋 SMS Platform Agency Swarm stopped")
             
@@ -8,15 +8,22 @@ to actually build the SMS Drip Campaign Platform.
 """
 
 import os
-import subprocess
+import re
+import asyncio
+from functools import lru_cache
+from typing import Dict, List, Optional
 from agency_swarm import Agency, Agent
 from agency_swarm.tools import BaseTool
 from pydantic import Field
-from dotenv import load_dotenv
+from sms_tools import read_text_cached, run_command_sequence, new_command_log, logged_output
+from agent_turns import gather_agent_turns, format_turn_results
+from completion_stream import command_loop, stream_completion
+from build_jobs import BuildJournal, run_journaled_turns
+from subagents import SubagentRegistry
+from sms_config import get_openai_key
 
-# Load environment variables
-load_dotenv()
-os.environ["OPENAI_API_KEY"] = os.getenv('OPENAI_API_KEY')
+# Source files are written in one or two write() calls instead of 8KB chunks
+WRITE_BUFFER_SIZE = 128 * 1024
 
 # Development Tools
 class FileWriter(BaseTool):
@@ -29,46 +36,78 @@ class FileWriter(BaseTool):
         try:
             # Ensure directory exists
             os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
-            with open(self.file_path, self.mode) as file:
+            with open(self.file_path, self.mode, buffering=WRITE_BUFFER_SIZE) as file:
                 file.write(self.content)
             return f"Successfully wrote to {self.file_path}"
         except Exception as e:
             return f"Error writing file: {str(e)}"
 
+class FileWriterBatch(BaseTool):
+    """Write several files in one call, e.g. all the files of a new component or module."""
+    files: List[Dict[str, str]] = Field(
+        ..., description="Files to write, each as {\"path\": \"...\", \"content\": \"...\"}; existing files are overwritten"
+    )
+    
+    def run(self):
+        try:
+            # One makedirs per distinct directory, not one per file
+            directories = {os.path.dirname(file["path"]) for file in self.files if os.path.dirname(file["path"])}
+            for directory in directories:
+                os.makedirs(directory, exist_ok=True)
+            
+            for file in self.files:
+                with open(file["path"], "wb", buffering=WRITE_BUFFER_SIZE) as handle:
+                    handle.write(file["content"].encode("utf-8"))
+            return f"Successfully wrote {len(self.files)} files:\n" + "\n".join(file["path"] for file in self.files)
+        except Exception as e:
+            return f"Error writing files: {str(e)}"
+
 class CommandExecutor(BaseTool):
     """Execute terminal commands."""
-    command: str = Field(..., description="Command to execute")
+    command: str = Field(default="", description="Command to execute")
+    commands: Optional[List[str]] = Field(
+        default=None,
+        description="Several commands to run in order, stopping at the first failure (instead of command)"
+    )
     working_directory: str = Field(default=".", description="Working directory")
     
     def run(self):
         try:
-            result = subprocess.run(
-                self.command, shell=True, capture_output=True, 
-                text=True, cwd=self.working_directory
-            )
+            commands = self.commands or [self.command]
+            if not any(commands):
+                return "Execution error: no command given"
+            # Plain commands are spawned directly; pipes, cd and the like still go through one shell
+            # Output streams to a log file; npm and build logs never pile up in memory
+            result = run_command_sequence(commands, cwd=self.working_directory, log_path=new_command_log())
             if result.returncode == 0:
-                return f"Command executed successfully:\n{result.stdout}"
+                return f"Command executed successfully:\n{logged_output(result)}"
             else:
-                return f"Command failed:\n{result.stderr}"
+                return f"Command failed:\n{logged_output(result)}"
         except Exception as e:
             return f"Execution error: {str(e)}"
 
 class GitTool(BaseTool):
     """Perform git operations."""
-    git_command: str = Field(..., description="Git command to execute")
+    git_command: str = Field(default="", description="Git command to execute")
+    git_commands: Optional[List[str]] = Field(
+        default=None,
+        description="Several git commands to run in order, stopping at the first failure, "
+                    "e.g. ['init', 'add .', 'commit -m \"Initial commit\"'] (instead of git_command)"
+    )
     repository_path: str = Field(default=".", description="Repository path")
     
     def run(self):
         try:
-            full_command = f"git {self.git_command}"
-            result = subprocess.run(
-                full_command, shell=True, capture_output=True,
-                text=True, cwd=self.repository_path
-            )
+            git_commands = self.git_commands or [self.git_command]
+            if not any(git_commands):
+                return "Git execution error: no git command given"
+            # git is spawned directly, without a shell in between
+            result = run_command_sequence(git_commands, cwd=self.repository_path, prefix="git",
+                                          log_path=new_command_log())
             if result.returncode == 0:
-                return f"Git command executed:\n{result.stdout}"
+                return f"Git command executed:\n{logged_output(result)}"
             else:
-                return f"Git command failed:\n{result.stderr}"
+                return f"Git command failed:\n{logged_output(result)}"
         except Exception as e:
             return f"Git execution error: {str(e)}"
 
@@ -78,222 +117,309 @@ class FileReader(BaseTool):
     
     def run(self):
         try:
-            with open(self.file_path, 'r') as file:
-                content = file.read()
+            # Agents re-read the same files across turns; unchanged ones come from memory
+            content = read_text_cached(self.file_path)
             return f"File content of {self.file_path}:\n{content}"
         except Exception as e:
             return f"Error reading file: {str(e)}"
 
-# Create Development Agents with Tools
-backend_agent = Agent(
-    name="BackendDeveloper",
-    description="Backend developer with file writing, command execution, and git capabilities",
-    instructions="""You are a backend developer specializing in Node.js/Express and PostgreSQL.
-    
-    Your primary tasks:
-    1. Create Node.js/Express backend with TypeScript
-    2. Set up PostgreSQL database with proper schemas
-    3. Implement SMS gateway integration
-    4. Create RESTful APIs for campaign management
-    5. Set up WebSocket server for real-time updates
-    
-    Use your tools:
-    - FileWriter: Create all backend code files (package.json, server files, routes, models, etc.)
-    - CommandExecutor: Run npm commands, database migrations, tests
-    - GitTool: Commit your work regularly
-    - FileReader: Check existing files before modifying
-    
-    CRITICAL: NO placeholder code. All implementations must be production-ready.""",
-    tools=[FileWriter, CommandExecutor, GitTool, FileReader],
-)
-
-frontend_agent = Agent(
-    name="FrontendDeveloper", 
-    description="Frontend developer with React expertise and development tools",
-    instructions="""You are a frontend developer specializing in React and responsive design.
-    
-    Your primary tasks:
-    1. Create React dashboard with TypeScript
-    2. Implement campaign management interface
-    3. Build contact management system
-    4. Create analytics and reporting views
-    5. Implement responsive design for all devices
-    
-    Use your tools:
-    - FileWriter: Create React components, CSS, HTML files
-    - CommandExecutor: Run npm commands, build processes, tests
-    - GitTool: Version control for frontend code
-    - FileReader: Review existing components before changes
-    
-    CRITICAL: NO demo data or placeholder components. Everything must be functional.""",
-    tools=[FileWriter, CommandExecutor, GitTool, FileReader],
-)
-
-device_agent = Agent(
-    name="DeviceConnectionAgent",
-    description="Device connectivity specialist with USB and mobile development tools",
-    instructions="""You are a device connectivity specialist focused on USB and mobile connections.
-    
-    Your primary tasks:
-    1. Implement WebUSB API for browser-based device connection
-    2. Create device detection and management system
-    3. Handle SMS sending through connected devices
-    4. Implement device failover and load balancing
-    5. Create device monitoring and status reporting
-    
-    Use your tools:
-    - FileWriter: Create device connection libraries and interfaces
-    - CommandExecutor: Test device connections, run integration tests
-    - GitTool: Manage device-related code versions
-    - FileReader: Review device APIs and documentation
-    
-    CRITICAL: All device connections must be secure and production-ready.""",
-    tools=[FileWriter, CommandExecutor, GitTool, FileReader],
-)
-
-mobile_agent = Agent(
-    name="MobileAppAgent",
-    description="Mobile app developer with Android/iOS development tools",
-    instructions="""You are a mobile app developer for Android and iOS platforms.
-    
-    Your primary tasks:
-    1. Create React Native bridge applications
-    2. Implement WebSocket connectivity for real-time sync
-    3. Build mobile SMS functionality
-    4. Create mobile campaign management interface
-    5. Handle push notifications and alerts
-    
-    Use your tools:
-    - FileWriter: Create mobile app code, config files, manifests
-    - CommandExecutor: Build apps, run mobile tests, deploy
-    - GitTool: Version control for mobile code
-    - FileReader: Review mobile frameworks and dependencies
-    
-    CRITICAL: Mobile apps must be fully functional, no prototype code.""",
-    tools=[FileWriter, CommandExecutor, GitTool, FileReader],
-)
-
-qa_agent = Agent(
-    name="QualityAssuranceAgent",
-    description="Quality assurance specialist with testing and validation tools",
-    instructions="""You are a QA specialist responsible for ensuring production-ready code quality.
-    
-    Your primary tasks:
-    1. Review all code for placeholder content and TODO items
-    2. Create comprehensive test suites for all components
-    3. Validate API endpoints and data flows
-    4. Perform integration testing across all services
-    5. BLOCK any non-functional or demo code from deployment
-    
-    Use your tools:
-    - FileReader: Examine all code files for quality issues
-    - FileWriter: Create test files, validation scripts, quality reports
-    - CommandExecutor: Run test suites, lint checks, quality scans
-    - GitTool: Enforce quality gates in version control
-    
-    CRITICAL: Zero tolerance for placeholder code. Everything must be production-ready.""",
-    tools=[FileWriter, CommandExecutor, GitTool, FileReader],
-)
-
-testing_agent = Agent(
-    name="TestingAgent",
-    description="Testing specialist with automated testing and performance tools", 
-    instructions="""You are a testing specialist focused on automated testing and performance.
-    
-    Your primary tasks:
-    1. Create unit tests for all backend and frontend code
-    2. Implement integration tests for API endpoints
-    3. Build end-to-end tests for user workflows
-    4. Set up load testing for high-volume SMS campaigns
-    5. Monitor performance and optimize bottlenecks
-    
-    Use your tools:
-    - FileWriter: Create test files, test configurations, performance scripts
-    - CommandExecutor: Run test suites, performance tests, benchmarks
-    - GitTool: Manage test code and results
-    - FileReader: Review application code to create appropriate tests
-    
-    CRITICAL: All tests must pass before any deployment.""",
-    tools=[FileWriter, CommandExecutor, GitTool, FileReader],
-)
-
-# Create Agency with tool-enabled agents
-agency = Agency(
-    backend_agent, frontend_agent, device_agent, mobile_agent, qa_agent, testing_agent,
-    shared_instructions="""
-    SMS DRIP CAMPAIGN PLATFORM - PRODUCTION BUILD
-    
-    Mission: Build a complete, production-ready SMS platform with zero placeholder code.
-    
-    Architecture Requirements:
-    - Node.js/Express backend with TypeScript and PostgreSQL
-    - React frontend dashboard with responsive design
-    - WebUSB device connectivity for SMS hardware
-    - Mobile apps for Android/iOS with WebSocket sync
-    - Comprehensive testing and quality assurance
+class DelegateTask(BaseTool):
+    """Hand an independent subtask to another agent; it runs in the background while you keep working."""
+    agent_name: str = Field(..., description="Agent to delegate to: BackendDeveloper, FrontendDeveloper, "
+                                             "DeviceConnectionAgent, MobileAppAgent, QualityAssuranceAgent or TestingAgent")
+    task: str = Field(..., description="Complete, self-contained description of the subtask")
     
-    ABSOLUTE REQUIREMENTS:
-    1. NO TODO comments or placeholder functions
-    2. NO demo data or fake implementations
-    3. ALL code must be functional and production-ready
-    4. Use proper error handling and validation
-    5. Implement comprehensive logging and monitoring
-    6. Follow security best practices
-    
-    Work concurrently but coordinate through proper communication flows.
-    """
-)
+    def run(self):
+        try:
+            agent = build_agency().agent_map.get(self.agent_name)
+            if agent is None:
+                return f"Delegation error: unknown agent {self.agent_name}"
+            task_id = build_agency().registry.spawn(agent, self.task)
+            return f"Delegated to {self.agent_name} as task {task_id}; collect it with CollectDelegatedTasks"
+        except Exception as e:
+            return f"Delegation error: {str(e)}"
 
-def deploy_working_agency():
-    """Deploy agency with development tools and start building."""
-    
-    print("SMS PLATFORM AGENCY SWARM - DEVELOPMENT BUILD")
-    print("Agents equipped with file writing, command execution, and git tools")
-    print("=" * 70)
+# A run waiting on tool outputs expires after 10 minutes; collecting returns well before that
+# and reports the rest as still running, to be collected on a later call
+COLLECT_TIMEOUT_SECONDS = 8 * 60
+
+class CollectDelegatedTasks(BaseTool):
+    """Collect the results of tasks you delegated with DelegateTask."""
+    task_ids: List[str] = Field(..., description="Task ids returned by DelegateTask")
+    first_only: bool = Field(default=False, description="Return as soon as any one task finishes instead of waiting for all")
     
-    try:
-        print("Starting agency with build command...")
+    def run(self):
+        try:
+            registry = build_agency().registry
+            results = registry.gather_results(self.task_ids, strategy="wait_first" if self.first_only else "wait_all",
+                                              timeout=COLLECT_TIMEOUT_SECONDS)
+            still_running = [task_id for task_id in self.task_ids if task_id in registry.pending()]
+            if not results and not still_running:
+                return "No matching delegated tasks (already collected or unknown ids)"
+            sections = [
+                f"### {task_id} ({name})\n" + (f"ERROR: {result}" if isinstance(result, Exception) else str(result))
+                for task_id, (name, result) in results.items()
+            ]
+            if still_running:
+                sections.append(f"Still running: {', '.join(still_running)}")
+            return "\n\n".join(sections)
+        except Exception as e:
+            return f"Collection error: {str(e)}"
+
+@lru_cache(maxsize=None)
+def build_agency() -> Agency:
+    """Build the agents and the agency on first use; creating the agency syncs every assistant with the OpenAI API."""
+    get_openai_key()
+
+    # Create Development Agents with Tools
+    backend_agent = Agent(
+        name="BackendDeveloper",
+        description="Backend developer with file writing, command execution, and git capabilities",
+        instructions="""You are a backend developer specializing in Node.js/Express and PostgreSQL.
+        
+        Your primary tasks:
+        1. Create Node.js/Express backend with TypeScript
+        2. Set up PostgreSQL database with proper schemas
+        3. Implement SMS gateway integration
+        4. Create RESTful APIs for campaign management
+        5. Set up WebSocket server for real-time updates
+        
+        Use your tools:
+        - FileWriter: Create all backend code files (package.json, server files, routes, models, etc.)
+        - CommandExecutor: Run npm commands, database migrations, tests
+        - GitTool: Commit your work regularly
+        - FileReader: Check existing files before modifying
+        
+        CRITICAL: NO placeholder code. All implementations must be production-ready.""",
+        tools=[FileWriter, FileWriterBatch, CommandExecutor, GitTool, FileReader, DelegateTask, CollectDelegatedTasks],
+    )
+
+    frontend_agent = Agent(
+        name="FrontendDeveloper", 
+        description="Frontend developer with React expertise and development tools",
+        instructions="""You are a frontend developer specializing in React and responsive design.
+        
+        Your primary tasks:
+        1. Create React dashboard with TypeScript
+        2. Implement campaign management interface
+        3. Build contact management system
+        4. Create analytics and reporting views
+        5. Implement responsive design for all devices
+        
+        Use your tools:
+        - FileWriter: Create React components, CSS, HTML files
+        - CommandExecutor: Run npm commands, build processes, tests
+        - GitTool: Version control for frontend code
+        - FileReader: Review existing components before changes
+        
+        CRITICAL: NO demo data or placeholder components. Everything must be functional.""",
+        tools=[FileWriter, FileWriterBatch, CommandExecutor, GitTool, FileReader, DelegateTask, CollectDelegatedTasks],
+    )
+
+    device_agent = Agent(
+        name="DeviceConnectionAgent",
+        description="Device connectivity specialist with USB and mobile development tools",
+        instructions="""You are a device connectivity specialist focused on USB and mobile connections.
         
-        build_command = """
-        BUILD THE SMS DRIP CAMPAIGN PLATFORM NOW
+        Your primary tasks:
+        1. Implement WebUSB API for browser-based device connection
+        2. Create device detection and management system
+        3. Handle SMS sending through connected devices
+        4. Implement device failover and load balancing
+        5. Create device monitoring and status reporting
         
-        Each agent: Start building your assigned components immediately.
+        Use your tools:
+        - FileWriter: Create device connection libraries and interfaces
+        - CommandExecutor: Test device connections, run integration tests
+        - GitTool: Manage device-related code versions
+        - FileReader: Review device APIs and documentation
         
-        BackendDeveloper: 
-        - Create package.json with all dependencies
-        - Build Express server with TypeScript
-        - Set up PostgreSQL database schema
-        - Implement SMS gateway APIs
+        CRITICAL: All device connections must be secure and production-ready.""",
+        tools=[FileWriter, FileWriterBatch, CommandExecutor, GitTool, FileReader, DelegateTask, CollectDelegatedTasks],
+    )
+
+    mobile_agent = Agent(
+        name="MobileAppAgent",
+        description="Mobile app developer with Android/iOS development tools",
+        instructions="""You are a mobile app developer for Android and iOS platforms.
+        
+        Your primary tasks:
+        1. Create React Native bridge applications
+        2. Implement WebSocket connectivity for real-time sync
+        3. Build mobile SMS functionality
+        4. Create mobile campaign management interface
+        5. Handle push notifications and alerts
         
-        FrontendDeveloper:
-        - Initialize React app with TypeScript
-        - Create campaign management dashboard
-        - Build contact management interface
-        - Implement responsive design
+        Use your tools:
+        - FileWriter: Create mobile app code, config files, manifests
+        - CommandExecutor: Build apps, run mobile tests, deploy
+        - GitTool: Version control for mobile code
+        - FileReader: Review mobile frameworks and dependencies
         
-        DeviceConnectionAgent:
-        - Implement WebUSB API integration
-        - Create device detection system
-        - Build SMS sending functionality
+        CRITICAL: Mobile apps must be fully functional, no prototype code.""",
+        tools=[FileWriter, FileWriterBatch, CommandExecutor, GitTool, FileReader, DelegateTask, CollectDelegatedTasks],
+    )
+
+    qa_agent = Agent(
+        name="QualityAssuranceAgent",
+        description="Quality assurance specialist with testing and validation tools",
+        instructions="""You are a QA specialist responsible for ensuring production-ready code quality.
         
-        MobileAppAgent:
-        - Set up React Native projects
-        - Implement WebSocket connectivity
-        - Create mobile campaign interface
+        Your primary tasks:
+        1. Review all code for placeholder content and TODO items
+        2. Create comprehensive test suites for all components
+        3. Validate API endpoints and data flows
+        4. Perform integration testing across all services
+        5. BLOCK any non-functional or demo code from deployment
         
-        QualityAssuranceAgent:
-        - Review all code as it's created
-        - Block any placeholder implementations
-        - Ensure production readiness
+        Use your tools:
+        - FileReader: Examine all code files for quality issues
+        - FileWriter: Create test files, validation scripts, quality reports
+        - CommandExecutor: Run test suites, lint checks, quality scans
+        - GitTool: Enforce quality gates in version control
         
-        TestingAgent:
-        - Create test suites for all components
-        - Set up automated testing pipeline
+        CRITICAL: Zero tolerance for placeholder code. Everything must be production-ready.""",
+        tools=[FileWriter, FileWriterBatch, CommandExecutor, GitTool, FileReader, DelegateTask, CollectDelegatedTasks],
+    )
+
+    testing_agent = Agent(
+        name="TestingAgent",
+        description="Testing specialist with automated testing and performance tools", 
+        instructions="""You are a testing specialist focused on automated testing and performance.
         
-        START BUILDING NOW. Use your FileWriter, CommandExecutor, and GitTool to create actual working code.
+        Your primary tasks:
+        1. Create unit tests for all backend and frontend code
+        2. Implement integration tests for API endpoints
+        3. Build end-to-end tests for user workflows
+        4. Set up load testing for high-volume SMS campaigns
+        5. Monitor performance and optimize bottlenecks
+        
+        Use your tools:
+        - FileWriter: Create test files, test configurations, performance scripts
+        - CommandExecutor: Run test suites, performance tests, benchmarks
+        - GitTool: Manage test code and results
+        - FileReader: Review application code to create appropriate tests
+        
+        CRITICAL: All tests must pass before any deployment.""",
+        tools=[FileWriter, FileWriterBatch, CommandExecutor, GitTool, FileReader, DelegateTask, CollectDelegatedTasks],
+    )
+
+    agents = [backend_agent, frontend_agent, device_agent, mobile_agent, qa_agent, testing_agent]
+
+    # Create Agency with tool-enabled agents
+    agency = Agency(
+        agents,
+        shared_instructions="""
+        SMS DRIP CAMPAIGN PLATFORM - PRODUCTION BUILD
+        
+        Mission: Build a complete, production-ready SMS platform with zero placeholder code.
+        
+        Architecture Requirements:
+        - Node.js/Express backend with TypeScript and PostgreSQL
+        - React frontend dashboard with responsive design
+        - WebUSB device connectivity for SMS hardware
+        - Mobile apps for Android/iOS with WebSocket sync
+        - Comprehensive testing and quality assurance
+        
+        ABSOLUTE REQUIREMENTS:
+        1. NO TODO comments or placeholder functions
+        2. NO demo data or fake implementations
+        3. ALL code must be functional and production-ready
+        4. Use proper error handling and validation
+        5. Implement comprehensive logging and monitoring
+        6. Follow security best practices
+        
+        Work concurrently but coordinate through proper communication flows.
+        Hand independent subtasks to the responsible agent with DelegateTask and
+        collect them with CollectDelegatedTasks.
         """
+    )
+    # Agent by name, for routing work without scanning the agent list
+    agency.agent_map = {agent.name: agent for agent in agents}
+
+    # Subtasks agents delegate to each other; delegated agents may delegate once more
+    agency.registry = SubagentRegistry(agency)
+    return agency
+
+# Build assignments, one section per agent; each agent gets its own section directly
+BUILD_COMMAND = """
+BUILD THE SMS DRIP CAMPAIGN PLATFORM NOW
+
+Each agent: Start building your assigned components immediately.
+
+BackendDeveloper: 
+- Create package.json with all dependencies
+- Build Express server with TypeScript
+- Set up PostgreSQL database schema
+- Implement SMS gateway APIs
+
+FrontendDeveloper:
+- Initialize React app with TypeScript
+- Create campaign management dashboard
+- Build contact management interface
+- Implement responsive design
+
+DeviceConnectionAgent:
+- Implement WebUSB API integration
+- Create device detection system
+- Build SMS sending functionality
+
+MobileAppAgent:
+- Set up React Native projects
+- Implement WebSocket connectivity
+- Create mobile campaign interface
+
+QualityAssuranceAgent:
+- Review all code as it's created
+- Block any placeholder implementations
+- Ensure production readiness
+
+TestingAgent:
+- Create test suites for all components
+- Set up automated testing pipeline
+
+START BUILDING NOW. Use your FileWriter, CommandExecutor, and GitTool to create actual working code.
+"""
+BUILD_SECTION_RE = re.compile(r'^(\w+):[ \t]*\n((?:- .*\n)+)', re.M)
+BUILD_ASSIGNMENT = """BUILD THE SMS DRIP CAMPAIGN PLATFORM NOW
+
+{name}: Start building your assigned components immediately.
+{directives}
+
+START BUILDING NOW. Use your FileWriter, CommandExecutor, and GitTool to create actual working code.
+"""
+# Each agent's full assignment, formatted once at import rather than on every deploy
+BUILD_ASSIGNMENTS = {
+    name: BUILD_ASSIGNMENT.format(name=name, directives=directives.strip())
+    for name, directives in BUILD_SECTION_RE.findall(BUILD_COMMAND)
+}
+# Build turns are journaled here: an interrupted build resumes, and 'jobs' reads progress from it
+BUILD_JOURNAL_PATH = ".sms_build_jobs.json"
+# Asked of each agent separately; agents check their own files since turns do not share a thread
+STATUS_REQUEST = ("Report your current build status: check the files and commits you have made "
+                  "(FileReader, GitTool status/log) and list what is done, in progress and blocked.")
+
+
+def build_turns(agent_map):
+    """(agent, assignment) for every agent with a section in BUILD_COMMAND."""
+    return [(agent_map[name], assignment) for name, assignment in BUILD_ASSIGNMENTS.items() if name in agent_map]
+
+
+async def deploy_working_agency():
+    """Deploy agency with development tools and start building."""
+    
+    print("SMS PLATFORM AGENCY SWARM - DEVELOPMENT BUILD")
+    print("Agents equipped with file writing, command execution, and git tools")
+    print("=" * 70)
+    
+    try:
+        print("Starting agency with build command...")
+        agency = build_agency()
         
-        response = agency.get_completion(build_command)
+        # Every agent starts on its own section at once instead of one completion driving them in turn
+        turns = build_turns(agency.agent_map)
+        results = await run_journaled_turns(agency, turns, BuildJournal(BUILD_JOURNAL_PATH))
+        response = format_turn_results(turns, results)
         
         print("\n" + "=" * 70)
         print("AGENCY BUILD RESPONSE:")
@@ -308,36 +434,49 @@ def deploy_working_agency():
         traceback.print_exc()
         return None, str(e)
 
-if __name__ == "__main__":
+
+async def collect_status(agency):
+    """Every agent's status report, gathered concurrently: as slow as the slowest agent, not the sum."""
+    turns = [(agent, STATUS_REQUEST) for agent in agency.agent_map.values()]
+    results = await gather_agent_turns(agency, turns)
+    return format_turn_results(turns, results)
+
+
+async def main():
     print("DEPLOYING SMS PLATFORM AGENCY WITH DEVELOPMENT TOOLS")
     print()
     
     # Deploy and start building
-    agency_instance, response = deploy_working_agency()
+    agency_instance, response = await deploy_working_agency()
     
     if agency_instance:
         print("\nAgency deployed! Agents are building the SMS platform...")
         
         # Interactive command mode
-        try:
-            print("\nAgency ready for additional commands...")
-            print("Type 'status' to check progress, 'exit' to stop")
-            
-            while True:
-                user_input = input("\nCommand: ").strip()
-                
-                if user_input.lower() == 'exit':
-                    break
-                elif user_input.lower() == 'status':
-                    status_response = agency_instance.get_completion("Report current build status and progress for all agents")
-                    print(f"\nBuild Status:\n{status_response}")
-                elif user_input:
-                    print("\nProcessing...")
-                    response = agency_instance.get_completion(user_input)
-                    print(f"\nResponse:\n{response}")
-                    
-        except KeyboardInterrupt:
-            print("\n\nAgency stopped")
+        print("\nAgency ready for additional commands...")
+        print("Type 'status' to check progress, 'jobs' for build job states, 'exit' to stop")
+        
+        def handle_command(user_input):
+            if user_input.lower() == 'jobs':
+                print(f"\nBuild Jobs:\n{BuildJournal(BUILD_JOURNAL_PATH).summary()}")
+            elif user_input.lower() == 'status':
+                # Runs on command_loop's worker thread, which has no event loop of its own
+                status_response = asyncio.run(collect_status(agency_instance))
+                print(f"\nBuild Status:\n{status_response}")
+            else:
+                # Tokens print as they arrive instead of after the whole reply
+                print("\nResponse:")
+                stream_completion(agency_instance, user_input)
+        
+        # Completions run off the event loop; the next command can be typed while one is in flight
+        await command_loop("\nCommand: ", handle_command)
             
     else:
-        print(f"\nDeployment failed: {response}")
\ No newline at end of file
+        print(f"\nDeployment failed: {response}")
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        print("\n\nAgency stopped")
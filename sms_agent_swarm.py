@@ -10,12 +10,29 @@ concurrently using Task Master integration for tracking and validation.
 """
 
 import os
-from typing import List, Dict, Any
+import re
+import sys
+import mmap
+import queue
+import atexit
+import asyncio
+import logging
+from logging.handlers import QueueHandler, QueueListener
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import List, Dict, Any, ClassVar
 from agency_swarm import Agency, Agent, BaseTool, set_openai_key
 from pydantic import Field
-import subprocess
 import json
 from dotenv import load_dotenv
+from sms_tools import run_command, lines_at, scan_executor, CachedSendMessage, HandOff
+from task_master_server import run_task_master
+from agent_turns import (run_turn_graph, format_turn_results, batched_delegate, llm_slot, close_llm_slots,
+                         AGENT_CONCURRENCY, AGENT_PRIORITY)
+from completion_stream import command_loop, stream_completion, write_lines
+from completion_cache import CachedAgency, RepeatQueryCache
+from openai_client import warm_openai_client, close_openai_clients
+from latency import METRICS, hop, serve_metrics
 
 # Load environment variables
 load_dotenv()
@@ -30,23 +47,49 @@ else:
     OPENAI_API_KEY = "your_openai_api_key_here"
     set_openai_key(OPENAI_API_KEY)
 
+# Agents capture the client when constructed: install the pooled one before any Agent(...)
+warm_openai_client(OPENAI_API_KEY)
+
+# Progress lines are queued and written by a listener thread, so a slow terminal or log
+# collector never stalls the orchestration loop; stopping the listener at exit drains the queue
+logger = logging.getLogger("agency")
+logger.setLevel(logging.INFO)
+logger.propagate = False
+_log_queue = queue.SimpleQueue()
+logger.addHandler(QueueHandler(_log_queue))
+_log_listener = QueueListener(_log_queue, logging.StreamHandler(sys.stdout))
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
 # =============================================================================
 # TASK MASTER INTEGRATION TOOLS
 # =============================================================================
 
+TASK_MASTER_DIR = "C:\\Users\\Stuart\\Desktop\\Projects\\sms"
+TASKS_JSON = os.path.join(TASK_MASTER_DIR, ".taskmaster", "tasks", "tasks.json")
+
+
+def _tasks_version():
+    """(mtime_ns, size) of tasks.json, or None when it cannot be stat'ed."""
+    try:
+        stat = os.stat(TASKS_JSON)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _run_task_master_cli(command):
+    return run_command(command, cwd=TASK_MASTER_DIR, prefix="task-master")
+
+
 class TaskMasterTool(BaseTool):
     """Base tool for Task Master integration"""
     
     def run_taskmaster_command(self, command: str) -> str:
         """Execute Task Master command and return output"""
         try:
-            result = subprocess.run(
-                f"task-master {command}", 
-                shell=True, 
-                capture_output=True, 
-                text=True,
-                cwd="C:\\Users\\Stuart\\Desktop\\Projects\\sms"
-            )
+            # Status updates go to one long-lived Task Master process instead of a shell + node per call
+            result = run_task_master(command, TASK_MASTER_DIR, _run_task_master_cli)
             return f"STDOUT:\n{result.stdout}\n\nSTDERR:\n{result.stderr}"
         except Exception as e:
             return f"Error executing command: {str(e)}"
@@ -80,8 +123,9 @@ class ValidateNoPlaceholders(BaseTool):
     """Critical tool to validate code contains no placeholders or demo data"""
     
     file_path: str = Field(..., description="Path to file to validate")
+    fail_fast: bool = Field(default=False, description="Only pass/fail: stop at the first violation instead of listing them all")
     
-    FORBIDDEN_PATTERNS = [
+    FORBIDDEN_PATTERNS: ClassVar[List[str]] = [
         "TODO", "FIXME", "PLACEHOLDER", "CHANGEME", "REPLACE_ME",
         "user@example.com", "test@test.com", "example.com",
         "123-456-7890", "555-1234", "(555)", "123-4567",
@@ -92,6 +136,14 @@ class ValidateNoPlaceholders(BaseTool):
         "DEMO_DATA", "SAMPLE_DATA", "TEST_DATA",
         "password123", "secret123", "admin", "password",
     ]
+    # Lowercased bytes: the file is scanned undecoded
+    PATTERNS_LOWER: ClassVar[tuple] = tuple(pattern.lower().encode() for pattern in FORBIDDEN_PATTERNS)
+    # Every pattern in one case-insensitive alternation (longest first), run once over the file;
+    # the patterns are ASCII, so bytes IGNORECASE matches what str.lower() did
+    FORBIDDEN_RE: ClassVar[re.Pattern] = re.compile(
+        b'|'.join(re.escape(pattern) for pattern in sorted(PATTERNS_LOWER, key=len, reverse=True)),
+        re.IGNORECASE,
+    )
     
     def run(self) -> str:
         """Validate file contains no placeholder code or demo data"""
@@ -99,17 +151,10 @@ class ValidateNoPlaceholders(BaseTool):
             if not os.path.exists(self.file_path):
                 return f"❌ VALIDATION FAILED: File {self.file_path} does not exist"
             
-            with open(self.file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-            
-            violations = []
-            for pattern in self.FORBIDDEN_PATTERNS:
-                if pattern.lower() in content.lower():
-                    lines = content.split('\n')
-                    for i, line in enumerate(lines, 1):
-                        if pattern.lower() in line.lower():
-                            violations.append(f"Line {i}: {line.strip()[:100]}")
+            violations = self.scan(self.file_path, self.fail_fast)
             
+            if violations and self.fail_fast:
+                return f"❌ VALIDATION FAILED: {self.file_path} contains placeholders, first at {violations[0]}"
             if violations:
                 return f"❌ VALIDATION FAILED: Found {len(violations)} placeholder violations in {self.file_path}:\n" + '\n'.join(violations[:10])
             
@@ -117,6 +162,70 @@ class ValidateNoPlaceholders(BaseTool):
             
         except Exception as e:
             return f"❌ VALIDATION ERROR: {str(e)}"
+    
+    @classmethod
+    def scan(cls, file_path: str, fail_fast: bool = False) -> List[str]:
+        """'Line N: ...' for every pattern hit in the file, grouped by pattern; only the first hit with fail_fast"""
+        if not os.path.getsize(file_path):
+            return []
+        
+        # Scanned in place from the page cache: no copy on the heap, no lowercased copies
+        with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            if fail_fast:
+                # Stops reading at the first hit; lines are only counted up to it
+                match = cls.FORBIDDEN_RE.search(data)
+                if not match:
+                    return []
+                (i, line), = lines_at(data, [match.start()]).items()
+                return [f"Line {i}: {line.decode('utf-8', 'ignore').strip()[:100]}"]
+            
+            # Lines holding any pattern, from match offsets; only those lines are checked per pattern
+            hits = [m.start() for m in cls.FORBIDDEN_RE.finditer(data)]
+            if not hits:
+                return []
+            lines = lines_at(data, hits)
+        
+        hit_lines = list(lines)
+        lower_lines = {i: line.lower() for i, line in lines.items()}
+        return [
+            f"Line {i}: {lines[i].decode('utf-8', 'ignore').strip()[:100]}"
+            for pattern in cls.PATTERNS_LOWER
+            for i in hit_lines
+            if pattern in lower_lines[i]
+        ]
+
+
+class ValidateNoPlaceholdersBatch(BaseTool):
+    """Validate many files at once for placeholder code or demo data"""
+    
+    file_paths: List[str] = Field(..., description="Paths of all files to validate")
+    fail_fast: bool = Field(default=False, description="Only pass/fail per file: report each file's first violation only")
+    
+    def run(self) -> str:
+        """Validate every file concurrently and report the ones that fail"""
+        if not self.file_paths:
+            return "❌ VALIDATION ERROR: no files given"
+        
+        # Files are scanned side by side on scan_executor's threads, overlapping their reads
+        with scan_executor(len(self.file_paths)) as executor:
+            results = list(executor.map(self._scan_one, self.file_paths,
+                                        [self.fail_fast] * len(self.file_paths)))
+        
+        failures = [(path, problems) for path, problems in results if problems]
+        if not failures:
+            return f"✅ VALIDATION PASSED: all {len(results)} files contain no placeholders"
+        
+        report = [f"{path}:\n" + '\n'.join(problems[:10]) for path, problems in failures]
+        return f"❌ VALIDATION FAILED: {len(failures)} of {len(results)} files have violations:\n" + '\n'.join(report)
+    
+    @staticmethod
+    def _scan_one(file_path, fail_fast=False):
+        try:
+            if not os.path.exists(file_path):
+                return file_path, ["File does not exist"]
+            return file_path, ValidateNoPlaceholders.scan(file_path, fail_fast)
+        except Exception as e:
+            return file_path, [f"VALIDATION ERROR: {str(e)}"]
 
 
 # =============================================================================
@@ -375,7 +484,7 @@ APPROVAL PROCESS:
 
 NEVER APPROVE INCOMPLETE WORK. Your role is to maintain production standards.
 """,
-    tools=[UpdateTaskStatus, UpdateSubtaskProgress, ValidateNoPlaceholders]
+    tools=[UpdateTaskStatus, UpdateSubtaskProgress, ValidateNoPlaceholders, ValidateNoPlaceholdersBatch]
 )
 
 # 7. TESTING AGENT - Performance and system testing
@@ -425,80 +534,141 @@ DELIVERABLES:
 
 Validate that the entire system meets the specified scale requirements.
 """,
-    tools=[UpdateTaskStatus, UpdateSubtaskProgress, ValidateNoPlaceholders]
+    tools=[UpdateTaskStatus, UpdateSubtaskProgress, ValidateNoPlaceholders, ValidateNoPlaceholdersBatch]
 )
 
+# Model per agent: code generation and planning stay on the flagship model, while the
+# short validation and test-coordination turns run on the faster, cheaper tier
+FLAGSHIP_MODEL = "gpt-4o-2024-08-06"
+FAST_MODEL = "gpt-4o-mini"
+MODEL_ROUTING = {
+    orchestrator_agent: FLAGSHIP_MODEL,
+    backend_agent: FLAGSHIP_MODEL,
+    frontend_agent: FLAGSHIP_MODEL,
+    mobile_agent: FLAGSHIP_MODEL,
+    device_agent: FLAGSHIP_MODEL,
+    qa_agent: FAST_MODEL,
+    testing_agent: FAST_MODEL,
+}
+for agent, model in MODEL_ROUTING.items():
+    agent.model = model
+
+# Output budget for the agents whose replies are routing, verdicts and status: generation
+# time grows with every token. The cap covers a whole run, tool-call arguments included,
+# so the implementers, whose code goes out through FileWriter, keep the agency's 8000.
+MAX_COMPLETION_TOKENS = {
+    orchestrator_agent: 1024,
+    qa_agent: 800,
+    testing_agent: 800,
+}
+REPLY_WORD_LIMITS = {
+    orchestrator_agent: 250,
+    qa_agent: 200,
+    testing_agent: 200,
+}
+for agent, max_tokens in MAX_COMPLETION_TOKENS.items():
+    agent.max_completion_tokens = max_tokens
+for agent, words in REPLY_WORD_LIMITS.items():
+    agent.instructions += f"\nBe concise: keep every reply under {words} words.\n"
+
+# Agent by name, for routing work without scanning the agent list
+AGENT_MAP = {agent.name: agent for agent in (
+    orchestrator_agent, backend_agent, frontend_agent, mobile_agent, device_agent, qa_agent, testing_agent
+)}
+
 # =============================================================================
 # AGENCY SWARM DEPLOYMENT
 # =============================================================================
 
+# What each agent can do for the others, and what it needs from them. A peer flow
+# exists only where a need meets an expertise: every flow adds a recipient to the
+# sender's SendMessage tool, which is part of every prompt it sends.
+AGENT_EXPERTISE = {
+    backend_agent: {"api", "database", "sms-gateway"},
+    frontend_agent: {"dashboard"},
+    mobile_agent: {"mobile-app"},
+    device_agent: {"device"},
+    qa_agent: {"review"},
+    testing_agent: {"tests", "performance"},
+}
+AGENT_NEEDS = {
+    # Implementers hand their own work to QA instead of QA being wired to all of them
+    backend_agent: {"review"},
+    frontend_agent: {"api", "review"},
+    mobile_agent: {"api", "device", "review"},
+    device_agent: {"api", "review"},
+    qa_agent: {"tests"},
+    testing_agent: set(),
+}
+
+
+def _expertise_flows():
+    """(from_agent, to_agent) edges: the orchestrator to everyone, peers only where a need meets an expertise."""
+    flows = [(orchestrator_agent, agent) for agent in AGENT_EXPERTISE]
+    for sender, needs in AGENT_NEEDS.items():
+        flows += [(sender, agent) for agent, expertise in AGENT_EXPERTISE.items()
+                  if agent is not sender and needs & expertise]
+    return tuple(flows)
+
+
+# Communication flows: (from_agent, to_agent), fixed at import
+COMMUNICATION_FLOWS = _expertise_flows()
+# Agent -> the agents it can message, for edge lookups without scanning the flows
+_NEIGHBORS = {
+    agent: frozenset(to_agent for from_agent, to_agent in COMMUNICATION_FLOWS if from_agent is agent)
+    for agent in AGENT_MAP.values()
+}
+# The orchestrator hands a user's request to the specialist it belongs to, who answers the
+# user directly instead of the orchestrator relaying the reply in a turn of its own
+ORCHESTRATOR_HANDOFF = HandOff.for_agent(orchestrator_agent, _NEIGHBORS[orchestrator_agent])
+orchestrator_agent.add_tool(ORCHESTRATOR_HANDOFF)
+
+# Backend and QA turns are the longest; cap them so they cannot take every LLM slot
+AGENT_CONCURRENCY.update({backend_agent.name: 4, qa_agent.name: 2})
+# While turns queue for slots, the orchestrator and backend get more of each round than the rest
+AGENT_PRIORITY.update({orchestrator_agent.name: 3, backend_agent.name: 2})
+
+
+# Prepended to every agent's instructions, so it opens every prompt the swarm sends. It
+# holds nothing that changes between runs: a byte-identical prefix is what lets OpenAI's
+# automatic prompt caching serve it from cache across agents, turns and restarts.
+SHARED_INSTRUCTIONS = """SMS Drip Campaign Platform agency. Goal: production-ready platform for 50+ connected devices
+and 10k+ recipients, with full campaign management.
+Rules:
+- No placeholder code, demo data or TODO comments; everything complete and tested.
+- QA can veto any deliverable; mark subtasks done in Task Master only after QA validation.
+- Update Task Master progress continuously and cite task IDs in every message.
+- Report blockers to OrchestratorAgent at once; settle dependencies and integration points end to end.
+Done means: all 15 tasks (83 subtasks) complete and fully integrated.
+"""
+
+
+@lru_cache(maxsize=None)
 def create_sms_platform_agency():
-    """Create and configure the SMS Platform Development Agency"""
+    """Create and configure the SMS Platform Development Agency
+    
+    Built once per process: creating an Agency syncs all seven assistants with
+    the OpenAI API. Across runs, agency-swarm's settings.json keeps the assistant
+    ids, so a restart retrieves the assistants instead of creating them again.
+    """
     
     # Create the agency with defined communication flows
     agency = Agency([
         orchestrator_agent,  # CEO-level coordinator
         
-        # Communication flows: [from_agent, to_agent]
-        [orchestrator_agent, backend_agent],      # Orchestrator -> Backend
-        [orchestrator_agent, frontend_agent],     # Orchestrator -> Frontend  
-        [orchestrator_agent, mobile_agent],       # Orchestrator -> Mobile
-        [orchestrator_agent, device_agent],       # Orchestrator -> Device
-        [orchestrator_agent, qa_agent],           # Orchestrator -> QA
-        [orchestrator_agent, testing_agent],      # Orchestrator -> Testing
-        
-        # Cross-agent collaboration
-        [backend_agent, frontend_agent],          # Backend <-> Frontend
-        [backend_agent, mobile_agent],            # Backend <-> Mobile  
-        [backend_agent, device_agent],            # Backend <-> Device
-        [mobile_agent, device_agent],             # Mobile <-> Device
-        
-        # QA validates everyone's work
-        [qa_agent, backend_agent],                # QA -> Backend
-        [qa_agent, frontend_agent],               # QA -> Frontend
-        [qa_agent, mobile_agent],                 # QA -> Mobile
-        [qa_agent, device_agent],                 # QA -> Device
-        [qa_agent, testing_agent],                # QA -> Testing
-        
-        # Testing collaborates with all
-        [testing_agent, backend_agent],           # Testing <-> Backend
-        [testing_agent, frontend_agent],          # Testing <-> Frontend
-        [testing_agent, mobile_agent],            # Testing <-> Mobile
-        [testing_agent, device_agent],            # Testing <-> Device
+        # The agency chart only accepts flows as lists
+        *(list(flow) for flow in COMMUNICATION_FLOWS),
     ],
-    shared_instructions="""
-    🎯 **SMS DRIP CAMPAIGN PLATFORM DEVELOPMENT AGENCY**
-    
-    **PROJECT MISSION:**
-    Build a production-ready SMS Drip Campaign Platform that supports multiple connected devices,
-    advanced campaign management, and scales to 10k+ recipients with 50+ active devices.
-    
-    **ZERO TOLERANCE POLICY:**
-    🚫 NO placeholder code, demo data, or TODO comments in production
-    ✅ ALL implementations must be functionally complete and tested
-    🔍 QA Agent has VETO power over all deliverables
-    
-    **TASK MASTER INTEGRATION:**
-    - All agents must update Task Master progress continuously
-    - Use task IDs for all communication and progress tracking
-    - Mark subtasks complete only after QA validation
-    
-    **COMMUNICATION PROTOCOLS:**
-    - Include specific Task Master IDs in all messages
-    - Report blockers immediately to Orchestrator
-    - Collaborate on dependencies proactively
-    - Validate integration points end-to-end
-    
-    **SUCCESS METRICS:**
-    - 15 main tasks completed (83 subtasks total)
-    - 100% functional code (0% placeholders)
-    - Production-ready system deployment
-    - Full integration across all components
-    """,
+    shared_instructions=SHARED_INSTRUCTIONS,
+    # Repeat questions to the same agent within one turn are answered once
+    send_message_tool_class=CachedSendMessage,
     max_prompt_tokens=25000,
     max_completion_tokens=8000
     )
     
+    agency.agent_map = AGENT_MAP
+    ORCHESTRATOR_HANDOFF._agents_and_threads = agency.agents_and_threads
+
     return agency
 
 
@@ -506,101 +676,197 @@ def create_sms_platform_agency():
 # DEPLOYMENT EXECUTION
 # =============================================================================
 
-def deploy_sms_agent_swarm():
+# Project kickoff; every agent with a section gets its own part of it
+# The kickoff plan is static: it goes straight to each agent instead of costing an
+# orchestrator turn to re-derive it. The orchestrator only routes what the plan leaves out.
+INITIAL_ASSIGNMENTS: Dict[Agent, List[str]] = {
+    backend_agent: [
+        "Task 1.1: backend framework setup (Node.js/Express + TypeScript)",
+        "Task 1.3: database schema design (PostgreSQL)",
+        "Task 1.4: API endpoint architecture",
+    ],
+    frontend_agent: [
+        "Prepare Task 2.4: dashboard layout (after the backend foundation)",
+        "Choose the component library and design system",
+    ],
+    qa_agent: [
+        "Set up the validation framework and code review process",
+        "Prepare to check every deliverable for placeholders",
+    ],
+}
+# Fixed wording first and the agent's own directives last, so the shared part stays a cacheable prefix;
+# the no-placeholder rule is already in the shared instructions
+KICKOFF_ASSIGNMENT = """SMS platform kickoff. Your assignment ({name}):
+{directives}
+"""
+ORCHESTRATOR_KICKOFF = """SMS platform kickoff. Task Master holds 15 tasks (83 subtasks); Task 1 (Project Architecture) is in progress.
+Already assigned directly:
+{assigned}
+Check Task Master status with: task-master list
+Route any ready task not assigned above to the right agent.
+"""
+KICKOFF_ASSIGNMENTS = {
+    agent.name: KICKOFF_ASSIGNMENT.format(name=agent.name, directives="\n".join(f"- {d}" for d in directives))
+    for agent, directives in INITIAL_ASSIGNMENTS.items()
+}
+KICKOFF_ASSIGNMENTS[orchestrator_agent.name] = ORCHESTRATOR_KICKOFF.format(assigned="\n".join(
+    f"- {agent.name}: {directive}" for agent, directives in INITIAL_ASSIGNMENTS.items() for directive in directives
+))
+# Preparation-only assignments need no tools, so they are answered together, one request
+# per model tier, with the shared instructions sent once; the rest are full agent turns
+KICKOFF_BATCHED = {frontend_agent, qa_agent}
+# A restart within the hour replays the tool-free kickoff replies instead of asking again.
+# Turns with tools (files, task status) are replayed only under AUDIT_CACHE=1: after a
+# crash, replaying "done" would skip work that has to be redone.
+KICKOFF_CACHE_TTL = 3600
+
+# Interactive shortcuts; only these read-only reports are answered from memory
+COMMAND_ALIASES = {
+    'status': "Get current task status from Task Master and report progress on all agents",
+    'progress': "Show detailed progress on each task and identify any blockers",
+}
+
+# Agent work in flight, cancelled on shutdown instead of being left for interpreter teardown
+PENDING = set()
+
+
+def _track(awaitable):
+    task = asyncio.ensure_future(awaitable)
+    PENDING.add(task)
+    task.add_done_callback(PENDING.discard)
+    return task
+
+
+async def shutdown_agent_work():
+    """Stop queued and in-flight agent work so exit does not wait on it"""
+    # Turns still queued for a slot fail instead of starting
+    close_llm_slots()
+    for task in PENDING:
+        task.cancel()
+    await asyncio.gather(*PENDING, return_exceptions=True)
+    # Running turns fail at their next API request instead of polling to the end
+    close_openai_clients()
+
+
+async def deploy_sms_agent_swarm():
     """Deploy the SMS Platform Agency Swarm"""
     
-    print("🚀 DEPLOYING SMS PLATFORM AGENCY SWARM")
-    print("=" * 60)
+    logger.info("🚀 DEPLOYING SMS PLATFORM AGENCY SWARM\n%s", "=" * 60)
     
     try:
         # Create the agency
         agency = create_sms_platform_agency()
-        print("✅ Agency created successfully")
-        
-        # Initialize the conversation with project kickoff
-        kickoff_message = """
-        🎯 **SMS PLATFORM DEVELOPMENT KICKOFF**
-        
-        Welcome to the SMS Drip Campaign Platform development team!
-        
-        **CURRENT STATUS:**
-        - Task Master has parsed the PRD and generated 15 main tasks (83 subtasks)
-        - Task 1 (Project Architecture) is IN-PROGRESS and ready for implementation
-        - All dependencies are mapped and ready for parallel execution
-        
-        **IMMEDIATE ACTIONS REQUIRED:**
+        logger.info("✅ Agency created successfully")
         
-        **OrchestratorAgent:** 
-        - Check Task Master status with: task-master list
-        - Assign Task 1 subtasks to BackendArchitectAgent
-        - Coordinate parallel work on foundational tasks
+        logger.info("🚀 Starting agency with kickoff message...")
         
-        **BackendArchitectAgent:**
-        - Begin Task 1.1: Backend Framework Setup (Node.js/Express + TypeScript)
-        - Start Task 1.3: Database Schema Design (PostgreSQL)
-        - Initialize Task 1.4: API Endpoint Architecture
+        # Every kickoff turn is independent: the planned agents and the orchestrator start side by side
+        turns = {name: (AGENT_MAP[name], assignment) for name, assignment in KICKOFF_ASSIGNMENTS.items()}
+        turn_cache = CachedAgency(agency, "sms_agent_swarm_kickoff", ttl=KICKOFF_CACHE_TTL)
+        batch_cache = CachedAgency(agency, "sms_agent_swarm_kickoff", enabled=True, ttl=KICKOFF_CACHE_TTL)
         
-        **FrontendDeveloperAgent:**
-        - Prepare for Task 2.4: Dashboard Layout (pending backend foundation)
-        - Research component library and design system
+        def timed_turn(agent, message):
+            with hop("user", agent.name):
+                return turn_cache.run_agent_turn(agent, message)
         
-        **QualityAssuranceAgent:**
-        - Set up validation framework and code review processes
-        - Prepare to validate all deliverables against placeholder criteria
+        def delegate_tier(model, assignments):
+            try:
+                with hop("user", f"batched_delegate[{model}]"):
+                    return batched_delegate(assignments, model, SHARED_INSTRUCTIONS)
+            except Exception as e:
+                logger.warning("⚠️ Batched kickoff on %s failed, sending those assignments one by one: %s", model, e)
+                return {}
         
-        **CRITICAL REMINDER:** 
-        🚫 ZERO PLACEHOLDER CODE TOLERANCE
-        ✅ All implementations must be production-ready
-        🔍 QA Agent validates everything before task completion
+        def delegate(assignments):
+            # One batch per MODEL_ROUTING tier, so each agent is still answered by its own model
+            tiers = {}
+            for agent, message in assignments.items():
+                tiers.setdefault(MODEL_ROUTING[agent], {})[agent] = message
+            replies = {}
+            with ThreadPoolExecutor(max_workers=len(tiers) or 1) as executor:
+                for tier_replies in executor.map(delegate_tier, tiers, tiers.values()):
+                    replies.update(tier_replies)
+            return replies
         
-        Let's build the real thing - no shortcuts, no placeholders! 🔥
-        """
+        def run_batched():
+            batch = {agent: message for agent, message in turns.values() if agent in KICKOFF_BATCHED}
+            replies = batch_cache.run_batched_turns(batch, delegate)
+            # Agents the batched reply left out get turns of their own
+            for agent, message in batch.items():
+                if agent.name not in replies:
+                    try:
+                        replies[agent.name] = timed_turn(agent, message)
+                    except Exception as e:
+                        replies[agent.name] = e
+            return replies
         
-        print("🚀 Starting agency with kickoff message...")
+        solo = {name: turn for name, turn in turns.items() if turn[0] not in KICKOFF_BATCHED}
+        results, batched = await asyncio.gather(
+            _track(run_turn_graph(agency, solo, {}, run_turn=timed_turn)),
+            _track(asyncio.to_thread(run_batched)),
+        )
+        results.update(batched)
+        response = format_turn_results(list(turns.values()), [results[name] for name in turns])
         
-        # Start the agency  
-        response = agency.get_completion(kickoff_message)
-        
-        print("\n" + "=" * 60)
-        print("🎯 AGENCY RESPONSE:")
-        print("=" * 60)
-        print(response)
-        print("=" * 60)
+        logger.info("\n%s\n🎯 AGENCY RESPONSE:\n%s\n%s\n%s", "=" * 60, "=" * 60, response, "=" * 60)
         
         return agency, response
         
     except Exception as e:
-        print(f"❌ Error deploying agency: {str(e)}")
+        logger.error("❌ Error deploying agency: %s", e)
         return None, str(e)
 
 
-if __name__ == "__main__":
-    print("🚀 SMS PLATFORM AGENCY SWARM DEPLOYMENT")
-    print("Building the SMS Drip Campaign Platform with specialized AI agents")
-    print("ZERO PLACEHOLDER TOLERANCE - Production ready code only!")
-    print()
-    
-    agency, response = deploy_sms_agent_swarm()
-    
-    if agency:
-        print("\n🎉 Agency Swarm successfully deployed and working!")
-        print("The agents are now collaborating to build the SMS platform...")
+async def main():
+    try:
+        logger.info("🚀 SMS PLATFORM AGENCY SWARM DEPLOYMENT\n"
+                    "Building the SMS Drip Campaign Platform with specialized AI agents\n"
+                    "ZERO PLACEHOLDER TOLERANCE - Production ready code only!\n")
         
-        # Keep the agency running for continued development
-        try:
-            print("\n📞 Agency is ready for continued interaction...")
-            print("Type 'exit' to stop the agency")
+        # Per-hop latency for Prometheus; the same numbers are printed on exit
+        serve_metrics()
+        
+        agency, response = await deploy_sms_agent_swarm()
+        
+        if agency:
+            logger.info("\n🎉 Agency Swarm successfully deployed and working!\n"
+                        "The agents are now collaborating to build the SMS platform...")
             
-            while True:
-                user_input = input("\n💬 Your message to the agency: ")
-                if user_input.lower() == 'exit':
-                    break
-                    
-                response = agency.get_completion(user_input)
-                print(f"\n🤖 Agency Response:\n{response}")
-                
-        except KeyboardInterrupt:
-            print("\n👋 Agency swarm stopped by user")
+            # Keep the agency running for continued development
+            logger.info("\n📞 Agency is ready for continued interaction...\n"
+                        "Type 'status' or 'progress' for a report, 'exit' to stop the agency")
+            
+            # Repeated status/progress reports are answered from memory while tasks.json is unchanged;
+            # free-form input always reaches the agency, since an instruction typed twice must run twice
+            session = RepeatQueryCache(agency, _tasks_version, COMMAND_ALIASES.values())
             
-    else:
-        print(f"\n❌ Failed to deploy agency: {response}")
\ No newline at end of file
+            def handle_message(user_input):
+                user_input = COMMAND_ALIASES.get(user_input.lower(), user_input)
+                # Tokens print as they arrive instead of after the whole reply. The header is
+                # written directly, like the tokens: through the log queue it could land after them
+                write_lines("\n🤖 Agency Response:")
+                # Queued fairly with any turns still running instead of bypassing the limit
+                try:
+                    with llm_slot(agency.ceo.name), hop("user", agency.ceo.name):
+                        stream_completion(session, user_input)
+                finally:
+                    # A handoff lasts for one message; the next one starts with the orchestrator again
+                    agency.main_thread.recipient_agent = agency.ceo
+            
+            # Completions run off the event loop; the next message can be typed while one is in flight
+            await command_loop("\n💬 Your message to the agency: ", handle_message)
+                
+        else:
+            logger.error("\n❌ Failed to deploy agency: %s", response)
+    finally:
+        # Also on Ctrl-C, which cancels main: stop the agents' work before asyncio.run waits on it
+        await shutdown_agent_work()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        logger.info("\n👋 Agency swarm stopped by user")
+    finally:
+        logger.info("\n⏱️ Agent hop latency:\n%s", METRICS.report())
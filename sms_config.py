@@ -0,0 +1,20 @@
+#!/usr/bin/env python3
+"""
+SMS Swarm Configuration
+=======================
+
+Single place the swarms load their configuration from. The .env file is
+parsed once per process, on first use, and never overrides variables
+already set by the shell.
+"""
+
+import os
+from functools import lru_cache
+from dotenv import load_dotenv
+
+
+@lru_cache(maxsize=None)
+def get_openai_key():
+    """OPENAI_API_KEY from the environment or .env; agency-swarm reads it from os.environ."""
+    load_dotenv()
+    return os.getenv("OPENAI_API_KEY")
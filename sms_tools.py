@@ -0,0 +1,667 @@
+#!/usr/bin/env python3
+"""
+Shared SMS Swarm Tool Helpers
+=============================
+
+Development tools (FileWriter, FileReader, CommandExecutor, CodeValidator,
+RepoValidator, ApiRequest) shared by the SMS agency swarms, and the helpers behind them. Defining the
+tools once means one class and one OpenAI schema per tool per process.
+"""
+
+import io
+import os
+import mmap
+import copy
+import re
+import json
+import time
+import atexit
+import asyncio
+import threading
+import itertools
+import shlex
+import shutil
+import inspect
+import subprocess
+import httpx
+from collections import deque
+from enum import Enum
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from typing import List, ClassVar
+from agency_swarm.tools import BaseTool
+from agency_swarm.tools.BaseTool import classproperty
+from agency_swarm.tools.send_message import SendMessage, SendMessageSwarm
+from pydantic import Field
+from agent_turns import request_cache
+from latency import hop, add_tokens, run_tokens
+
+IS_WINDOWS = os.name == 'nt'
+
+# Anything a plain argv cannot express: pipes, chaining, redirects, expansion, globs
+SHELL_SYNTAX_RE = re.compile(r'[|&;<>()$`*?\n%]' if IS_WINDOWS else r'[|&;<>()$`*?\n~]')
+
+
+def _plain_argv(command_line):
+    """argv with a resolved executable, or None when the line needs a shell."""
+    if SHELL_SYNTAX_RE.search(command_line):
+        return None
+    try:
+        argv = shlex.split(command_line, posix=not IS_WINDOWS)
+    except ValueError:
+        return None
+    if not argv:
+        return None
+
+    # Shell builtins (cd, echo, dir) and Windows .cmd/.bat shims still need the shell
+    executable = shutil.which(argv[0].strip('"'))
+    if not executable or (IS_WINDOWS and not executable.lower().endswith('.exe')):
+        return None
+    argv[0] = executable
+    return argv
+
+
+# Commands running at once, across every thread and event loop; parallel agents
+# issuing npm installs would otherwise all compete for the same cores
+MAX_SUBPROCESSES = os.cpu_count() or 4
+_SUBPROCESS_SLOTS = threading.BoundedSemaphore(MAX_SUBPROCESSES)
+
+# Full output of logged commands; the tool result only carries the tail
+COMMAND_LOG_DIR = os.path.abspath(".sms_command_logs")
+OUTPUT_TAIL_LINES = 200
+_LOG_IDS = itertools.count(1)
+
+
+def new_command_log() -> str:
+    """Path for a fresh command log file."""
+    os.makedirs(COMMAND_LOG_DIR, exist_ok=True)
+    return os.path.join(COMMAND_LOG_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{next(_LOG_IDS)}.log")
+
+
+class _OutputTail:
+    """Last lines of a command's output; everything fed in also goes to the log file."""
+
+    def __init__(self, log_file, max_lines: int = OUTPUT_TAIL_LINES):
+        self.log_file = log_file
+        self.lines = deque(maxlen=max_lines)
+        self.partial = ""
+
+    def feed(self, text: str):
+        self.log_file.write(text)
+        self.log_file.flush()
+        *complete, partial = (self.partial + text).split("\n")
+        self.lines.extend(line + "\n" for line in complete)
+        # Progress bars redraw with \r and never end a line
+        self.partial = partial[-4096:]
+
+    def text(self) -> str:
+        return "".join(self.lines) + self.partial
+
+
+def _run_logged(args, cwd, log_path, **options):
+    with open(log_path, "a", encoding="utf-8") as log_file:
+        tail = _OutputTail(log_file)
+        proc = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+                                errors="replace", bufsize=1, cwd=cwd, **options)
+        with proc:
+            for line in proc.stdout:
+                tail.feed(line)
+    result = subprocess.CompletedProcess(args, proc.returncode, tail.text(), "")
+    result.log_path = log_path
+    return result
+
+
+def run_command(command: str, cwd: str = ".", prefix: str = "", log_path: str = None):
+    """Run a command line, skipping the intermediate shell whenever it is a plain argv.
+
+    With log_path, output (stderr included) streams into that file as it is
+    produced and only its last OUTPUT_TAIL_LINES lines are kept in memory.
+    """
+    command_line = f"{prefix} {command}" if prefix else command
+    argv = _plain_argv(command_line)
+    if argv is None:
+        args, options = command_line, {"shell": True}
+    elif IS_WINDOWS:
+        # CreateProcess parses the command line itself; non-posix shlex tokens keep their quotes
+        args, options = command_line, {"executable": argv[0], "shell": False, "close_fds": False}
+    else:
+        # close_fds=False avoids scanning the fd table on every spawn
+        args, options = argv, {"shell": False, "close_fds": False}
+
+    with _SUBPROCESS_SLOTS:
+        if log_path:
+            return _run_logged(args, cwd, log_path, **options)
+        return subprocess.run(args, capture_output=True, text=True, cwd=cwd, **options)
+
+
+def run_command_sequence(commands, cwd: str = ".", prefix: str = "", log_path: str = None):
+    """Run command lines in order, stopping at the first failure.
+
+    When every step is a plain argv each one is spawned directly; otherwise
+    the steps run as one && chain in a single shell, so `cd` and variables
+    still carry over from one step to the next. log_path works as in run_command.
+    """
+    command_lines = [f"{prefix} {command}" if prefix else command for command in commands]
+    if not all(_plain_argv(command_line) for command_line in command_lines):
+        return run_command(" && ".join(command_lines), cwd=cwd, log_path=log_path)
+
+    stdout = []
+    for command_line in command_lines:
+        result = run_command(command_line, cwd=cwd, log_path=log_path)
+        stdout.append(result.stdout)
+        if result.returncode != 0:
+            break
+    stdout = "".join(stdout)
+    if log_path:
+        stdout = "".join(stdout.splitlines(keepends=True)[-OUTPUT_TAIL_LINES:])
+    sequence = subprocess.CompletedProcess(command_lines, result.returncode, stdout, result.stderr)
+    sequence.log_path = log_path
+    return sequence
+
+
+async def run_command_async(command: str, cwd: str = ".", prefix: str = "", log_path: str = None):
+    """run_command without blocking: sibling tool calls and the event loop keep going while it runs."""
+    # Waiting for a free slot happens off the loop; the limit is shared with run_command
+    await asyncio.to_thread(_SUBPROCESS_SLOTS.acquire)
+    try:
+        return await _run_command_async(command, cwd, prefix, log_path)
+    finally:
+        _SUBPROCESS_SLOTS.release()
+
+
+async def _run_command_async(command, cwd, prefix, log_path):
+    command_line = f"{prefix} {command}" if prefix else command
+    argv = _plain_argv(command_line)
+    stderr = subprocess.STDOUT if log_path else subprocess.PIPE
+    if argv is None or IS_WINDOWS:
+        # create_subprocess_exec has no Windows command-line passthrough; the shell keeps quoting intact
+        proc = await asyncio.create_subprocess_shell(command_line, stdout=subprocess.PIPE,
+                                                     stderr=stderr, cwd=cwd)
+    else:
+        proc = await asyncio.create_subprocess_exec(*argv, stdout=subprocess.PIPE, stderr=stderr,
+                                                    cwd=cwd, close_fds=False)
+    if not log_path:
+        stdout, stderr = await proc.communicate()
+        return subprocess.CompletedProcess(command_line, proc.returncode,
+                                           stdout.decode(errors='replace'), stderr.decode(errors='replace'))
+
+    with open(log_path, "a", encoding="utf-8") as log_file:
+        tail = _OutputTail(log_file)
+        # Read in chunks: readline() gives up on lines longer than the stream limit
+        while chunk := await proc.stdout.read(1 << 16):
+            tail.feed(chunk.decode(errors='replace'))
+        await proc.wait()
+    result = subprocess.CompletedProcess(command_line, proc.returncode, tail.text(), "")
+    result.log_path = log_path
+    return result
+
+
+def logged_output(result) -> str:
+    """A logged command's output tail, followed by where its full output is."""
+    return f"{result.stdout}\n(full output: {result.log_path})"
+
+
+@lru_cache(maxsize=256)
+def _read_text(path, mtime_ns, size):
+    with open(path, 'r') as file:
+        return file.read()
+
+
+def read_text_cached(file_path: str) -> str:
+    """File contents, re-read only when the file's mtime or size changes."""
+    stat = os.stat(file_path)
+    return _read_text(os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size)
+
+
+# Open append handles, kept across FileWriter calls so chunked writes share one buffer
+_WRITER_POOL = {}
+_WRITER_LOCK = threading.Lock()
+WRITE_BUFFER_SIZE = 1 << 20
+
+
+def append_buffered(file_path: str, content: str) -> None:
+    """Append through a pooled 1MB buffer instead of an open/write/close per call."""
+    path = os.path.abspath(file_path)
+    with _WRITER_LOCK:
+        writer = _WRITER_POOL.get(path)
+        if writer is None:
+            writer = _WRITER_POOL[path] = io.BufferedWriter(io.FileIO(path, 'a'), buffer_size=WRITE_BUFFER_SIZE)
+        writer.write(content.encode('utf-8'))
+
+
+def flush_writes(file_path: str = None, close: bool = False) -> None:
+    """Push buffered appends to disk - for one file, or all of them before a command runs."""
+    with _WRITER_LOCK:
+        paths = [os.path.abspath(file_path)] if file_path else list(_WRITER_POOL)
+        for path in paths:
+            writer = _WRITER_POOL.pop(path, None) if close else _WRITER_POOL.get(path)
+            if writer is not None:
+                writer.flush()
+                if close:
+                    writer.close()
+
+
+atexit.register(flush_writes, close=True)
+
+
+# Tool calls currently running, keyed on (tool name, arguments); parallel agents join these
+_INFLIGHT = {}
+_INFLIGHT_LOCK = threading.Lock()
+
+
+def dedup_call(tool, call, path: str = None):
+    """Run call() once for identical concurrent tool calls; the other callers share its result.
+
+    Agents run in separate threads with their own event loops, so this uses a
+    thread-safe Future rather than an asyncio one.
+    """
+    key = (type(tool).__name__, json.dumps(tool.model_dump(), sort_keys=True, default=str))
+    with _INFLIGHT_LOCK:
+        entry = _INFLIGHT.get(key)
+        if entry is None:
+            future = Future()
+            _INFLIGHT[key] = (os.path.abspath(path) if path else None, future)
+        else:
+            future = entry[1]
+    if entry is not None:
+        return future.result()
+
+    try:
+        result = call()
+        future.set_result(result)
+        return result
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _INFLIGHT_LOCK:
+            if _INFLIGHT.get(key, (None, None))[1] is future:
+                del _INFLIGHT[key]
+
+
+def forget_inflight(file_path: str) -> None:
+    """After a write, make new calls on the file start fresh instead of joining an older read."""
+    path = os.path.abspath(file_path)
+    with _INFLIGHT_LOCK:
+        for key in [key for key, (entry_path, _) in _INFLIGHT.items() if entry_path == path]:
+            del _INFLIGHT[key]
+
+
+# Development tools shared by the swarms
+
+@lru_cache(maxsize=None)
+def _tool_schema(tool):
+    return BaseTool.__dict__["openai_schema"].fget(tool)
+
+
+class CachedSchemaTool(BaseTool):
+    """BaseTool whose OpenAI schema is generated once per class.
+
+    Every agent rebuilds its tool schemas several times while syncing its
+    assistant, and most agents across the swarms share the same tools.
+    """
+
+    @classproperty
+    def openai_schema(cls):
+        # Copied because agency-swarm edits the dicts it compares
+        return copy.deepcopy(_tool_schema(cls))
+
+
+class CachedSendMessage(CachedSchemaTool, SendMessage):
+    """SendMessage for Agency(send_message_tool_class=...): each agent's SendMessage schema is built once.
+
+    Within one top-level turn (agent_turns.request_scope), asking the same
+    agent the same thing again returns the first reply instead of another run.
+    Every send is timed as a caller -> recipient hop (latency.METRICS).
+    """
+
+    def run(self):
+        cache = request_cache()
+        key = (self._caller_agent.name, self.recipient.value, " ".join(self.message.split()),
+               self.additional_instructions or "")
+        if cache is not None and key in cache:
+            return cache[key]
+        return self._send(cache, key)
+
+    def _send(self, cache, key):
+        # SendMessage returns the recipient's completion as a generator; the hop
+        # and the cached reply cover it being driven to the end
+        with hop(self._caller_agent.name, self.recipient.value):
+            reply = super().run()
+            if inspect.isgenerator(reply):
+                reply = yield from reply
+            add_tokens(run_tokens(self._get_thread()._run))
+        if cache is not None:
+            cache[key] = reply
+        return reply
+
+
+class HandOff(CachedSchemaTool, SendMessageSwarm):
+    """Hand the user's current request over to another agent, who answers the user directly instead of you relaying its reply. Use it when the request is wholly in one agent's area, instead of relaying messages back and forth. Call it by itself, without any other tool."""
+
+    def run(self):
+        # Only the run answering the user can be handed over; a private turn has nothing to switch
+        main_run = self._get_main_thread()._run
+        required = getattr(main_run, "required_action", None)
+        if not required or self._tool_call.id not in {call.id for call in required.submit_tool_outputs.tool_calls}:
+            return "HandOff only works in the conversation with the user; use SendMessage here instead."
+        return super().run()
+
+    @classmethod
+    def for_agent(cls, caller, recipients):
+        """HandOff tool class for caller, limited to recipients it also has SendMessage flows to.
+
+        Its _agents_and_threads is set once the agency exists.
+        """
+        # Sorted: the schema must not change between runs, or the assistant is updated on every start
+        recipients = sorted(recipients, key=lambda agent: agent.name)
+        recipient_enum = Enum("recipient", {agent.name: agent.name for agent in recipients})
+        descriptions = "\n".join(f"{agent.name}: {agent.description}" for agent in recipients if agent.description)
+        tool = type("HandOff", (cls,), {
+            "__doc__": cls.__doc__,
+            "__annotations__": {"recipient": recipient_enum},
+            "recipient": Field(..., description=descriptions),
+        })
+        tool._caller_agent = caller
+        return tool
+
+
+class FileWriter(CachedSchemaTool):
+    """Write code or text to a file."""
+    file_path: str = Field(..., description="Path where file should be written")
+    content: str = Field(..., description="Content to write to the file")
+    mode: str = Field(default="w", description="Write mode: 'w' for overwrite, 'a' for append")
+
+    def run(self):
+        try:
+            os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
+            if self.mode == 'a':
+                # Chunked components append many times; buffer them until something reads the file
+                append_buffered(self.file_path, self.content)
+            else:
+                flush_writes(self.file_path, close=True)
+                with open(self.file_path, self.mode, encoding='utf-8') as file:
+                    file.write(self.content)
+            forget_inflight(self.file_path)
+            return f"Successfully wrote to {self.file_path}"
+        except Exception as e:
+            return f"Error writing file: {str(e)}"
+
+
+class CommandExecutor(CachedSchemaTool):
+    """Execute terminal commands."""
+    command: str = Field(..., description="Command to execute")
+    working_directory: str = Field(default=".", description="Working directory")
+
+    async def run(self):
+        try:
+            # Commands (builds, linters) must see every buffered append
+            flush_writes()
+            # Awaited by the thread alongside sibling tool calls, so parallel npm/tsc runs overlap
+            result = await run_command_async(self.command, cwd=self.working_directory, log_path=new_command_log())
+            if result.returncode == 0:
+                return f"Command executed successfully:\n{logged_output(result)}"
+            else:
+                return f"Command failed:\n{logged_output(result)}"
+        except Exception as e:
+            return f"Execution error: {str(e)}"
+
+
+def _read_flushed(file_path):
+    flush_writes(file_path)
+    return read_text_cached(file_path)
+
+
+class FileReader(CachedSchemaTool):
+    """Read and examine file contents."""
+    file_path: str = Field(..., description="Path to file to read")
+
+    def run(self):
+        try:
+            # Agents re-read the same App.tsx/utility files; unchanged files come from memory,
+            # and reads issued by several agents at once share one
+            content = dedup_call(self, lambda: _read_flushed(self.file_path), path=self.file_path)
+            return f"File content of {self.file_path}:\n{content}"
+        except Exception as e:
+            return f"Error reading file: {str(e)}"
+
+
+class CodeValidator(CachedSchemaTool):
+    """CRITICAL tool to validate code contains no placeholders"""
+
+    file_path: str = Field(..., description="Path to file to validate")
+    fail_fast: bool = Field(default=False, description="Only pass/fail: stop at the first violation instead of listing them all")
+
+    FORBIDDEN_PATTERNS: ClassVar[List[str]] = [
+        "TODO", "FIXME", "PLACEHOLDER", "CHANGEME", "REPLACE_ME",
+        "user@example.com", "test@test.com", "example.com",
+        "123-456-7890", "555-1234", "(555)", "123-4567",
+        "Jane Doe", "John Doe", "Test User", "Sample Name",
+        "Lorem ipsum", "lorem", "ipsum", "console.log",
+        "DEMO_DATA", "SAMPLE_DATA", "TEST_DATA"
+    ]
+    # Lowercased bytes: files are scanned undecoded
+    PATTERNS_LOWER: ClassVar[tuple] = tuple(pattern.lower().encode() for pattern in FORBIDDEN_PATTERNS)
+    # All patterns as one alternation (longest first); bytes IGNORECASE folds ASCII only, like bytes.lower()
+    FORBIDDEN_RE: ClassVar[re.Pattern] = re.compile(
+        b'|'.join(re.escape(pattern) for pattern in sorted(PATTERNS_LOWER, key=len, reverse=True)),
+        re.IGNORECASE,
+    )
+
+    def run(self) -> str:
+        """Validate file contains no placeholder code"""
+        try:
+            # Appends still buffered by FileWriter must be on disk before the file is stat'ed and scanned
+            flush_writes(self.file_path)
+            if not os.path.exists(self.file_path):
+                return f"❌ VALIDATION FAILED: File {self.file_path} does not exist"
+
+            stat = os.stat(self.file_path)
+            # Agents validating the same file at the same time share one scan
+            violations = dedup_call(
+                self,
+                lambda: _forbidden_violations(os.path.abspath(self.file_path), stat.st_mtime_ns, stat.st_size,
+                                              self.fail_fast),
+                path=self.file_path,
+            )
+
+            if violations and self.fail_fast:
+                return f"❌ VALIDATION FAILED: {self.file_path} contains placeholders, first at {violations[0]}"
+            if violations:
+                return f"❌ VALIDATION FAILED: Found {len(violations)} violations in {self.file_path}:\n" + '\n'.join(violations[:5])
+
+            return f"✅ VALIDATION PASSED: {self.file_path} is production-ready"
+
+        except Exception as e:
+            return f"❌ VALIDATION ERROR: {str(e)}"
+
+
+MMAP_THRESHOLD = 64 * 1024
+NEWLINE_BYTES_RE = re.compile(b'\n')
+
+
+def scan_executor(jobs: int):
+    """Pool for a sweep over jobs files.
+
+    Threads, not processes: sweeps run inside tool calls on agent worker
+    threads, where forking could copy a lock some other thread holds (the log
+    listener, the input reader, HTTP clients) into a child that then
+    deadlocks, and spawned workers would re-import the whole swarm script.
+    Threads also share the memoized per-file results with later tool calls.
+    """
+    return ThreadPoolExecutor(max_workers=min(max(jobs, 1), (os.cpu_count() or 1) * 4))
+
+
+@lru_cache(maxsize=256)
+def _forbidden_violations(path, mtime_ns, size, fail_fast=False):
+    """CodeValidator findings for one version of a file; unchanged files are not rescanned."""
+    return _scan_file(path, size, fail_fast)
+
+
+def _scan_file(path, size, fail_fast=False):
+    with open(path, 'rb') as f:
+        if size < MMAP_THRESHOLD:
+            return _scan_forbidden(f.read(), fail_fast)
+        # Large files are searched in place: no copy into the heap, no lowercased copy, no decode
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return _scan_forbidden(mapped, fail_fast)
+
+
+def lines_at(data, offsets) -> dict:
+    """Line number -> line bytes for every line holding one of the (ascending) offsets.
+
+    Newlines are only counted up to the last offset and no index of the
+    whole file's lines is built; each line is cut out from the newlines
+    either side of its first offset.
+    """
+    lines = {}
+    line_no, counted, line_end = 1, 0, -1
+    for offset in offsets:
+        if offset < line_end:
+            continue  # same line as the previous offset
+        line_no += len(NEWLINE_BYTES_RE.findall(data, counted, offset))
+        counted = offset
+        line_start = data.rfind(b'\n', 0, offset) + 1
+        line_end = data.find(b'\n', offset)
+        if line_end == -1:
+            line_end = len(data)
+        lines[line_no] = bytes(data[line_start:line_end])
+    return lines
+
+
+def _scan_forbidden(data, fail_fast=False):
+    if fail_fast:
+        # Pass/fail only: the search stops at the first hit and lines are counted up to it
+        match = CodeValidator.FORBIDDEN_RE.search(data)
+        if not match:
+            return ()
+        (i, line), = lines_at(data, [match.start()]).items()
+        return (f"Line {i}: {line.decode('utf-8', 'ignore').strip()[:100]}",)
+
+    # One case-insensitive pass finds every forbidden pattern; clean files end here
+    starts = [m.start() for m in CodeValidator.FORBIDDEN_RE.finditer(data)]
+    if not starts:
+        return ()
+
+    # Only lines with a hit are copied out, lowercased once, then checked pattern by pattern
+    lines = lines_at(data, starts)
+    hit_lines = list(lines)
+    lower_lines = {i: line.lower() for i, line in lines.items()}
+    return tuple(
+        f"Line {i}: {lines[i].decode('utf-8', 'ignore').strip()[:100]}"
+        for pattern in CodeValidator.PATTERNS_LOWER
+        for i in hit_lines
+        if pattern in lower_lines[i]
+    )
+
+
+# Dependency and build trees are never hand-written, so repo scans skip them
+SCAN_EXTENSIONS = frozenset({'.ts', '.tsx', '.js', '.jsx', '.py', '.json', '.html', '.css', '.sql'})
+SCAN_SKIP_DIRS = frozenset({'node_modules', '.git', 'dist', 'build', '.next', '.venv', '__pycache__'})
+
+
+def _walk_scan_files(root):
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in SCAN_SKIP_DIRS:
+                    yield from _walk_scan_files(entry.path)
+            elif os.path.splitext(entry.name)[1] in SCAN_EXTENSIONS and entry.is_file():
+                yield entry.path
+
+
+# Absolute path -> ((path, mtime_ns, size), violations) from the last repo scan
+_REPO_SCAN_CACHE = {}
+
+
+def scan_repo(root: str = ".") -> dict:
+    """CodeValidator findings for every source file under root, keyed by path.
+
+    Each file gets a single pass of the combined FORBIDDEN_RE; files whose
+    mtime and size are unchanged since the last scan are not read again, and
+    the rest are spread over scan_executor's workers.
+    """
+    versions = {}
+    for path in _walk_scan_files(root):
+        stat = os.stat(path)
+        versions[os.path.abspath(path)] = (path, stat.st_mtime_ns, stat.st_size)
+
+    stale = [(abspath, version) for abspath, version in versions.items()
+             if _REPO_SCAN_CACHE.get(abspath, (None,))[0] != version]
+    if stale:
+        with scan_executor(len(stale)) as executor:
+            scanned = executor.map(_scan_file, [abspath for abspath, _ in stale],
+                                   [size for _, (_, _, size) in stale])
+            for (abspath, version), violations in zip(stale, scanned):
+                _REPO_SCAN_CACHE[abspath] = (version, violations)
+
+    return {path: _REPO_SCAN_CACHE[abspath][1] for abspath, (path, _, _) in versions.items()
+            if _REPO_SCAN_CACHE[abspath][1]}
+
+
+class RepoValidator(CachedSchemaTool):
+    """Validate every source file under a directory for placeholder code in one scan"""
+
+    root: str = Field(default=".", description="Project directory to scan (node_modules and build output are skipped)")
+
+    def run(self) -> str:
+        try:
+            if not os.path.isdir(self.root):
+                return f"❌ VALIDATION FAILED: Directory {self.root} does not exist"
+
+            flush_writes()
+            findings = dedup_call(self, lambda: scan_repo(self.root), path=self.root)
+
+            if findings:
+                report = [f"{path}:\n" + '\n'.join(violations[:5]) for path, violations in sorted(findings.items())]
+                return (f"❌ VALIDATION FAILED: {len(findings)} files with violations under {self.root}:\n"
+                        + '\n'.join(report))
+
+            return f"✅ VALIDATION PASSED: no placeholder code under {self.root}"
+
+        except Exception as e:
+            return f"❌ VALIDATION ERROR: {str(e)}"
+
+
+# One keep-alive pool for every agent's API checks; agents run on separate threads
+# and event loops, so this is the thread-safe sync client rather than an AsyncClient
+_HTTP_CLIENT = None
+_HTTP_LOCK = threading.Lock()
+API_RESPONSE_LIMIT = 4000
+
+
+def http_client() -> httpx.Client:
+    """The shared, lazily created HTTP client; connections are reused across tool calls."""
+    global _HTTP_CLIENT
+    with _HTTP_LOCK:
+        if _HTTP_CLIENT is None:
+            _HTTP_CLIENT = httpx.Client(
+                timeout=httpx.Timeout(30.0, connect=5.0),
+                limits=httpx.Limits(max_keepalive_connections=50, max_connections=100),
+            )
+            atexit.register(_HTTP_CLIENT.close)
+        return _HTTP_CLIENT
+
+
+class ApiRequest(CachedSchemaTool):
+    """Send a real HTTP request to an API endpoint and return the status and response body"""
+
+    method: str = Field(default="GET", description="HTTP method, e.g. GET, POST, PUT, DELETE")
+    url: str = Field(..., description="Full endpoint URL, e.g. http://localhost:3000/api/campaigns")
+    json_body: str = Field(default="", description="JSON request body, if any")
+    headers: str = Field(default="", description="JSON object of request headers, e.g. an Authorization header")
+
+    def run(self) -> str:
+        try:
+            response = http_client().request(
+                self.method.upper(), self.url,
+                content=self.json_body.encode() if self.json_body else None,
+                headers={**({"Content-Type": "application/json"} if self.json_body else {}),
+                         **(json.loads(self.headers) if self.headers else {})},
+            )
+            body = response.text
+            if len(body) > API_RESPONSE_LIMIT:
+                body = body[:API_RESPONSE_LIMIT] + f"\n... ({len(response.text)} characters total)"
+            return f"{self.method.upper()} {self.url} -> {response.status_code} {response.reason_phrase}\n{body}"
+        except Exception as e:
+            return f"Request error: {str(e)}"
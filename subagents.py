@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Subagent Registry
+=================
+
+Let agents hand independent subtasks to other agents and keep working
+while they run. Each spawned turn gets a task id and runs on its own
+private thread; results are collected later, all at once or as soon as
+the first one finishes.
+
+Spawned turns may spawn again, down to a fixed depth, so a delegation
+chain cannot recurse without end. Every depth level has its own worker
+pool: a turn only ever waits on turns one level deeper, so a full pool
+can never be blocked waiting on work queued behind it.
+"""
+
+import uuid
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED, ALL_COMPLETED
+from agent_turns import run_agent_turn
+
+MAX_SPAWN_DEPTH = 2
+
+_spawn_depth = threading.local()
+
+
+def current_depth() -> int:
+    """Spawn depth of the turn running on this thread; 0 outside any spawned turn."""
+    return getattr(_spawn_depth, "value", 0)
+
+
+class SubagentRegistry:
+    """Spawned agent turns by task id, with depth-limited recursive spawning."""
+
+    def __init__(self, agency, max_workers: int = 6, max_depth: int = MAX_SPAWN_DEPTH):
+        self.agency = agency
+        self.max_workers = max_workers
+        self.max_depth = max_depth
+        self._pools = {}
+        self._tasks = {}
+        self._lock = threading.Lock()
+
+    def _pool(self, depth):
+        with self._lock:
+            if depth not in self._pools:
+                self._pools[depth] = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                        thread_name_prefix=f"subagent-{depth}")
+            return self._pools[depth]
+
+    def _run(self, depth, agent, prompt):
+        _spawn_depth.value = depth
+        try:
+            # Bounded by this registry's pools; the parent turn already holds an LLM slot
+            return run_agent_turn(self.agency, agent, prompt, throttled=False)
+        finally:
+            _spawn_depth.value = 0
+
+    def spawn(self, agent, prompt: str) -> str:
+        """Start the agent on prompt in the background and return its task id."""
+        depth = current_depth() + 1
+        if depth > self.max_depth:
+            raise RuntimeError(f"spawn depth limit {self.max_depth} reached; do this work yourself")
+        task_id = uuid.uuid4().hex[:8]
+        future = self._pool(depth).submit(self._run, depth, agent, prompt)
+        with self._lock:
+            self._tasks[task_id] = (agent.name, future)
+        return task_id
+
+    def gather_results(self, task_ids=None, strategy: str = "wait_all", timeout: float = None) -> dict:
+        """task id -> (agent name, reply or exception) for finished tasks.
+
+        wait_all waits for every task; wait_first returns once any one is done,
+        with whatever has finished by then. Collected tasks leave the registry.
+        """
+        with self._lock:
+            ids = list(self._tasks) if task_ids is None else [i for i in task_ids if i in self._tasks]
+            futures = {self._tasks[i][1]: i for i in ids}
+        if not futures:
+            return {}
+
+        done, _ = wait(futures, timeout=timeout,
+                       return_when=FIRST_COMPLETED if strategy == "wait_first" else ALL_COMPLETED)
+        results = {}
+        with self._lock:
+            for future in done:
+                task_id = futures[future]
+                name, _ = self._tasks.pop(task_id)
+                results[task_id] = (name, future.exception() or future.result())
+        return results
+
+    def pending(self) -> dict:
+        """task id -> agent name for tasks not collected yet."""
+        with self._lock:
+            return {task_id: name for task_id, (name, _) in self._tasks.items()}
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Task Master Server
+==================
+
+Keep one Task Master process alive and send it commands over stdio,
+instead of starting a new Node.js process for every `task-master` call.
+
+The long-lived process is Task Master's MCP server (`task-master-ai`),
+which speaks newline-delimited JSON-RPC. Only the commands agents issue
+all the time (list, next, show, set-status) are sent to it; anything else,
+and every command once the server is missing or has failed, goes to the
+CLI as before.
+
+Every thread gets its own server, so agents running in parallel do not
+queue behind each other's calls. Status updates still go one at a time,
+since the servers share the same tasks.json.
+"""
+
+import os
+import json
+import queue
+import shlex
+import atexit
+import shutil
+import weakref
+import threading
+import itertools
+import subprocess
+
+MCP_PROTOCOL_VERSION = "2024-11-05"
+TASK_MASTER_TIMEOUT = 60
+
+# CLI verb -> (MCP tool, option -> argument name); positional values go to "id"
+CLI_TO_MCP = {
+    "list": ("get_tasks", {"status": "status", "s": "status", "with-subtasks": "withSubtasks", "tag": "tag"}),
+    "next": ("next_task", {"tag": "tag"}),
+    "show": ("get_task", {"id": "id", "i": "id", "tag": "tag"}),
+    "set-status": ("set_task_status", {"id": "id", "i": "id", "status": "status", "s": "status", "tag": "tag"}),
+}
+
+
+def mcp_tool_call(command: str):
+    """(tool name, arguments) for a `task-master` command line, or None when it has to go to the CLI."""
+    try:
+        tokens = shlex.split(command)
+    except ValueError:
+        return None
+    if not tokens or tokens[0] not in CLI_TO_MCP:
+        return None
+
+    tool, options = CLI_TO_MCP[tokens[0]]
+    arguments = {}
+    rest = iter(tokens[1:])
+    for token in rest:
+        if not token.startswith("-"):
+            if "id" not in options.values() or "id" in arguments:
+                return None
+            arguments["id"] = token
+            continue
+        name, has_value, value = token.lstrip("-").partition("=")
+        if name not in options:
+            # --json and anything else the MCP tool cannot reproduce stays on the CLI
+            return None
+        if options[name] == "withSubtasks":
+            arguments["withSubtasks"] = True
+            continue
+        value = value if has_value else next(rest, None)
+        if value is None:
+            return None
+        arguments[options[name]] = value
+    return tool, arguments
+
+
+class TaskMasterServer:
+    """A lazily started `task-master-ai` child process shared by every tool call."""
+
+    def __init__(self, project_root: str, executable: str = "task-master-ai"):
+        self.project_root = os.path.abspath(project_root)
+        self.executable = executable
+        self._proc = None
+        self._replies = None
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self.available = shutil.which(executable) is not None
+
+    def _start(self):
+        self._proc = subprocess.Popen(
+            [shutil.which(self.executable)], cwd=self.project_root, text=True, encoding="utf-8",
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, bufsize=1,
+        )
+        self._replies = queue.Queue()
+        threading.Thread(target=self._read_replies, args=(self._proc.stdout, self._replies), daemon=True).start()
+        self._request("initialize", {
+            "protocolVersion": MCP_PROTOCOL_VERSION,
+            "capabilities": {},
+            "clientInfo": {"name": "sms-agency-swarm", "version": "1.0"},
+        })
+        self._send({"jsonrpc": "2.0", "method": "notifications/initialized"})
+
+    @staticmethod
+    def _read_replies(stdout, replies):
+        for line in stdout:
+            try:
+                replies.put(json.loads(line))
+            except ValueError:
+                continue  # log output on stdout
+        replies.put(None)
+
+    def _send(self, message):
+        self._proc.stdin.write(json.dumps(message) + "\n")
+        self._proc.stdin.flush()
+
+    def _request(self, method, params):
+        request_id = next(self._ids)
+        self._send({"jsonrpc": "2.0", "id": request_id, "method": method, "params": params})
+        while True:
+            reply = self._replies.get(timeout=TASK_MASTER_TIMEOUT)
+            if reply is None:
+                raise RuntimeError("task-master-ai exited")
+            if reply.get("id") != request_id:
+                continue  # notifications and log messages
+            if "error" in reply:
+                raise RuntimeError(reply["error"].get("message", reply["error"]))
+            return reply["result"]
+
+    def call(self, tool: str, arguments: dict) -> subprocess.CompletedProcess:
+        """Run one MCP tool; the reply comes back shaped like the CLI's CompletedProcess."""
+        with self._lock:
+            try:
+                if self._proc is None or self._proc.poll() is not None:
+                    self._start()
+                result = self._request("tools/call", {
+                    "name": tool,
+                    "arguments": {**arguments, "projectRoot": self.project_root},
+                })
+            except Exception:
+                # A server that fails once is not trusted again; the CLI takes over
+                self.available = False
+                self.close()
+                raise
+        text = "\n".join(item.get("text", "") for item in result.get("content", []))
+        if result.get("isError"):
+            return subprocess.CompletedProcess(tool, 1, "", text)
+        return subprocess.CompletedProcess(tool, 0, text, "")
+
+    def close(self):
+        if self._proc is not None:
+            self._proc.kill()
+            self._proc.wait()
+            self._proc = None
+
+
+# Tools that write tasks.json; one at a time per project, whichever thread's server runs them
+WRITE_TOOLS = {"set_task_status"}
+
+_LOCAL = threading.local()
+_SERVERS = set()
+_UNAVAILABLE = set()
+_SERVERS_LOCK = threading.Lock()
+_WRITE_LOCKS = {}
+
+
+class _ThreadServers(dict):
+    """project root -> this thread's server; a dict subclass so it can be weakly referenced."""
+
+
+def _thread_server(cwd):
+    servers = getattr(_LOCAL, "servers", None)
+    if servers is None:
+        servers = _LOCAL.servers = _ThreadServers()
+    server = servers.get(cwd)
+    if server is None:
+        server = servers[cwd] = TaskMasterServer(cwd)
+        with _SERVERS_LOCK:
+            _SERVERS.add(server)
+            _WRITE_LOCKS.setdefault(cwd, threading.Lock())
+        # The child goes away with the thread that owns it
+        weakref.finalize(servers, _discard_server, server)
+    return server
+
+
+def _discard_server(server):
+    server.close()
+    with _SERVERS_LOCK:
+        _SERVERS.discard(server)
+
+
+def run_task_master(command: str, cwd: str, run_cli):
+    """Send a Task Master command to this thread's server when it can take it, otherwise run_cli(command).
+
+    The commands routed to the server are reads and status updates, so a
+    call that fails part-way is safe to repeat on the CLI.
+    """
+    call = mcp_tool_call(command)
+    if call is not None and cwd not in _UNAVAILABLE:
+        server = _thread_server(cwd)
+        if server.available:
+            try:
+                if call[0] in WRITE_TOOLS:
+                    with _WRITE_LOCKS[cwd]:
+                        return server.call(*call)
+                return server.call(*call)
+            except Exception:
+                pass
+        # A project whose server cannot start or fails once stays on the CLI in every thread
+        _UNAVAILABLE.add(cwd)
+    return run_cli(command)
+
+
+@atexit.register
+def _close_servers():
+    with _SERVERS_LOCK:
+        servers = list(_SERVERS)
+    for server in servers:
+        server.close()